@@ -13,6 +13,8 @@ from services.inventory_service import InventoryService
 from services.receiving_service import ReceivingService
 from services.material_service import MaterialService
 from services.bom_service import BOMService
+from services.validation_service import ValidationService
+from recipe.bundle import load_bundle
 from models.schemas import (
     RecipeCreateTemplateRequest,
     RecipeCreateCustomRequest,
@@ -23,7 +25,9 @@ from models.schemas import (
     ReceivingStartRequest,
     ReceivingResponse,
     MaterialCreateRequest,
-    MaterialResponse
+    MaterialResponse,
+    ValidateRequest,
+    ValidateResponse
 )
 
 logging.basicConfig(
@@ -39,6 +43,10 @@ config_manager = ConfigManager()
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
     logger.info("Starting POMSicle Agentic Framework API...")
+    # Load the component bundle once, before the first request needs it
+    bundle = load_bundle()
+    if bundle is not None:
+        logger.info(f"Component bundle {bundle.content_hash[:12]} loaded.")
     yield
     logger.info("Shutting down POMSicle Agentic Framework API...")
 
@@ -111,6 +119,17 @@ def get_bom_service() -> BOMService:
     )
 
 
+def get_validation_service() -> ValidationService:
+    """Dependency to get ValidationService instance."""
+    return ValidationService(
+        settings=config_manager.settings,
+        material_settings=config_manager.material_settings,
+        location_settings=config_manager.location_settings,
+        username=config_manager.get_username(),
+        password=config_manager.get_password()
+    )
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -156,7 +175,7 @@ async def create_recipe_from_template(
 
 
 @app.post("/api/recipe/create/custom", response_model=RecipeResponse, tags=["Recipe"])
-async def create_custom_recipe(
+def create_custom_recipe(
     request: RecipeCreateCustomRequest,
     service: RecipeService = Depends(get_recipe_service)
 ):
@@ -273,8 +292,9 @@ async def start_receiving(
 
 
 # Material endpoints
+# Plain def: FastAPI runs it in its threadpool, so material creations proceed in parallel
 @app.post("/api/material/create", response_model=MaterialResponse, tags=["Material"])
-async def create_material(
+def create_material(
     request: MaterialCreateRequest,
     service: MaterialService = Depends(get_material_service)
 ):
@@ -306,6 +326,35 @@ async def create_material(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+# Validation endpoints
+@app.post("/api/validate", response_model=ValidateResponse, tags=["Validation"])
+def validate_files(
+    request: ValidateRequest,
+    service: ValidationService = Depends(get_validation_service)
+):
+    """
+    Validate many XML files without importing them.
+
+    Files are uploaded concurrently and checked by the server with ValidateXMLOnly. Invalid
+    files are reported per file under 'results' with the errors the server gave.
+    """
+    try:
+        result = service.validate(
+            files=[file.model_dump() for file in request.files],
+            obj_type=request.type or "recipe",
+            max_workers=request.workers or 4,
+            batch_size=request.batch_size or 100
+        )
+        return ValidateResponse(**result)
+
+    except ValueError as e:
+        logger.error(f"Value error in validate_files: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in validate_files: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
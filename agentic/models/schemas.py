@@ -16,7 +16,7 @@ class RecipeCreateTemplateRequest(BaseModel):
 
 class RecipeCreateCustomRequest(BaseModel):
     """Request schema for creating custom recipe."""
-    phases: List[str] = Field(..., description="List of phase/component names to add to the recipe")
+    phases: List[str] = Field(..., description="List of phase/component names or aliases (e.g. RecordText) to add to the recipe")
     recipe_name: Optional[str] = Field(default="Assisted", description="Name of the recipe")
     template_name: Optional[str] = Field(default="Assisted.xml", description="Name of the template file")
     bom_name: Optional[str] = Field(default=None, description="Name for the BOM to create and attach")
@@ -53,6 +53,22 @@ class MaterialCreateRequest(BaseModel):
     template_name: Optional[str] = Field(default="material_template.xml", description="Name of the material template file")
 
 
+# Validation Schemas
+class ValidateFile(BaseModel):
+    """A file to validate, given inline or by path."""
+    file_name: Optional[str] = Field(default=None, description="Name of the file (defaults to the basename of path)")
+    content: Optional[str] = Field(default=None, description="The XML content")
+    path: Optional[str] = Field(default=None, description="Path to the XML file under an allowed folder, such as template/ (alternative to content)")
+
+
+class ValidateRequest(BaseModel):
+    """Request schema for validating XML files without importing them."""
+    files: List[ValidateFile] = Field(..., description="Files to validate")
+    type: Optional[str] = Field(default="recipe", description="Kind of object in the files: recipe, bom or material")
+    workers: Optional[int] = Field(default=4, description="Maximum concurrent uploads")
+    batch_size: Optional[int] = Field(default=100, description="Maximum files per ImportFiles call")
+
+
 # Response Schemas
 class BaseResponse(BaseModel):
     """Base response schema."""
@@ -97,3 +113,25 @@ class MaterialResponse(BaseResponse):
     attributes: Optional[Dict[str, str]] = None
     error: Optional[str] = None
 
+
+class ValidationErrorDetail(BaseModel):
+    """One error reported by the server for a file."""
+    message: Optional[str] = None
+    line: Optional[int | str] = None
+    column: Optional[int | str] = None
+    code: Optional[int | str] = None
+
+
+class FileValidationResult(BaseModel):
+    """Validation outcome of one file."""
+    file_name: str
+    valid: bool
+    uploaded: bool
+    message: Optional[str] = None
+    errors: List[ValidationErrorDetail] = Field(default_factory=list)
+    upload_ms: Optional[float] = None
+
+
+class ValidateResponse(BaseResponse):
+    """Response schema for validation."""
+    results: List[FileValidationResult] = Field(default_factory=list)
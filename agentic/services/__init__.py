@@ -5,6 +5,7 @@ from .bom_service import BOMService
 from .inventory_service import InventoryService
 from .receiving_service import ReceivingService
 from .material_service import MaterialService
+from .validation_service import ValidationService
 
 __all__ = [
     "RecipeService",
@@ -12,4 +13,5 @@ __all__ = [
     "InventoryService",
     "ReceivingService",
     "MaterialService",
+    "ValidationService",
 ]
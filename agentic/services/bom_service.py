@@ -135,7 +135,8 @@ class BOMService:
         self,
         bom_name: str,
         materials: List[str],
-        template_name: str = "Bom_template.xml"
+        template_name: str = "Bom_template.xml",
+        output_path: Optional[str] = None
     ) -> dict:
         """
         Create a BOM and return the path to the generated XML file.
@@ -145,6 +146,7 @@ class BOMService:
             bom_name: Name of the BOM to create.
             materials: List of material IDs to include in the BOM.
             template_name: Name of the template XML file (default: "Bom_template.xml").
+            output_path: Where to write the XML file. Defaults to a unique temp file per call.
         
         Returns:
             dict: Result with success status, message, and file path if successful.
@@ -170,7 +172,8 @@ class BOMService:
             bom_file_path = manager.create_template(
                 template_name=template_name,
                 bom_name=bom_name,
-                pull=True
+                pull=True,
+                output_path=output_path
             )
             
             if bom_file_path and os.path.exists(bom_file_path):
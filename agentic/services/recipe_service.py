@@ -11,9 +11,11 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from recipe.builder import RecipeBuilder
+from recipe.builder import shared_builder
+from recipe.registry import INDEX
 from template.recipe_template import PomsicleTemplateManager
 from bom.bom_template import PomsicleBOMManager
+from utils.recipe_cache import RecipeCache
 from config import config
 
 logger = logging.getLogger(__name__)
@@ -57,13 +59,16 @@ class RecipeService:
         
         if not self.username or not self.password:
             raise ValueError("Username and password are required")
+        
+        self.recipe_cache = RecipeCache.from_settings(settings)
     
     def create_from_template(
         self,
         recipe_name: str,
         template_name: str = "Template.xml",
         unit_procedure_name: Optional[str] = None,
-        operation_name: Optional[str] = None
+        operation_name: Optional[str] = None,
+        xml_content: Optional[bytes] = None
     ) -> dict:
         """
         Create a recipe from a built-in template.
@@ -73,6 +78,8 @@ class RecipeService:
             template_name: Name of the template XML file (default: "Template.xml").
             unit_procedure_name: Name of the unit procedure (auto-generated if None).
             operation_name: Name of the operation (auto-generated if None).
+            xml_content: Recipe XML already built in memory. If given, it is used instead of
+                         the template file and template_name is only the upload file name.
         
         Returns:
             dict: Result with success status and message.
@@ -88,12 +95,21 @@ class RecipeService:
             logger.debug(f"Recipe: {recipe_name}, UP: {unit_procedure_name}, OP: {operation_name}")
             
             manager = PomsicleTemplateManager(self.settings, self.username, self.password)
-            success = manager.create_template(
-                template_name=template_name,
-                recipe_name=recipe_name,
-                unit_procedure_name=unit_procedure_name,
-                operation_name=operation_name
-            )
+            if xml_content is not None:
+                success = manager.create_from_xml(
+                    xml_content,
+                    file_name=template_name,
+                    recipe_name=recipe_name,
+                    unit_procedure_name=unit_procedure_name,
+                    operation_name=operation_name
+                )
+            else:
+                success = manager.create_template(
+                    template_name=template_name,
+                    recipe_name=recipe_name,
+                    unit_procedure_name=unit_procedure_name,
+                    operation_name=operation_name
+                )
             
             if success:
                 logger.info(f"Recipe '{recipe_name}' created successfully from template '{template_name}'.")
@@ -136,7 +152,7 @@ class RecipeService:
         Args:
             phases: List of phase/component names to add to the recipe.
             recipe_name: Name of the recipe (default: "Assisted").
-            template_name: Name of the template file (default: "Assisted.xml").
+            template_name: File name the built recipe is uploaded under (default: "Assisted.xml").
             bom_name: Optional name for the BOM to create and attach.
             materials: Optional list of material IDs to include in the BOM (required if bom_name is provided).
             bom_path: Optional path to an existing BOM XML file to attach (alternative to bom_name).
@@ -147,18 +163,19 @@ class RecipeService:
         try:
             logger.info(f"Creating custom recipe '{recipe_name}' with phases: {phases}")
             
-            builder = RecipeBuilder()
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-            project_root = Path(current_dir).parent.parent
-            template_folder = project_root / "template"
-            output_file = template_folder / template_name
-            
-            # Insert components
-            builder.insert_components(phases, str(output_file))
-            logger.info(f"Custom recipe template created with phases: {' → '.join(phases)}")
+            # Resolve aliases and reject unknown phases before any BOM or build work
+            try:
+                phases = INDEX.validate(phases)
+            except ValueError as e:
+                logger.error(str(e))
+                return {
+                    "success": False,
+                    "message": str(e),
+                    "recipe_name": recipe_name
+                }
             
-            # Handle BOM attachment
+            # Resolve the BOM first: its content is part of the recipe cache key
+            bom_xml = None
             bom_file_path = None
             if bom_name:
                 # Create BOM from materials
@@ -178,13 +195,10 @@ class RecipeService:
                         self.username,
                         self.password
                     )
-                    bom_file_path = bom_manager.create_template(
-                        bom_name=bom_name,
-                        pull=True
-                    )
+                    bom_xml = bom_manager.build_xml(bom_name=bom_name)
                     
-                    if not bom_file_path or not os.path.exists(bom_file_path):
-                        logger.error(f"Failed to create BOM file for '{bom_name}'")
+                    if not bom_xml:
+                        logger.error(f"Failed to create BOM XML for '{bom_name}'")
                         return {
                             "success": False,
                             "message": f"Failed to create BOM '{bom_name}'.",
@@ -192,8 +206,6 @@ class RecipeService:
                             "bom_name": bom_name
                         }
                     
-                    logger.info(f"BOM file created: {bom_file_path}")
-                    
                 except Exception as e:
                     logger.error(f"Error creating BOM: {e}", exc_info=True)
                     return {
@@ -208,13 +220,24 @@ class RecipeService:
                 if not os.path.exists(bom_file_path):
                     logger.warning(f"BOM file not found: {bom_file_path}. Skipping attachment.")
                     bom_file_path = None
+                else:
+                    with open(bom_file_path, "rb") as f:
+                        bom_xml = f.read()
             
-            # Attach BOM if we have a valid path
-            if bom_file_path:
+            # Built in memory by the shared builder; nothing is written to template/
+            builder = shared_builder()
+            cache = self.recipe_cache
+            cache_key = builder.cache_key(phases, bom_xml)
+            xml_content = cache.get(cache_key) if cache is not None else None
+            
+            if xml_content is not None:
+                logger.info(f"Reusing cached recipe XML for phases: {' → '.join(phases)}")
+            else:
+                ctx = builder.new_build()
                 try:
-                    builder.attach_bill(bom_path=bom_file_path, output_path=str(output_file))
-                    logger.info(f"Attached BOM to recipe template: {bom_file_path}")
-                except Exception as e:
+                    # The BOM is attached to the live tree: one serialize, no temp files
+                    xml_content = builder.build_bytes(phases, ctx=ctx, bom=bom_xml)
+                except RuntimeError as e:
                     logger.error(f"Error attaching BOM: {e}", exc_info=True)
                     return {
                         "success": False,
@@ -222,21 +245,27 @@ class RecipeService:
                         "error": str(e),
                         "recipe_name": recipe_name
                     }
+                logger.info(f"Custom recipe template created with phases: {' → '.join(phases)}")
+                
+                if cache is not None:
+                    cache.put(cache_key, xml_content, ctx.guids)
             
-            # Now create the recipe from the generated template
+            # Now create the recipe from the generated XML
             result = self.create_from_template(
                 recipe_name=recipe_name,
                 template_name=template_name,
                 unit_procedure_name=None,
-                operation_name=None
+                operation_name=None,
+                xml_content=xml_content
             )
             
             if result["success"]:
                 result["phases"] = phases
                 result["message"] = f"Custom recipe '{recipe_name}' created successfully with phases: {', '.join(phases)}"
-                if bom_file_path:
+                if bom_xml is not None:
                     result["bom_attached"] = True
-                    result["bom_path"] = bom_file_path
+                    if bom_path:
+                        result["bom_path"] = bom_file_path
                     if bom_name:
                         result["bom_name"] = bom_name
                         result["materials"] = materials
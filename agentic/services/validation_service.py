@@ -0,0 +1,132 @@
+"""
+Validation Service - Validates generated spec XMLs on the server without importing them.
+"""
+import os
+import sys
+import logging
+from typing import Optional, List
+import configparser
+
+# Add parent directory to path to import modules
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from api.spec_import import SpecImporter
+
+logger = logging.getLogger(__name__)
+
+# API object type to SpecImporter object kind
+OBJECT_KINDS = {"recipe": "PM_RECIPE", "bom": "MM_BOM", "material": "MM_OBJ"}
+
+# Folders 'path' entries may point into when VALIDATE_ALLOWED_ROOTS is not set
+DEFAULT_ALLOWED_ROOTS = (os.path.join(project_root, "template"),)
+
+
+class ValidationService:
+    """Service for batch XML validation."""
+
+    def __init__(self, settings: configparser.SectionProxy, material_settings: Optional[configparser.SectionProxy] = None,
+                 location_settings: Optional[configparser.SectionProxy] = None, username: Optional[str] = None,
+                 password: Optional[str] = None):
+        """
+        Initialize ValidationService.
+
+        Args:
+            settings: Configuration dictionary.
+            material_settings: Material specific configuration dictionary.
+            location_settings: Location-specific configuration dictionary.
+            username: Username for authentication. If None, loads from settings.
+            password: Password for authentication. If None, loads from settings.
+        """
+        self.settings = settings
+        self.material_settings = material_settings or {}
+        self.location_settings = location_settings or {}
+        self.username = username or settings.get('USERNAME')
+        self.password = password or settings.get('PASSWORD')
+
+        if not self.username or not self.password:
+            raise ValueError("Username and password are required")
+
+        configured = [root.strip() for root in (settings.get('VALIDATE_ALLOWED_ROOTS') or '').split(';') if root.strip()]
+        self.allowed_roots = [os.path.realpath(root) for root in (configured or DEFAULT_ALLOWED_ROOTS)]
+
+    def _resolve_path(self, path: str) -> str:
+        """
+        Resolves a server-side path, following symlinks, and checks it lies under an allowed root.
+
+        Raises:
+            ValueError: If the path is outside every allowed root or does not exist.
+        """
+        resolved = os.path.realpath(path if os.path.isabs(path) else os.path.join(self.allowed_roots[0], path))
+        if not any(os.path.commonpath([resolved, root]) == root for root in self.allowed_roots):
+            raise ValueError(f"Path '{path}' is outside the folders allowed for validation.")
+        if not os.path.isfile(resolved):
+            raise ValueError(f"File not found: {path}")
+        return resolved
+
+    def _manager(self, obj_type: str):
+        """Builds the manager whose session and endpoints the uploads use."""
+        if obj_type == "material":
+            from material.material_template import PomsicleMaterialManager
+            return PomsicleMaterialManager(self.settings, self.material_settings, self.location_settings,
+                                           self.username, self.password)
+        if obj_type == "bom":
+            from bom.bom_template import PomsicleBOMManager
+            return PomsicleBOMManager(self.settings, self.location_settings, [], self.username, self.password)
+        from template.recipe_template import PomsicleTemplateManager
+        return PomsicleTemplateManager(self.settings, self.username, self.password)
+
+    def validate(self, files: List[dict], obj_type: str = "recipe", max_workers: int = 4,
+                 batch_size: int = 100) -> dict:
+        """
+        Upload and validate many XML files concurrently. Nothing is imported.
+
+        Args:
+            files: Entries with 'file_name' and either 'content' (the XML text) or 'path'. Paths are
+                   resolved relative to the first allowed root and must stay inside
+                   VALIDATE_ALLOWED_ROOTS (default: the project's template/ folder).
+            obj_type: 'recipe', 'bom' or 'material'.
+            max_workers: Maximum concurrent uploads.
+            batch_size: Maximum files per ImportFiles call.
+
+        Returns:
+            dict: Result with success status, message and one entry per file under 'results'.
+        """
+        if obj_type not in OBJECT_KINDS:
+            raise ValueError(f"Unknown object type '{obj_type}'. Expected one of {list(OBJECT_KINDS)}.")
+
+        entries = []
+        for entry in files:
+            path = entry.get("path")
+            if path:
+                path = self._resolve_path(path)
+            if not path and entry.get("content") is None:
+                raise ValueError(f"File '{entry.get('file_name')}' has neither content nor path.")
+            file_name = entry.get("file_name") or os.path.basename(path)
+            entries.append((file_name, path or entry["content"].encode("utf-8")))
+
+        manager = self._manager(obj_type)
+        importer = SpecImporter(manager, max_workers=max_workers, batch_size=batch_size)
+        results = importer.validate_many(
+            entries,
+            OBJECT_KINDS[obj_type],
+            self.location_settings.get('LEVEL_ID', '10'),
+            self.location_settings.get('LOCATION_ID', '4')
+        )
+
+        invalid = sum(1 for result in results if not result["success"])
+        return {
+            "success": invalid == 0,
+            "message": f"{invalid}/{len(results)} files are invalid." if invalid else f"All {len(results)} files are valid.",
+            "results": [
+                {
+                    "file_name": result["file_name"],
+                    "valid": result["success"],
+                    "uploaded": result["uploaded"],
+                    "message": result["message"],
+                    "errors": result["errors"],
+                    "upload_ms": result["upload_ms"],
+                }
+                for result in results
+            ],
+        }
@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable, Iterator
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36'
+
+
+def iter_chunks(source: bytes | str | Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    """
+    Yields chunk_size pieces of source without holding more than one chunk of it.
+
+    Args:
+        source: In-memory bytes, a file path, or any iterable of byte blocks.
+        chunk_size (int): Size of every chunk except possibly the last.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+        return
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+        return
+
+    buffer = bytearray()
+    for block in source:
+        buffer.extend(block)
+        while len(buffer) >= chunk_size:
+            yield bytes(buffer[:chunk_size])
+            del buffer[:chunk_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+class ChunkedUploader:
+    """
+    Streams a spec XML to SpecFileHandler.ashx in chunks.
+
+    Every chunk carries the same uploadUid with its chunkIndex and the totalChunks. Chunks
+    before the last can be sent with limited parallelism; the last chunk is always sent
+    after all the others succeeded, so its response carries the server's TempFileName.
+    A failed chunk is retried on its own.
+    """
+    def __init__(self, session: requests.Session, upload_url: str, headers: dict | None = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = 1,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF):
+        """
+        Initializes the ChunkedUploader.
+
+        Args:
+            session (requests.Session): A logged-in session.
+            upload_url (str): Full URL of SpecFileHandler.ashx.
+            headers (dict, optional): Headers sent with every chunk.
+            chunk_size (int): Chunk size in bytes.
+            max_workers (int): Maximum chunks in flight at once.
+            retries (int): Extra attempts per chunk after the first failure.
+            backoff (float): Seconds to wait before the first retry; doubled on each retry.
+        """
+        self.session = session
+        self.upload_url = upload_url
+        self.headers = headers or {}
+        self.chunk_size = max(1, int(chunk_size))
+        self.max_workers = max(1, int(max_workers))
+        self.retries = max(0, int(retries))
+        self.backoff = backoff
+
+    @classmethod
+    def from_manager(cls, manager) -> "ChunkedUploader":
+        """
+        Builds an uploader on a POMSicle manager's session, using the UPLOAD_CHUNK_SIZE,
+        UPLOAD_WORKERS and UPLOAD_RETRIES keys of its settings.
+        """
+        settings = manager.settings
+        headers = {
+            'Accept': '*/*; q=0.5, application/json',
+            'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
+            'Connection': 'keep-alive',
+            'Host': manager.machine_name,
+            'Origin': manager.login_host,
+            'Referer': f"{manager.base_app_url}SpecificationManagement.aspx",
+            'User-Agent': USER_AGENT,
+        }
+        return cls(
+            manager.session,
+            manager.file_upload_url,
+            headers=headers,
+            chunk_size=int(settings.get('UPLOAD_CHUNK_SIZE', DEFAULT_CHUNK_SIZE) or DEFAULT_CHUNK_SIZE),
+            max_workers=int(settings.get('UPLOAD_WORKERS', 1) or 1),
+            retries=int(settings.get('UPLOAD_RETRIES', DEFAULT_RETRIES) or 0),
+        )
+
+    def _send_chunk(self, chunk: bytes, index: int, total_chunks: int, total_size: int,
+                    file_name: str, upload_uid: str) -> dict:
+        """
+        Sends one chunk, retrying it alone on failure.
+
+        Returns:
+            dict: The server's JSON response for the chunk.
+
+        Raises:
+            requests.exceptions.RequestException: If every attempt failed.
+        """
+        metadata = {
+            "chunkIndex": index,
+            "contentType": "text/xml",
+            "fileName": file_name,
+            "relativePath": file_name,
+            "totalFileSize": total_size,
+            "totalChunks": total_chunks,
+            "uploadUid": upload_uid
+        }
+        files = {
+            'files': ("blob", chunk, 'application/octet-stream'),
+            'metadata': (None, json.dumps(metadata), 'application/json')
+        }
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.post(self.upload_url, files=files, headers=self.headers, verify=False)
+                response.raise_for_status()
+                return response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                if attempt == self.retries:
+                    raise requests.exceptions.RequestException(
+                        f"Chunk {index + 1}/{total_chunks} of '{file_name}' failed after {attempt + 1} attempts: {e}"
+                    ) from e
+                delay = self.backoff * (2 ** attempt)
+                logger.warning(f"Chunk {index + 1}/{total_chunks} of '{file_name}' failed ({e}). Retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+    def upload(self, source: bytes | str | Iterable[bytes], file_name: str,
+               total_size: int | None = None) -> tuple[str | None, str | None]:
+        """
+        Uploads source in chunks.
+
+        Args:
+            source: In-memory bytes, a file path, or an iterable of byte blocks.
+            file_name (str): Logical name of the file.
+            total_size (int, optional): Size in bytes. Required when source is an iterable.
+
+        Returns:
+            tuple: (uploaded_file_uid, temp_server_filename) or (None, None) on failure.
+        """
+        if total_size is None:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                total_size = len(source)
+            elif isinstance(source, (str, os.PathLike)):
+                total_size = os.path.getsize(source)
+            else:
+                raise ValueError("total_size is required when uploading from an iterable.")
+
+        total_chunks = max(1, -(-total_size // self.chunk_size))
+        upload_uid = str(uuid.uuid4())
+        logger.debug(f"Uploading '{file_name}' ({total_size} bytes) in {total_chunks} chunks (UID: {upload_uid})...")
+
+        chunks = iter_chunks(source, self.chunk_size)
+        last_result = None
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = set()
+                for index in range(total_chunks - 1):
+                    # Keep at most max_workers chunks in memory
+                    if len(pending) >= self.max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    chunk = next(chunks)
+                    pending.add(executor.submit(self._send_chunk, chunk, index, total_chunks, total_size, file_name, upload_uid))
+                for future in pending:
+                    future.result()
+
+            last_chunk = next(chunks, b"")
+            last_result = self._send_chunk(last_chunk, total_chunks - 1, total_chunks, total_size, file_name, upload_uid)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"File upload request failed: {e}")
+            return None, None
+        except StopIteration:
+            logger.error(f"Source of '{file_name}' ended before {total_size} bytes were read.")
+            return None, None
+
+        logger.debug(f"Final chunk upload response: {last_result}")
+        if not last_result.get("uploaded", False):
+            logger.error(f"File failed to upload. Response: {last_result}")
+            return None, None
+
+        temp_server_filename = last_result.get("TempFileName")
+        if not temp_server_filename:
+            logger.error("File upload completed but no TempFileName was received from the server.")
+            return None, None
+
+        uploaded_file_uid = last_result.get("fileUid")
+        if uploaded_file_uid is None:
+            logger.warning("'fileUid' was not returned in the upload response. This might cause issues.")
+        logger.debug(f"File uploaded successfully. Server temporary path: {temp_server_filename}")
+        return uploaded_file_uid, temp_server_filename
@@ -0,0 +1,320 @@
+import os
+import json
+import time
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from api.chunked_upload import ChunkedUploader, USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+# ImportFiles settings per object kind, matching what each manager sends for a single file.
+IMPORT_PROFILES = {
+    "MM_OBJ": {
+        "TreeIdentifier": "33499dad-a760-44e0-a3c5-49ce14f184c4",
+        "Type": "ConfiguredObject",
+        "SubType": "MM_OBJ",
+    },
+    "MM_BOM": {
+        "TreeIdentifier": "33499dad-a760-44e0-a3c5-49ce14f184c4",
+        "Type": "MM_OBJ",
+        "SubType": "MM_BOM",
+    },
+    "PM_RECIPE": {
+        "TreeIdentifier": "accf9c3b-1691-4e1a-b548-58c72e1db63c",
+        "Type": "PM_RECIPE",
+        "SubType": "PM_RECIPE",
+    },
+}
+
+
+def format_error(error: dict) -> str:
+    """Renders one entry of a result's 'errors' list as 'line L, column C: message [code]'."""
+    where = ", ".join(f"{label} {error[key]}" for key, label in (("line", "line"), ("column", "column")) if error.get(key))
+    text = f"{where}: {error.get('message')}" if where else str(error.get("message"))
+    return f"{text} [{error['code']}]" if error.get("code") else text
+
+
+class SpecImporter:
+    """
+    Uploads generated spec XMLs and imports them with as few ImportFiles calls as possible.
+
+    Works on top of any of the POMSicle managers (material, BOM, recipe): it reuses the
+    manager's logged-in session, endpoints and username.
+    """
+    def __init__(self, manager, max_workers: int = 4, batch_size: int = 100):
+        """
+        Initializes the SpecImporter.
+
+        Args:
+            manager: A PomsicleMaterialManager, PomsicleBOMManager or PomsicleTemplateManager.
+            max_workers (int): Maximum concurrent uploads.
+            batch_size (int): Maximum number of files listed in a single ImportFiles call.
+        """
+        self.manager = manager
+        self.session = manager.session
+        self.max_workers = max(1, int(max_workers))
+        self.batch_size = max(1, int(batch_size))
+        self.uploader = ChunkedUploader.from_manager(manager)
+
+    def upload(self, content: bytes | str, file_name: str) -> tuple[str | None, str | None]:
+        """
+        Uploads a single XML document in chunks.
+
+        Args:
+            content (bytes | str): The serialized XML document, or a path to stream it from.
+            file_name (str): Logical name of the file.
+
+        Returns:
+            tuple: (uploaded_file_uid, temp_server_filename) or (None, None) on failure.
+        """
+        uid, temp_server_filename = self.uploader.upload(content, file_name)
+        if not uid:
+            logger.error(f"Upload of '{file_name}' failed.")
+        return uid, temp_server_filename
+
+    def import_files(self, file_entries: list[dict], obj_kind: str, level_id: str, location_id: str,
+                     validate_only: bool = False) -> dict | None:
+        """
+        Calls ImportFiles once for all the given uploaded files.
+
+        Args:
+            file_entries (list[dict]): ImportFiles 'Files' entries (FileName, Extension, Size, Uid).
+            obj_kind (str): Key of IMPORT_PROFILES ('MM_OBJ', 'MM_BOM' or 'PM_RECIPE').
+            level_id (str): Level ID to import into.
+            location_id (str): Location ID to import into.
+            validate_only (bool): If True, the server only validates the XML.
+
+        Returns:
+            dict: The JSON response from the import API call, or None on failure.
+        """
+        manager = self.manager
+        profile = IMPORT_PROFILES[obj_kind]
+
+        pass_data_json = {
+            "userID": manager.username,
+            "TreeIdentifier": profile["TreeIdentifier"],
+            "Domain": "",
+            "DLL": "POMS_ProcObject_Lib",
+            "Type": profile["Type"],
+            "SubType": profile["SubType"],
+            "Level": level_id,
+            "Location": location_id,
+            "Folder": "",
+            "SearchSubType": "",
+            "Files": file_entries,
+            "Signature": {
+                "SignatureRequired": False,
+                "UserID": manager.username,
+                "UserName": manager.username,
+                "Reason": "Import",
+                "ISOTimestamp": datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+                "UserID2": "", "UserName2": "", "Comment": ""
+            },
+            "ValidateXMLOnly": validate_only,
+            "StopOnError": False,
+            "PreserveCheckinCheckout": False,
+            "PreserveVersion": False,
+            "PreserveStatus": False,
+            "CreateFolders": False,
+            "ImportBase": True,
+            "ImportPhases": False
+        }
+
+        headers_for_import = {
+            'Accept': 'application/json, text/javascript, */*; q=0.01',
+            'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
+            'Connection': 'keep-alive',
+            'Content-Type': 'application/json;charset=UTF-8',
+            'Origin': manager.login_host,
+            'Referer': f"{manager.base_app_url}SpecificationManagement.aspx",
+            'User-Agent': USER_AGENT,
+            'X-Requested-With': 'XMLHttpRequest',
+        }
+
+        try:
+            response = self.session.post(manager.import_url, json=pass_data_json, headers=headers_for_import, verify=False)
+            response.raise_for_status()
+            result = response.json()
+            logger.debug(f"ImportFiles response for {len(file_entries)} files: {json.dumps(result, indent=2)}")
+            return result
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Import request failed: {e}")
+            if hasattr(e, 'response') and e.response is not None:
+                logger.error(f"Response Status Code: {e.response.status_code}, Content: {e.response.text}")
+            return None
+        except ValueError as e:
+            logger.error(f"Import request returned invalid JSON: {e}")
+            return None
+
+    @staticmethod
+    def _file_results(import_result: dict | None) -> tuple[bool, str | None, dict, dict]:
+        """
+        Splits an ImportFiles response into the overall outcome and any per-file entries.
+
+        Per-file entries are looked up under 'Files', 'FileResults' or 'Results' in the 'd'
+        payload and indexed by 'Uid' and by 'FileName'. A file name reported more than once
+        is left out of the name index, since it cannot tell those files apart.
+
+        Returns:
+            tuple: (overall_success, overall_message, entries_by_uid, entries_by_name)
+        """
+        payload = (import_result or {}).get("d") or {}
+        if isinstance(payload, str):
+            try:
+                payload = json.loads(payload)
+            except ValueError:
+                payload = {"Message": payload}
+        if not isinstance(payload, dict):
+            payload = {}
+
+        by_uid, by_name, repeated = {}, {}, set()
+        for key in ("Files", "FileResults", "Results"):
+            items = payload.get(key)
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                if item.get("Uid"):
+                    by_uid[item["Uid"]] = item
+                name = item.get("FileName")
+                if name:
+                    if name in by_name:
+                        repeated.add(name)
+                    by_name[name] = item
+        for name in repeated:
+            del by_name[name]
+
+        message = payload.get("Message") or payload.get("ErrorMessage")
+        return bool(payload.get("Success")), message, by_uid, by_name
+
+    @staticmethod
+    def _errors(item: dict | None, message: str | None, success: bool) -> list[dict]:
+        """
+        Normalizes the errors reported for one file.
+
+        Entries listed under 'Errors', 'ValidationErrors' or 'Messages' may be plain strings
+        or objects; both become dicts with 'message', 'line', 'column' and 'code'. A failed
+        file with no listed errors gets a single entry holding its message.
+
+        Returns:
+            list[dict]: The file's errors, empty if it succeeded without any.
+        """
+        errors = []
+        for key in ("Errors", "ValidationErrors", "Messages"):
+            entries = (item or {}).get(key)
+            if isinstance(entries, (str, dict)):
+                entries = [entries]
+            if not isinstance(entries, list):
+                continue
+            for entry in entries:
+                if isinstance(entry, dict):
+                    errors.append({
+                        "message": entry.get("Message") or entry.get("ErrorMessage") or entry.get("Description"),
+                        "line": entry.get("Line") or entry.get("LineNumber"),
+                        "column": entry.get("Column") or entry.get("LinePosition"),
+                        "code": entry.get("Code") or entry.get("ErrorCode"),
+                    })
+                elif entry:
+                    errors.append({"message": str(entry), "line": None, "column": None, "code": None})
+
+        if not errors and not success:
+            errors.append({"message": message or "Unknown error.", "line": None, "column": None, "code": None})
+        return errors
+
+    def import_many(self, files: list[tuple[str, bytes | str]], obj_kind: str, level_id: str, location_id: str,
+                    validate_only: bool = False) -> list[dict]:
+        """
+        Uploads every file (concurrently, bounded by max_workers) and imports them with one
+        ImportFiles call per batch_size files.
+
+        Args:
+            files (list[tuple[str, bytes | str]]): (file_name, content) pairs. content may be
+                        a file path, which is streamed instead of read into memory.
+            obj_kind (str): Key of IMPORT_PROFILES ('MM_OBJ', 'MM_BOM' or 'PM_RECIPE').
+            level_id (str): Level ID to import into.
+            location_id (str): Location ID to import into.
+            validate_only (bool): If True, the server only validates the XML.
+
+        Returns:
+            list[dict]: One result per input file, in input order, with keys
+                        'file_name', 'uploaded', 'success', 'message', 'errors' and 'upload_ms'.
+                        'errors' is the list built by _errors().
+        """
+        if obj_kind not in IMPORT_PROFILES:
+            raise ValueError(f"Unknown object kind '{obj_kind}'. Expected one of {list(IMPORT_PROFILES)}.")
+
+        results = [{"file_name": name, "uploaded": False, "success": False, "message": None, "errors": [],
+                    "upload_ms": None} for name, _ in files]
+        if not files:
+            return results
+
+        if not self.manager._perform_login():
+            for result in results:
+                result["message"] = "Login failed."
+                result["errors"] = self._errors(None, result["message"], False)
+            return results
+
+        def timed_upload(file):
+            start = time.perf_counter()
+            uid, temp = self.upload(file[1], file[0])
+            return uid, temp, (time.perf_counter() - start) * 1000
+
+        workers = min(self.max_workers, len(files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            uploads = list(executor.map(timed_upload, files))
+
+        entries = []
+        for index, ((file_name, content), (uid, _, upload_ms)) in enumerate(zip(files, uploads)):
+            results[index]["upload_ms"] = upload_ms
+            if not uid:
+                results[index]["message"] = "Upload failed."
+                results[index]["errors"] = self._errors(None, "Upload failed.", False)
+                continue
+            results[index]["uploaded"] = True
+            entries.append((index, {
+                "FileName": file_name,
+                "Extension": os.path.splitext(file_name)[1],
+                "Size": os.path.getsize(content) if isinstance(content, str) else len(content),
+                "Uid": uid
+            }))
+
+        doing, done = ("Validating", "Validated") if validate_only else ("Importing", "Imported")
+        for start in range(0, len(entries), self.batch_size):
+            batch = entries[start:start + self.batch_size]
+            logger.info(f"{doing} {len(batch)} files in one ImportFiles call ({start + len(batch)}/{len(entries)})...")
+            import_result = self.import_files([entry for _, entry in batch], obj_kind, level_id, location_id, validate_only)
+            overall, message, by_uid, by_name = self._file_results(import_result)
+            # Names shared within the batch can only be matched by Uid
+            names = Counter(entry["FileName"] for _, entry in batch)
+
+            for index, entry in batch:
+                item = by_uid.get(entry["Uid"])
+                if item is None and names[entry["FileName"]] == 1:
+                    item = by_name.get(entry["FileName"])
+                if item is not None:
+                    results[index]["success"] = bool(item.get("Success", overall))
+                    results[index]["message"] = item.get("Message") or item.get("ErrorMessage") or message
+                else:
+                    results[index]["success"] = overall
+                    results[index]["message"] = message if import_result is not None else "Import request failed."
+                results[index]["errors"] = self._errors(item, results[index]["message"], results[index]["success"])
+
+        succeeded = sum(1 for result in results if result["success"])
+        logger.info(f"{done} {succeeded}/{len(files)} files.")
+        return results
+
+    def validate_many(self, files: list[tuple[str, bytes | str]], obj_kind: str, level_id: str,
+                      location_id: str) -> list[dict]:
+        """
+        Uploads every file and has the server validate them without importing anything.
+
+        Same arguments and results as import_many(); 'success' means the file is valid and
+        'errors' lists what the server reported for it.
+        """
+        return self.import_many(files, obj_kind, level_id, location_id, validate_only=True)
@@ -19,7 +19,16 @@ TRANSLATOR_INSTANCE_ID = settings["TRANSLATOR_INSTANCE_ID"]
 DEFAULT_MEDIA_TYPE = "application/json"
 
 
-def call(token: str, material_file: str):
+def call(token: str, material_file: str) -> bool:
+    """
+    Sends one transaction to the transaction API.
+
+    Returns:
+        bool: True if the server accepted the transaction (HTTP 200), False otherwise.
+
+    Raises:
+        requests.exceptions.RequestException: If the request could not be made (e.g. a timeout).
+    """
     path = BASE_URL + "v1/Interface/Transaction/Call"
 
     headers = {"Content-Type": DEFAULT_MEDIA_TYPE, "Authorization": f"Bearer {token}"}
@@ -33,9 +42,11 @@ def call(token: str, material_file: str):
     response = requests.post(path, json=payload, headers=headers, timeout=10)
 
     if response.status_code == 200:
-        return Banner().success(response.text)
+        Banner().success(response.text)
+        return True
     else:
-        return Banner().error(f"{response}: {response.text}")
+        Banner().error(f"{response}: {response.text}")
+        return False
 
 
 # # def call(token: str, transaction_value_xml: str):
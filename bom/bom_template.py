@@ -8,15 +8,70 @@ from urllib.parse import quote_plus, urljoin
 from bs4 import BeautifulSoup
 from banners import Banner
 import uuid
+import io
+import copy
+import tempfile
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from utils.parse_date import parse_poms_date as parse_date
+from utils.material_cache import MaterialCache
+from api.chunked_upload import ChunkedUploader
+from utils.bom_snapshot import BomSnapshotCache, diff_snapshots
+from utils.element_path import child_path, follow
 
 logger = logging.getLogger(__name__)
 
+BOM_DIR = os.path.dirname(__file__)
+
+
+def _snapshot(header: ET.Element) -> dict:
+    """
+    Reduces a built BOM header to the values that matter for change detection.
+
+    Returns:
+        dict: '__header__' plus one entry per line item keyed by 'itemObjId#itemNumber',
+              holding the line item attributes and every attribute element's sValue/nValue.
+    """
+    snapshot = {"__header__": {key: header.get(key) for key in ('id', 'description', 'levelId', 'locationId')}}
+    for line_item in header.iter('eLineItem'):
+        values = dict(line_item.attrib)
+        for attr in line_item.iter('eObjectAttribute'):
+            for elem in attr.iter('eObjectAttributeElement'):
+                for field in ('sValue', 'nValue'):
+                    if elem.get(field) is not None:
+                        values[f"{attr.get('attribId')}/{elem.get('elemId')}/{field}"] = elem.get(field)
+        snapshot[f"{line_item.get('itemObjId')}#{line_item.get('itemNumber')}"] = values
+    return snapshot
+
+
+@lru_cache(maxsize=1)
+def _load_fragments() -> tuple[ET.Element, ET.Element, ET.Element, tuple[int, ...] | None]:
+    """
+    Parses the BOM template, header and line item fragments once per process.
+
+    Returns:
+        tuple: (template_root, header_root, line_item_root, dispense_uom_path). The roots are
+               shared read-only prototypes and must be deep-copied before modification.
+               dispense_uom_path locates the Dispense/UOM element inside a line item copy.
+    """
+    template_root = ET.parse(os.path.join(BOM_DIR, 'template', 'template.xml')).getroot()
+    header_root = ET.parse(os.path.join(BOM_DIR, 'objects', 'header.xml')).getroot()
+    line_item_root = ET.parse(os.path.join(BOM_DIR, 'objects', 'line_item.xml')).getroot()
+
+    uom_elem = None
+    dispense_attr = line_item_root.find(".//eObjectAttribute[@attribId='Dispense']")
+    if dispense_attr is not None:
+        uom_elem = dispense_attr.find(".//eObjectAttributeElement[@elemId='UOM']")
+
+    return template_root, header_root, line_item_root, child_path(line_item_root, uom_elem)
+
+
 class PomsicleBOMManager:
     """
     Manages the upload and import of BOM XML files to POMSicle.
     """
-    def __init__(self, settings: dict, location_settings: dict, materials: list, username: str, password: str):
+    def __init__(self, settings: dict, location_settings: dict, materials: list, username: str, password: str,
+                 max_workers: int | None = None, cache: MaterialCache | None = None, use_cache: bool = True):
         """
         Initializes the PomsicleBOMManager with configuration settings and credentials.
 
@@ -26,6 +81,11 @@ class PomsicleBOMManager:
             materials (list): A list of materials to include in the BOM.
             username (str): The username for POMSicle login.
             password (str): The password for POMSicle login.
+            max_workers (int, optional): Maximum concurrent material lookups. Defaults to
+                             MATERIAL_LOOKUP_WORKERS from settings, or 8.
+            cache (MaterialCache, optional): Material metadata cache. Defaults to one built
+                             from the MATERIAL_CACHE_* settings.
+            use_cache (bool): If False, material lookups bypass the cache entirely.
         """
         self.settings = settings
         self.username = username
@@ -59,65 +119,189 @@ class PomsicleBOMManager:
 
         self.configuredObject_objType = "MM_OBJ"
 
-        self.fetched_materials = self._get_materials()
+        self.max_workers = max(1, int(max_workers or settings.get('MATERIAL_LOOKUP_WORKERS', 8)))
+        self._fetched_materials = None
+        self.cache = (cache or MaterialCache.from_settings(settings)) if use_cache else None
+
+        # Set by _modify_template_xml for diff mode
+        self._last_bom_id = None
+        self._last_snapshot = None
+
+        # Size the connection pool so concurrent lookups reuse connections instead of discarding them
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
         if not all([self.username, self.password, self.machine_name, self.base_app_url,
                     self.import_url, self.file_upload_url, self.login_host]):
             logger.critical("Missing essential configuration variables in settings. Exiting.")
             raise ValueError("Missing essential configuration variables for PomsicleTemplateManager.")
         
+    @property
+    def fetched_materials(self) -> dict:
+        """
+        Material details keyed by material ID, fetched on first access.
+        """
+        if self._fetched_materials is None:
+            self._fetched_materials = self._get_materials()
+        return self._fetched_materials
+
     def _get_materials(self) -> dict:
         """
         Fetches material details from the POMS materials API.
+        Lookups run concurrently over the shared session, bounded by max_workers.
 
         Returns:
-            dict: A dictionary of material details keyed by material ID.
+            dict: A dictionary of material details keyed by material ID, in BOM input order.
         """
+        material_ids = list(dict.fromkeys(self.materials))
+        found = self.cache.get_many(material_ids, self.level_id, self.location_id) if self.cache else {}
+        missing = [material_id for material_id in material_ids if material_id not in found]
+
+        if missing:
+            # Only login if not already logged in
+            if not self._is_logged_in:
+                if not self._perform_login():
+                    logger.critical("Login failed. Cannot fetch materials.")
+                    return {}
+
+            workers = min(self.max_workers, len(missing))
+            logger.debug(f"Fetching {len(missing)} materials with {workers} workers.")
+
+            fetched = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for material_id, (material_info, cacheable) in zip(missing, executor.map(self._fetch_material, missing)):
+                    found[material_id] = material_info
+                    if cacheable:
+                        fetched[material_id] = material_info
+
+            if self.cache:
+                self.cache.put_many(fetched, self.level_id, self.location_id)
+        else:
+            logger.debug(f"All {len(material_ids)} materials served from cache.")
+
         materials_data = {}
-        # Only login if not already logged in
-        if not self._is_logged_in:
-            if not self._perform_login():
-                logger.critical("Login failed. Cannot fetch materials.")
-                return materials_data
-
-        for material_id in self.materials:
-            body = {
-                "Approved": False,
-                "DLL": "POMS_BaseObject_Lib",
-                "Domain": "",
-                "Folder": "",
-                "IncludeLatest": False,
-                "IncludeLatestApproved": False,
-                "Latest": True,
-                "Level": self.level_id,
-                "Location": self.location_id,
-                "ObjectID": material_id,
-                "SearchSubType": "",
-                "SubType": "MM_OBJ",
-                "TreeIdentifier": "",
-                "Type": "",
-                "ignoreObsolete": False,
-                "userID": self.username
-                }
-
-            try:
-                logger.debug(f"Fetching material data from: {self.inner_materials_api}")
-                response = self.session.post(self.inner_materials_api, json=body)
-                response.raise_for_status()
-                if response.json()['d']['Rows'] == []:
-                    logger.warning(f"No data found for material '{material_id}'.")
-                    continue
-                row = response.json()['d']['Rows'][0]
-                material_info = {col["Column"]: col["Value"] for col in row}
-                if 'OBJ_ID' not in material_info.keys():
-                    logger.warning(f"Material '{material_id}' not found in system.")
-                    continue
-                materials_data[material_id] = material_info
-                logger.debug(f"Material data retrieved: {material_info}")
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to fetch material '{material_id}': {e}")
+        for material_id in material_ids:
+            if found.get(material_id) is None:
+                logger.warning(f"Material '{material_id}' not found in system.")
+                continue
+            materials_data[material_id] = found[material_id]
         return materials_data
 
+    def _fetch_material(self, material_id: str) -> tuple[dict | None, bool]:
+        """
+        Looks up a single material through GetObjectVersions.
+
+        Args:
+            material_id (str): ID of the material to look up.
+
+        Returns:
+            tuple: (material_info, cacheable). material_info is the material row as a
+                   column-to-value mapping, or None if not found. cacheable is False
+                   when the lookup itself failed and the result must not be cached.
+        """
+        body = {
+            "Approved": False,
+            "DLL": "POMS_BaseObject_Lib",
+            "Domain": "",
+            "Folder": "",
+            "IncludeLatest": False,
+            "IncludeLatestApproved": False,
+            "Latest": True,
+            "Level": self.level_id,
+            "Location": self.location_id,
+            "ObjectID": material_id,
+            "SearchSubType": "",
+            "SubType": "MM_OBJ",
+            "TreeIdentifier": "",
+            "Type": "",
+            "ignoreObsolete": False,
+            "userID": self.username
+            }
+
+        try:
+            logger.debug(f"Fetching material data from: {self.inner_materials_api}")
+            response = self.session.post(self.inner_materials_api, json=body)
+            response.raise_for_status()
+            rows = response.json()['d']['Rows']
+            if rows == []:
+                logger.debug(f"No data found for material '{material_id}'.")
+                return None, True
+            material_info = {col["Column"]: col["Value"] for col in rows[0]}
+            if 'OBJ_ID' not in material_info.keys():
+                return None, True
+            logger.debug(f"Material data retrieved: {material_info}")
+            return material_info, True
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch material '{material_id}': {e}")
+            return None, False
+
+    def _fetch_bom_version(self, bom_id: str) -> str | None:
+        """
+        Looks up the latest server version of a BOM through GetObjectVersions.
+
+        Args:
+            bom_id (str): ID of the BOM object.
+
+        Returns:
+            str: The OBJ_VER of the latest version, or None if the BOM does not exist or the lookup failed.
+        """
+        body = {
+            "Approved": False,
+            "DLL": "POMS_BaseObject_Lib",
+            "Domain": "",
+            "Folder": "",
+            "IncludeLatest": False,
+            "IncludeLatestApproved": False,
+            "Latest": True,
+            "Level": self.level_id,
+            "Location": self.location_id,
+            "ObjectID": bom_id,
+            "SearchSubType": "",
+            "SubType": "MM_BOM",
+            "TreeIdentifier": "",
+            "Type": "",
+            "ignoreObsolete": False,
+            "userID": self.username
+            }
+
+        try:
+            response = self.session.post(self.inner_materials_api, json=body)
+            response.raise_for_status()
+            rows = response.json()['d']['Rows']
+            if not rows:
+                return None
+            return {col["Column"]: col["Value"] for col in rows[0]}.get('OBJ_VER')
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            logger.warning(f"Failed to look up server version of BOM '{bom_id}': {e}")
+            return None
+
+    def _is_unchanged(self, snapshots: BomSnapshotCache) -> bool:
+        """
+        Checks whether the BOM just built matches the one last imported and still current on the server.
+
+        Returns:
+            bool: True if the import can be skipped.
+        """
+        stored = snapshots.get(self._last_bom_id, self.level_id, self.location_id)
+        if stored is None:
+            logger.info(f"No previous import recorded for BOM '{self._last_bom_id}'.")
+            return False
+
+        remote_version = self._fetch_bom_version(self._last_bom_id)
+        if remote_version is None or remote_version != stored["version"]:
+            logger.info(f"BOM '{self._last_bom_id}' changed on the server "
+                        f"(recorded {stored['version']}, server {remote_version}).")
+            return False
+
+        changes = diff_snapshots(stored["snapshot"], self._last_snapshot)
+        if any(changes.values()):
+            logger.info(f"BOM '{self._last_bom_id}' changed: {len(changes['added'])} added, "
+                        f"{len(changes['removed'])} removed, {len(changes['changed'])} modified line items.")
+            logger.debug(f"BOM '{self._last_bom_id}' changes: {changes}")
+            return False
+        return True
+
     def _perform_login(self) -> bool:
         """
         Performs a browser-like login to the POMSicle system.
@@ -237,25 +421,25 @@ class PomsicleBOMManager:
             logger.error(f"Error during XML processing: {e}")
             return None, None, None, None
 
-    def _modify_template_xml(self, bom_name: str = None) -> str:
+    def _modify_template_xml(self, bom_name: str = None) -> bytes:
         """
         Modifies the template XML by stitching together header, line items, and base objects.
-        Uses deep copies to ensure original template files are never modified.
+        The template fragments are parsed once per process and deep-copied, so the cached
+        prototypes are never modified.
         
         Args:
             bom_name (str): Name for the BOM. If None, generates a UUID-based name.
             
         Returns:
-            str: Path to the modified XML file.
+            bytes: The serialized BOM XML.
         """
-        template = ET.parse(os.path.join(os.path.dirname(__file__), 'template', 'template.xml'))
-        header_tree = ET.parse(os.path.join(os.path.dirname(__file__), 'objects', 'header.xml'))
-        line_item_tree = ET.parse(os.path.join(os.path.dirname(__file__), 'objects', 'line_item.xml'))
-        
-        template_root = template.getroot()
+        template_proto, header_proto, line_item_proto, dispense_uom_path = _load_fragments()
+
+        template_root = copy.deepcopy(template_proto)
+        template = ET.ElementTree(template_root)
         e_spec_xml_objs = template_root.find('eSpecXmlObjs')
         
-        header = ET.fromstring(ET.tostring(header_tree.getroot(), encoding='unicode'))
+        header = copy.deepcopy(header_proto)
         header.set('id', bom_name +"_BOM" or 'POMSICLE_BOM_' + str(uuid.uuid4()))
         header.set('description', bom_name + "_BOM" + "(Pomsicle)" or 'POMSICLE_BOM_DESC' + str(uuid.uuid4()))
         header.set('locationId', self.location_id)
@@ -264,7 +448,7 @@ class PomsicleBOMManager:
         
         item_number = 1
         for material_id, material_info in self.fetched_materials.items():
-            line_item = ET.fromstring(ET.tostring(line_item_tree.getroot(), encoding='unicode'))
+            line_item = copy.deepcopy(line_item_proto)
             
             line_item.set('itemLevelName', 'Master')
             line_item.set('itemLevelId', self.level_id)
@@ -283,11 +467,9 @@ class PomsicleBOMManager:
             
             # Modify sValue in Dispense UOM element (if material has INVENTORY_UOM)
             inventory_uom = material_info.get('INVENTORY_UOM', 'g')
-            dispense_attr = line_item.find(".//eObjectAttribute[@attribId='Dispense']")
-            if dispense_attr is not None:
-                uom_elem = dispense_attr.find(".//eObjectAttributeElement[@elemId='UOM']")
-                if uom_elem is not None:
-                    uom_elem.set('sValue', inventory_uom)
+            uom_elem = follow(line_item, dispense_uom_path)
+            if uom_elem is not None:
+                uom_elem.set('sValue', inventory_uom)
             
             # Append line item to header
             line_item.tail = "\t\t\t\n"
@@ -296,92 +478,31 @@ class PomsicleBOMManager:
         
         # Append header to template
         e_spec_xml_objs.append(header)
+        self._last_bom_id = header.get('id')
+        self._last_snapshot = _snapshot(header)
         
-        # Save the modified template to a temporary file
-        temp_xml_path = os.path.join(os.path.dirname(__file__), 'Bom_temp.xml')
-        template.write(temp_xml_path, encoding='utf-8', xml_declaration=False)
-        logger.debug(f"Modified template saved to: {temp_xml_path}")
-        
-        return temp_xml_path
+        # Serialize in memory; nothing is shared on disk between concurrent builds
+        buffer = io.BytesIO()
+        template.write(buffer, encoding='utf-8', xml_declaration=False)
+        xml_content = buffer.getvalue()
+        logger.debug(f"Modified BOM template serialized ({len(xml_content)} bytes).")
+
+        return xml_content
 
-    def _upload_file(self, xml_file_path: str, xml_file_name: str, total_file_size: int):
+    def _upload_file(self, xml_content: bytes, xml_file_name: str, total_file_size: int):
         """
-        Uploads a single XML file to the server.
+        Uploads a single XML document from memory to the server, in chunks of UPLOAD_CHUNK_SIZE.
 
         Args:
-            xml_file_path (str): Path to the XML file.
+            xml_content (bytes): The serialized XML document.
             xml_file_name (str): Name of the XML file.
             total_file_size (int): Size of the XML file in bytes.
 
         Returns:
             tuple: (uploaded_file_uid, temp_server_filename) or (None, None) on failure.
         """
-        logger.debug(f"Initiating single file upload for '{xml_file_name}' to {self.file_upload_url}...")
-
-        uploaded_file_uid = str(uuid.uuid4())
-        temp_server_filename = None
-
-        try:
-            with open(xml_file_path, 'rb') as f:
-                full_file_content = f.read()
-
-                metadata = {
-                    "chunkIndex": 0,
-                    "contentType": "text/xml",
-                    "fileName": xml_file_name,
-                    "relativePath": xml_file_name,
-                    "totalFileSize": total_file_size,
-                    "totalChunks": 1,
-                    "uploadUid": uploaded_file_uid
-                }
-
-                upload_files = {
-                    'files': ("blob", full_file_content, 'application/octet-stream'),
-                    'metadata': (None, json.dumps(metadata), 'application/json')
-                }
-
-                upload_headers = {
-                    'Accept': '*/*; q=0.5, application/json',
-                    'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
-                    'Connection': 'keep-alive',
-                    'Host': self.machine_name,
-                    'Origin': self.login_host,
-                    'Referer': f"{self.base_app_url}SpecificationManagement.aspx",
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
-                }
-
-                logger.debug(f"Uploading entire file as a single chunk (UID: {uploaded_file_uid})...")
-                upload_response = self.session.post(self.file_upload_url, files=upload_files, headers=upload_headers, verify=False)
-                upload_response.raise_for_status()
-
-                upload_result = upload_response.json()
-                logger.debug(f"Single upload response: {upload_result}")
-
-                if upload_result.get("uploaded", False):
-                    logger.debug("File uploaded successfully to server temp directory!")
-                    temp_server_filename = upload_result.get("TempFileName")
-                    uploaded_file_uid = upload_result.get("fileUid")
-                    if uploaded_file_uid is None:
-                        logger.warning("'fileUid' was not returned in the upload response. This might cause issues.")
-                else:
-                    logger.error(f"File failed to upload. Response: {upload_result}")
-                    return None, None
-
-            if not temp_server_filename:
-                logger.error("File upload completed but no TempFileName was received from the server.")
-                return None, None
-
-            logger.debug(f"Full file uploaded successfully. Server temporary path: {temp_server_filename}")
-            return uploaded_file_uid, temp_server_filename
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"File upload request failed: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response Status Code: {e.response.status_code}, Content: {e.response.text}")
-            return None, None
-        except Exception as e:
-            logger.error(f"An unexpected error occurred during file upload: {e}")
-            return None, None
+        logger.debug(f"Initiating upload for '{xml_file_name}' to {self.file_upload_url}...")
+        return ChunkedUploader.from_manager(self).upload(xml_content, xml_file_name, total_file_size)
 
     def _import_file(self, uploaded_file_uid: str, xml_file_name: str, obj_type: str, level_id: str, location_id: str, file_size: int):
         """
@@ -463,7 +584,49 @@ class PomsicleBOMManager:
                 logger.error(f"Response Status Code: {e.response.status_code}, Content: {e.response.text}")
             return None
 
-    def create_template(self, template_name: str = "Bom_template.xml", bom_name: str = None, pull: bool = False) -> str | None:
+    def _write_pulled_file(self, xml_content: bytes, bom_name: str | None, output_path: str | None = None) -> str | bool:
+        """
+        Writes BOM XML to the caller's path, or to a unique temp file if none is given.
+
+        Returns:
+            str | bool: Path of the written file, or False on failure.
+        """
+        try:
+            if output_path:
+                os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+                with open(output_path, 'wb') as f:
+                    f.write(xml_content)
+            else:
+                fd, output_path = tempfile.mkstemp(prefix=f"{bom_name or 'POMSICLE'}_BOM_", suffix=".xml")
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(xml_content)
+        except OSError as e:
+            logger.error(f"Failed to write BOM XML file: {e}")
+            return False
+
+        logger.debug(f"BOM XML file written: {output_path}")
+        return output_path
+
+    def build_xml(self, bom_name: str = None) -> bytes | None:
+        """
+        Generates the BOM XML in memory, without writing, uploading or importing it.
+
+        Returns:
+            bytes: The serialized BOM XML, or None on failure.
+        """
+        logger.debug("Modifying XML template with materials and BOM name...")
+        try:
+            xml_content = self._modify_template_xml(bom_name)
+            if not xml_content:
+                logger.error("Failed to generate modified BOM XML template. Aborting.")
+                return None
+        except Exception as e:
+            logger.error(f"Failed to modify BOM XML template: {e}")
+            return None
+        return xml_content
+
+    def create_template(self, template_name: str = "Bom_template.xml", bom_name: str = None, pull: bool = False,
+                        output_path: str | None = None, diff: bool = False) -> str | bool:
         """
         Main method to create a template by uploading and importing an XML file.
         Modifies the XML template with provided names before upload.
@@ -471,37 +634,35 @@ class PomsicleBOMManager:
         Args:
             template_name (str): The name of the template XML file to use.
             bom_name (str): Name for the BOM. If None, generates a UUID-based name.
-            pull (bool): If True, pulls the file name out and hand it to the parent.
+            pull (bool): If True, writes the BOM XML to disk and returns its path instead of uploading.
+            output_path (str, optional): Where to write the BOM XML when pulling. Defaults to a
+                             unique file in the system temp directory.
+            diff (bool): If True, skips the import when the BOM matches the last one imported
+                             and the server still holds that version.
         """
         logger.info(f"Attempting to create BOM: '{bom_name}'")
 
-        # Generate the modified template XML
-        logger.debug("Modifying XML template with materials and BOM name...")
-        try:
-            temp_xml_file_path = self._modify_template_xml(bom_name)
-            if not temp_xml_file_path or not os.path.exists(temp_xml_file_path):
-                logger.error("Failed to generate modified BOM XML template. Aborting.")
-                return False
-        except Exception as e:
-            logger.error(f"Failed to modify BOM XML template: {e}")
+        xml_content = self.build_xml(bom_name)
+        if not xml_content:
             return False
 
-        logger.debug(f"Temporary BOM XML file created: {temp_xml_file_path}")
-
         if pull:
-            return temp_xml_file_path
+            return self._write_pulled_file(xml_content, bom_name, output_path)
 
-        file_size = os.path.getsize(temp_xml_file_path)
+        # Material lookups may have been served entirely from cache without a login
+        if not self._perform_login():
+            logger.error("Login failed. Cannot proceed with upload and import.")
+            return False
 
-        uploaded_file_uid, temp_server_filename = self._upload_file(temp_xml_file_path, template_name, file_size)
-        
-        try:
-            if os.path.exists(temp_xml_file_path):
-                os.remove(temp_xml_file_path)
-                logger.debug(f"Cleaned up temporary XML file: {temp_xml_file_path}")
-        except OSError as e:
-            logger.warning(f"Failed to delete temporary XML file '{temp_xml_file_path}': {e}")
+        snapshots = BomSnapshotCache.from_settings(self.settings) if diff else None
+        if snapshots and self._is_unchanged(snapshots):
+            logger.info(f"BOM '{self._last_bom_id}' is unchanged. Skipping import.")
+            Banner().success(f"BOM '{bom_name or template_name}' is up to date.")
+            return True
+
+        file_size = len(xml_content)
 
+        uploaded_file_uid, temp_server_filename = self._upload_file(xml_content, template_name, file_size)
 
         if not uploaded_file_uid:
             logger.error("File upload failed. Aborting template creation.")
@@ -511,6 +672,9 @@ class PomsicleBOMManager:
 
         if import_result and import_result.get("d", {}).get("Success"):
             logger.debug(f"Template '{template_name}' imported successfully.")
+            if snapshots:
+                snapshots.put(self._last_bom_id, self.level_id, self.location_id, self._last_snapshot,
+                              self._fetch_bom_version(self._last_bom_id))
             Banner().success(f"BOM '{bom_name or template_name}' created successfully.")
             return True
         else:
@@ -104,7 +104,7 @@ def line_lookup(LineItem) -> dict:
         "OPTIMIZABLE": LineItem.OPTIMIZABLE,
         "SCALECLASS": LineItem.SCALING_CLASS,
         "SCALINGRULE": LineItem.SCALING_RULE,
-        "PERCENTINYIELD": LineItem.SCALING_RULE,
+        "PERCENTINYIELD": LineItem.PERCENT_IN_YIELD,
         "TRANSFER": LineItem.TRANSFER
     }
 
@@ -139,3 +139,60 @@ def record_lookup(Record) -> dict:
     }
 
     return record_look_up
+
+
+# ===================== SHEET COLUMNS ====================
+# Sheet headers are matched after normalize_column(), so "Item Ref No." and
+# "ITEM_REF_NO" both resolve to ITEM_REFERENCE_NO.
+LINE_ITEM_COLUMNS = {
+    "ITEMREFNO": "ITEM_REFERENCE_NO",
+    "ITEMID": "ITEM_ID",
+    "DISPENSECOMMENT": "DISPENSE_COMMENT",
+    "DISPENSEAREATYPE": "DISPENSE_AREA_TYPE",
+    "DISPENSEAREA": "DISPENSE_AREA",
+    "MATERIALQUANTITY": "MATERIAL_QUANTITY",
+    "UOM": "MATERIAL_QUANTITY_UOM",
+    "SCALINGRULE": "SCALING_RULE",
+    "TRANSFER": "TRANSFER",
+    "OPTIMIZABLE": "OPTIMIZABLE",
+    "AGGREGATEFLAG": "AGGREGATE_FLAG",
+    "SUBSTITUTIONNO": "SUBSITUTION_NO",
+    "ACTIVEFLAG": "ACTIVE_FLAG",
+    "ADDITIONGROUP": "ADDITION_GROUP",
+    "ALLOWBATCHSTAGING": "ALLOW_BATCH_STAGING",
+    "ALLOWWAREHOUSEDISPENSE": "ALLOW_WAREHOUSE_DISPENSE",
+    "CHECKIN": "CHECK_IN",
+    "CHECKWEIGHRULE": "CHECK_WEIGH_RULE",
+    "CHECKWEIGHTOLERANCE": "CHECK_WEIGH_TOLERANCE",
+    "DISPENSEMETHOD": "DISPENSE_METHOD",
+    "DISPENSEUOM": "DISPENSE_UOM",
+    "DISPENSETOLERANCERULE": "DISPENSE_TOLERANCE_RULE",
+    "DISPENSETOLERANCELOWER": "DISPENSE_TOLERANCE_LOWER",
+    "DISPENSETOLERANCEUPPER": "DISPENSE_TOLERANCE_UPPER",
+    "EQUIPMENTCLASS": "EQUIPMENT_CLASS",
+    "EXTBOMREFNO": "EXT_BOM_REF_NO",
+    "PERCENTINYIELD": "PERCENT_IN_YIELD",
+    "SCALECLASS": "SCALING_CLASS",
+}
+
+RECORD_COLUMNS = {
+    "BOMID": "BOM_ID",
+    "BOPID": "BOP_ID",
+    "MATERIALID": "MATERIAL_ID",
+    "PRODUCTID": "MATERIAL_ID",
+    "PLANT": "PLANT_ID",
+    "PLANTID": "PLANT_ID",
+    "DESCRIPTION": "DESCRIPTION",
+    "BOMDESCRIPTION": "DESCRIPTION",
+    "EFFECTIVITYDATE": "EFFECTIVE_DATE",
+    "EFFECTIVEDATE": "EFFECTIVE_DATE",
+    "EXPIRATIONDATE": "EXPIRATION_DATE",
+    "COMMENTS": "COMMENTS",
+    "BASEQUANTITY": "BASE_QUANTITY",
+    "BASEQUANTITYUOM": "BASE_QUANTITY_UOM",
+}
+
+
+def normalize_column(name: str) -> str:
+    """Uppercases a sheet header and strips everything but letters and digits."""
+    return "".join(ch for ch in str(name).upper() if ch.isalnum())
@@ -1,65 +1,133 @@
-from typing import Iterator
-from datetime import datetime
-import polars as pl
-from bom_structure import BOM_XML
-from bom_mapper import record_lookup, header_lookup, line_lookup, Record, Header, LineItem
+import logging
+from typing import Callable, Iterator, Iterable
+from bom.translator.bom_structure import BOM_XML
+from bom.translator.bom_mapper import (
+    record_lookup, header_lookup, line_lookup, normalize_column,
+    Record, Header, LineItem, LINE_ITEM_COLUMNS, RECORD_COLUMNS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _cell(value) -> str:
+    """Renders a sheet cell as transaction text; blanks become '' and 1.0 becomes '1'."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
 
 class Payload:
     """Returns the string representation of the BOM"""
     def __init__(self, type: str = "xml") -> None:
-        self.trans = BOM_XML()
-    
-    def fetch(self, records: Iterator = None) -> str:
-        """record is a singular row of the excel sheet"""
-        # Create instances of Header, Record, and LineItem
-        header = Header()
-        record_instance = Record()
+        self.type = type
+
+    def _line_item(self, row: dict) -> LineItem:
+        """Builds a LineItem from a named sheet row, keeping LineItem defaults for blank cells."""
         line_item_instance = LineItem()
-        
-        # Fill in Header information
+        for column, value in row.items():
+            attr = LINE_ITEM_COLUMNS.get(normalize_column(column))
+            text = _cell(value)
+            if attr and text:
+                setattr(line_item_instance, attr, text)
+        if not line_item_instance.DISPENSE_UOM:
+            line_item_instance.DISPENSE_UOM = line_item_instance.MATERIAL_QUANTITY_UOM
+        return line_item_instance
+
+    def _record(self, row: dict, bom_id: str) -> Record:
+        """Builds the BOM-level Record from the first sheet row of a BOM."""
+        record_instance = Record()
+        for column, value in row.items():
+            attr = RECORD_COLUMNS.get(normalize_column(column))
+            text = _cell(value)
+            if attr and text:
+                setattr(record_instance, attr, text)
+        record_instance.BOM_ID = bom_id
+        return record_instance
+
+    def build(self, record_instance: Record, line_items: Iterable[LineItem]) -> str:
+        """
+        Builds one POMSTransaction for a single BOM.
+
+        Args:
+            record_instance (Record): The BOM-level record.
+            line_items (Iterable[LineItem]): The BOM line items, in order.
+
+        Returns:
+            str: The transaction XML.
+        """
+        trans = BOM_XML()
+        header = Header()
+
         for header_attr, xml_element in header_lookup(header).items():
-            self.trans.add_header(header_attr, xml_element)
-        
-        # Fill in Record information
+            trans.add_header(header_attr, xml_element)
+
         for record_attr, xml_element in record_lookup(record_instance).items():
-            self.trans.add_record(record_attr, xml_element)
-        
-        # Add line items
-        for record in records.iter_rows():
-            line_item_instance.ITEM_REFERENCE_NO = record[0]
-            line_item_instance.SUBSITUTION_NO = record[11]
-            line_item_instance.ITEM_ID = str(record[1])
-            line_item_instance.ACTIVE_FLAG = record[12]
-            line_item_instance.AGGREGATE_FLAG = record[10]
-            line_item_instance.ADDITION_GROUP = record[13]
-            line_item_instance.ALLOW_BATCH_STAGING = record[14]
-            line_item_instance.ALLOW_WAREHOUSE_DISPENSE = record[15]
-            line_item_instance.CHECK_IN = record[16]
-            line_item_instance.CHECK_WEIGH_RULE = record[17]
-            line_item_instance.CHECK_WEIGH_TOLERANCE = record[18]
-            line_item_instance.DISPENSE_COMMENT = record[2]
-            line_item_instance.DISPENSE_METHOD = record[19]
-            line_item_instance.DISPENSE_UOM = record[6]
-            line_item_instance.DISPENSE_AREA_TYPE = record[3]
-            line_item_instance.DISPENSE_AREA = record[4]
-            line_item_instance.DISPENSE_TOLERANCE_RULE = record[20]
-            line_item_instance.DISPENSE_TOLERANCE_LOWER = record[21]
-            line_item_instance.DISPENSE_TOLERANCE_UPPER = record[22]
-            line_item_instance.EQUIPMENT_CLASS = record[23]
-            line_item_instance.EXT_BOM_REF_NO = record[24]
-            line_item_instance.MATERIAL_QUANTITY = record[5]
-            line_item_instance.MATERIAL_QUANTITY_UOM = record[6]
-            line_item_instance.PERCENT_IN_YIELD = record[25] # Change the location of this in sheet
-            line_item_instance.OPTIMIZABLE = record[9]
-            line_item_instance.SCALING_CLASS = record[0]
-            line_item_instance.SCALING_RULE = record[7]
-            line_item_instance.TRANSFER = record[8]
+            trans.add_record(record_attr, xml_element)
+
+        for line_item_instance in line_items:
             for line_item_attr, xml_element in line_lookup(line_item_instance).items():
-                self.trans.add_line_item(line_item_attr, xml_element)
-            self.trans.line = None # This will add <LineItem> tag after the end of one BOM item.
+                trans.add_line_item(line_item_attr, xml_element)
+            trans.line = None # This will add <LineItem> tag after the end of one BOM item.
+
+        return trans.to_string().decode("UTF-8")
+
+    @staticmethod
+    def _bom_id(row: dict, default_bom_id: str) -> str | None:
+        """Returns the BOM ID of a named sheet row, default_bom_id if it has none, or None for a blank row."""
+        if not any(_cell(value) for value in row.values()):
+            return None
+        return next(
+            (_cell(value) for column, value in row.items()
+             if RECORD_COLUMNS.get(normalize_column(column)) == "BOM_ID" and _cell(value)),
+            default_bom_id
+        )
+
+    def stream(self, rows: Callable[[], Iterator[dict]], default_bom_id: str = "POMSICLE_BOM") -> Iterator[tuple[str, str]]:
+        """
+        Groups named sheet rows into BOMs in two passes over the rows, yielding each BOM as
+        soon as its last row has been read.
+
+        The first pass only records where each BOM's last row is. The second builds line
+        items and yields a BOM at that row, so only BOMs whose rows are still to come are
+        held in memory: one at a time for a sheet with contiguous BOMs. A BOM's rows do not
+        have to be contiguous. The record fields come from the BOM's first row. Sheets
+        without a BOM ID column are treated as a single BOM named default_bom_id.
+
+        Args:
+            rows (Callable): Returns a fresh iterator over the sheet rows, keyed by column header.
+            default_bom_id (str): BOM ID for rows without one.
+
+        Yields:
+            tuple: (bom_id, transaction_xml)
+        """
+        last_rows = {}
+        for index, row in enumerate(rows()):
+            bom_id = self._bom_id(row, default_bom_id)
+            if bom_id is not None:
+                last_rows[bom_id] = index
+
+        pending = {}
+        for index, row in enumerate(rows()):
+            bom_id = self._bom_id(row, default_bom_id)
+            if bom_id is None:
+                continue
+
+            if bom_id not in pending:
+                pending[bom_id] = (self._record(row, bom_id), [])
+            pending[bom_id][1].append(self._line_item(row))
+
+            if index == last_rows[bom_id]:
+                record_instance, line_items = pending.pop(bom_id)
+                yield bom_id, self.build(record_instance, line_items)
 
-            
-        return self.trans.save("bom.xml")
+    def fetch(self, records=None) -> str:
+        """records is the BOM sheet as a polars DataFrame; every row becomes one line item of a single BOM"""
+        rows = list(records.iter_rows(named=True))
+        record_instance = self._record(rows[0], Record.BOM_ID) if rows else Record()
+        transaction = self.build(record_instance, (self._line_item(row) for row in rows))
 
-if __name__ == '__main__':
-    Payload().fetch()
+        with open("bom.xml", "w", encoding="UTF-8") as f:
+            f.write(transaction)
+        return transaction
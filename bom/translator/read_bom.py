@@ -0,0 +1,83 @@
+import os
+import re
+import csv
+import logging
+import tempfile
+import requests
+from xlsx2csv import Xlsx2csv, XlsxException
+from config import config
+from bom.translator.bom_payload import Payload
+from api.transaction import call
+
+logger = logging.getLogger(__name__)
+
+payload = Payload()
+
+settings = config('pomsicle')
+
+SHEET = settings.get("BOM_SHEET", "BOMTemplating")
+
+
+def _file_name(bom_id: str) -> str:
+    """Turns a BOM ID into a file name that stays inside the pull directory."""
+    return (re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", bom_id).strip(". ") or "_") + ".xml"
+
+
+def _sheet_rows(csv_path: str):
+    """Yields the rows of a converted sheet one at a time, keyed by header."""
+    with open(csv_path, newline="", encoding="UTF-8") as f:
+        yield from csv.DictReader(f)
+
+
+def read_file(token: str | None, filename: str, bom_name: str = "POMSICLE_BOM", pull: str | None = None) -> dict:
+    """
+    Builds one BOM transaction per BOM ID in the sheet and sends each to the transaction API.
+
+    The sheet is converted to a temporary CSV file and read row by row, so memory holds
+    only the BOMs being assembled, not the sheet.
+
+    Args:
+        token (str): API access token. Not needed when pull is set.
+        filename (str): Path to the Excel workbook.
+        bom_name (str): BOM ID for sheets without a BOM ID column.
+        pull (str, optional): Directory to write each BOM transaction to instead of sending it.
+
+    Returns:
+        dict: BOM ID to True if it was written or accepted by the server, False otherwise.
+
+    Raises:
+        ValueError: If the workbook or sheet cannot be read.
+    """
+    if pull:
+        os.makedirs(pull, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "bom.csv")
+        try:
+            Xlsx2csv(filename, skip_empty_lines=True).convert(csv_path, sheetname=SHEET)
+        except (OSError, XlsxException) as e:
+            raise ValueError(f"Could not read sheet '{SHEET}' of '{filename}': {e}")
+
+        results = {}
+        for bom_id, transaction in payload.stream(lambda: _sheet_rows(csv_path), default_bom_id=bom_name):
+            if pull:
+                path = os.path.join(pull, _file_name(bom_id))
+                try:
+                    with open(path, "w", encoding="UTF-8") as f:
+                        f.write(transaction)
+                except OSError as e:
+                    logger.error(f"Failed to write BOM '{bom_id}' to {path}: {e}")
+                    results[bom_id] = False
+                    continue
+                logger.info(f"BOM '{bom_id}' written to {path}")
+                results[bom_id] = True
+                continue
+
+            logger.info(f"Sending BOM '{bom_id}'")
+            try:
+                results[bom_id] = call(token, transaction)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to send BOM '{bom_id}': {e}")
+                results[bom_id] = False
+
+    return results
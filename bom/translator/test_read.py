@@ -1,5 +1,10 @@
+import os
+import sys
 import polars as pl
-from bom_payload import Payload
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from bom.translator.bom_payload import Payload
 
 payload = Payload()
 
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, NamedTuple
 import requests
 import json
 import xml.etree.ElementTree as ET
@@ -9,17 +9,137 @@ from urllib.parse import quote_plus, urljoin
 from configparser import SectionProxy
 from bs4 import BeautifulSoup
 import ast
+import io
+import copy
+import hashlib
+import tempfile
 import uuid
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from utils.parse_date import parse_poms_date as parse_date
+from utils.material_cache import MaterialCache
+from api.chunked_upload import ChunkedUploader
+from utils.element_path import child_path, follow
 
 logger = logging.getLogger(__name__)
 
+# Elements that hold an attribute's value, in order of preference
+VALUE_ELEMENTS = ('Value', 'UOM', 'Status Value')
+
+
+def material_defaults(material_settings: Optional[SectionProxy | dict]) -> dict:
+    """
+    Flattens the [pomsicle:material] section into a plain attribId to sValue dict.
+
+    The CLI passes the config section, whose values are dict literals such as
+    '{"Inventory UOM": "g"}'; the web methods already pass a plain dict.
+    """
+    if not material_settings:
+        return {}
+    if isinstance(material_settings, dict):
+        return dict(material_settings)
+
+    defaults = {}
+    for key, value in material_settings.items():
+        try:
+            defaults.update(ast.literal_eval(value))
+        except (ValueError, SyntaxError, TypeError):
+            # Plain 'attribId=value' overrides added by the CLI
+            defaults[key] = value
+    return defaults
+
+
+# create_template() result for a material skipped by plan()
+SKIPPED = "skipped"
+
+
+def material_fingerprint(material_description: Optional[str], attributes: Optional[dict]) -> str:
+    """
+    Returns a stable hash of what POMSicle sets on a material, used to tell whether a
+    material that already exists needs a new version.
+    """
+    if attributes and not isinstance(attributes, dict):
+        attributes = material_defaults(attributes)
+    payload = json.dumps(
+        [material_description or "", sorted((str(k), str(v)) for k, v in (attributes or {}).items())]
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class _AttributeSlot(NamedTuple):
+    """Where an attribute's sValue lives in the template, and its allowed choices."""
+    elem_path: tuple | None
+    choices: frozenset
+    folded: dict
+
+
+class _TemplateIndex(NamedTuple):
+    root: ET.Element
+    base_path: tuple
+    attributes: dict
+    attrib_ids: dict
+
+
+@lru_cache(maxsize=1)
+def _load_template() -> _TemplateIndex:
+    """
+    Parses material_template.xml once and indexes it.
+
+    Each attribId maps to the child-index path (below the eBaseObject) of the element whose
+    sValue is set, and to a lowercase-to-canonical map of its popMethodAttr choices. Element
+    paths stay valid on deep copies of the root, so building a material is a clone plus
+    dict lookups.
+    """
+    template_path = os.path.join(os.path.dirname(__file__), 'template', 'material_template.xml')
+    if not os.path.exists(template_path):
+        logger.error(f"Material template not found at: {template_path}")
+        raise FileNotFoundError(f"Material template not found at: {template_path}")
+
+    root = ET.parse(template_path).getroot()
+    e_spec_xml_objs = root.find('eSpecXmlObjs')
+    if e_spec_xml_objs is None:
+        raise RuntimeError("Template does not contain <eSpecXmlObjs> element")
+
+    # Find the eBaseObject (should be only one in material template)
+    base_object = e_spec_xml_objs.find(".//eBaseObject[@objType='MM_OBJ']")
+    if base_object is None:
+        raise RuntimeError("Template does not contain <eBaseObject objType='MM_OBJ'> element")
+
+    attributes = {}
+    for attr in base_object.iter('eObjectAttribute'):
+        attrib_id = attr.get('attribId')
+        if attrib_id in attributes:
+            continue
+        elem = next(
+            (e for elem_id in VALUE_ELEMENTS
+             if (e := attr.find(f".//eObjectAttributeElement[@elemId='{elem_id}']")) is not None),
+            None
+        )
+        choices = [c.strip() for c in elem.get('popMethodAttr', '').split(';') if c.strip()] if elem is not None else []
+        folded = {}
+        for choice in choices:
+            folded.setdefault(choice.lower(), choice)
+        attributes[attrib_id] = _AttributeSlot(
+            child_path(base_object, elem),
+            frozenset(choices),
+            folded
+        )
+
+    return _TemplateIndex(
+        root=root,
+        base_path=child_path(root, base_object),
+        attributes=attributes,
+        attrib_ids={attrib_id.lower(): attrib_id for attrib_id in attributes}
+    )
+
+
 class PomsicleMaterialManager:
     """
     Manages the creation, modification, and upload of Material XML files to POMSicle.
     """
     def __init__(self, settings: SectionProxy,
-                material_settings: Optional[SectionProxy | dict], location_settings: SectionProxy, username: str, password: str):
+                material_settings: Optional[SectionProxy | dict], location_settings: SectionProxy, username: str, password: str,
+                max_workers: int | None = None, cache: MaterialCache | None = None, use_cache: bool = True):
         """
         Initializes the PomsicleMaterialManager with configuration settings and credentials.
 
@@ -29,6 +149,10 @@ class PomsicleMaterialManager:
             material_settings (dict): Material-specific settings (level_id, location_id, location_name).
             username (str): The username for POMSicle login.
             password (str): The password for POMSicle login.
+            max_workers (int, optional): Maximum concurrent existence lookups. Defaults to
+                             MATERIAL_LOOKUP_WORKERS from settings, or 8.
+            cache (MaterialCache, optional): Material lookup cache. Defaults to one built from settings.
+            use_cache (bool): If False, existence lookups always go to the server.
         """
         self.settings = settings
         self.username = username
@@ -65,11 +189,20 @@ class PomsicleMaterialManager:
         self.location_id = location_settings.get('LOCATION_ID', '4')
         self.location_name = location_settings.get('LOCATION_NAME', 'Herndon')
 
+        self.max_workers = max(1, int(max_workers or settings.get('MATERIAL_LOOKUP_WORKERS', 8)))
+        self.cache = (cache or MaterialCache.from_settings(settings)) if use_cache else None
+
         self.session = requests.Session()
         self._is_logged_in = False
+
+        # Size the connection pool for concurrent lookups over the shared session
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         self.file_upload_url = self.login_host + '/' + self.base_app_url + '/' + self.file_upload_url
         self.import_url = self.login_host + '/' + self.base_app_url + '/' + self.import_url
+        self.inner_materials_api = self.login_host + '/' + self.base_app_url + '/SpecificationManagement.aspx/GetObjectVersions'
 
         self.login_page_relative_path = "/POMS/DesktopDefault.aspx"
         self.espec_model_base_path = "/poms/apps/eSpecWebApplication/"
@@ -202,39 +335,163 @@ class PomsicleMaterialManager:
             logger.error(f"Error during XML processing: {e}")
             return None, None, None, None
 
-    def _modify_template_xml(self, material_id: str, material_description: Optional[str | None], attributes: Optional[dict]) -> str:
+    def _fetch_material(self, material_id: str) -> tuple[dict | None, bool]:
+        """
+        Looks up a single material through GetObjectVersions.
+
+        Args:
+            material_id (str): ID of the material to look up.
+
+        Returns:
+            tuple: (material_info, cacheable). material_info is the material row as a
+                   column-to-value mapping, or None if not found. cacheable is False
+                   when the lookup itself failed and the result must not be cached.
         """
-        Modifies the material template XML by setting material ID, description, and attribute values.
-        Uses deep copies to ensure original template files are never modified.
+        body = {
+            "Approved": False,
+            "DLL": "POMS_BaseObject_Lib",
+            "Domain": "",
+            "Folder": "",
+            "IncludeLatest": False,
+            "IncludeLatestApproved": False,
+            "Latest": True,
+            "Level": self.level_id,
+            "Location": self.location_id,
+            "ObjectID": material_id,
+            "SearchSubType": "",
+            "SubType": "MM_OBJ",
+            "TreeIdentifier": "",
+            "Type": "",
+            "ignoreObsolete": False,
+            "userID": self.username
+            }
+
+        try:
+            response = self.session.post(self.inner_materials_api, json=body)
+            response.raise_for_status()
+            rows = response.json()['d']['Rows']
+            if rows == []:
+                logger.debug(f"No data found for material '{material_id}'.")
+                return None, True
+            material_info = {col["Column"]: col["Value"] for col in rows[0]}
+            if 'OBJ_ID' not in material_info.keys():
+                return None, True
+            return material_info, True
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            logger.error(f"Failed to look up material '{material_id}': {e}")
+            return None, False
+
+    def existing_materials(self, material_ids: list[str], refresh: bool = False) -> dict:
+        """
+        Checks which materials already exist at this level and location.
+        Cached rows are used first; the rest are looked up concurrently, bounded by max_workers.
+
+        Args:
+            material_ids (list[str]): Material IDs to check.
+            refresh (bool): If True, ignores cached rows and asks the server.
+
+        Returns:
+            dict: Material ID to its latest material row, or to None if it does not exist.
+                  Materials whose lookup failed are left out.
+        """
+        material_ids = list(dict.fromkeys(material_ids))
+        found = {} if refresh or not self.cache else self.cache.get_many(material_ids, self.level_id, self.location_id)
+        missing = [material_id for material_id in material_ids if material_id not in found]
+        if not missing:
+            return found
+
+        if not self._perform_login():
+            logger.error("Login failed. Cannot check for existing materials.")
+            return found
+
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+            for material_id, (material_info, cacheable) in zip(missing, executor.map(self._fetch_material, missing)):
+                if cacheable:
+                    fetched[material_id] = material_info
+
+        if self.cache:
+            self.cache.put_many(fetched, self.level_id, self.location_id)
+        found.update(fetched)
+        return found
+
+    def plan(self, materials: list[dict]) -> dict:
+        """
+        Decides which materials need importing.
+
+        A material that does not exist is created. One that exists is versioned when its
+        attributes differ from what POMSicle last imported, or when the server version
+        moved on since then. It is only skipped when both match; existing materials that
+        POMSicle has no import record of (including every material when the cache is
+        disabled) are versioned, since there is nothing to compare them against.
+
+        Args:
+            materials (list[dict]): Materials with 'material_id', 'description' and 'attributes'.
+
+        Returns:
+            dict: Material ID to (action, message), where action is 'create', 'version' or 'skip'.
+        """
+        material_ids = [m["material_id"] for m in materials]
+        existing = self.existing_materials(material_ids)
+        imports = self.cache.get_imports(material_ids, self.level_id, self.location_id) if self.cache else {}
+
+        decisions = {}
+        for material in materials:
+            material_id = material["material_id"]
+            if material_id not in existing:
+                decisions[material_id] = ("create", "Existence check failed; importing anyway.")
+                continue
+            row = existing[material_id]
+            if row is None:
+                decisions[material_id] = ("create", None)
+                continue
+
+            record = imports.get(material_id)
+            fingerprint = material_fingerprint(material.get("description"), material.get("attributes"))
+            if record is None:
+                decisions[material_id] = ("version", "Already exists with no POMSicle import record.")
+            elif record[0] != fingerprint:
+                decisions[material_id] = ("version", "Attributes changed since the last import.")
+            elif record[1] != row.get('OBJ_VER'):
+                decisions[material_id] = ("version", f"Server version changed since the last import ({record[1]} -> {row.get('OBJ_VER')}).")
+            else:
+                decisions[material_id] = ("skip", "Already exists and matches.")
+        return decisions
+
+    def _record_imports(self, materials: list[dict]) -> None:
+        """
+        Refreshes the cached rows of just-imported materials and records their fingerprints.
+
+        This costs one server lookup for the new OBJ_VERs, so it only runs for skip_existing
+        imports. Materials imported without it have no record, and the next skip_existing
+        run versions them once before it can skip them.
+        """
+        if not self.cache or not materials:
+            return
+        rows = self.existing_materials([m["material_id"] for m in materials], refresh=True)
+        self.cache.put_imports({
+            m["material_id"]: (material_fingerprint(m.get("description"), m.get("attributes")),
+                               (rows.get(m["material_id"]) or {}).get('OBJ_VER'))
+            for m in materials
+        }, self.level_id, self.location_id)
+
+    def _build_xml(self, material_id: str, material_description: Optional[str | None], attributes: Optional[dict]) -> bytes:
+        """
+        Builds the material XML by setting material ID, description, and attribute values on a
+        clone of the indexed template. The template file itself is never modified.
 
         Args:
             material_id (str): ID for the material.
             material_description (str): Description for the material. If None, uses material_id.
             attributes (dict): Dictionary mapping attribId to sValue. e.g., {"Inventory Tracking": "Container", "Inventory UOM": "g"}
-            
+
         Returns:
-            str: Path to the modified XML file.
+            bytes: The serialized material XML.
         """
-        # Parse template file - this is read-only and will never be modified
-        template_path = os.path.join(os.path.dirname(__file__), 'template', 'material_template.xml')
-        
-        if not os.path.exists(template_path):
-            logger.error(f"Material template not found at: {template_path}")
-            raise FileNotFoundError(f"Material template not found at: {template_path}")
-        
-        template = ET.parse(template_path)
-        template_root = template.getroot()
-        e_spec_xml_objs = template_root.find('eSpecXmlObjs')
-        
-        if e_spec_xml_objs is None:
-            raise RuntimeError("Template does not contain <eSpecXmlObjs> element")
-        
-        # Find the eBaseObject (should be only one in material template)
-        base_object = e_spec_xml_objs.find(".//eBaseObject[@objType='MM_OBJ']")
-        
-        if base_object is None:
-            raise RuntimeError("Template does not contain <eBaseObject objType='MM_OBJ'> element")
-        
+        index = _load_template()
+        template_root = copy.deepcopy(index.root)
+        base_object = follow(template_root, index.base_path)
+
         # Set material ID and description
         base_object.set('id', material_id)
         base_object.set('description', material_description or material_id + " Pomsicle")
@@ -248,7 +505,7 @@ class PomsicleMaterialManager:
         base_object.set('lastChangedBy', self.username)
         base_object.set('checkedOutBy', self.username)
         base_object.set('version', '1.001')
-        
+
         # Set dates
         now = datetime.now()
         formatted_date = now.strftime('%d/%m/%Y %H:%M:%S.%f')
@@ -256,41 +513,152 @@ class PomsicleMaterialManager:
         base_object.set('lastChangedDate', formatted_date)
         base_object.set('lastStatusChangedDate', formatted_date)
         base_object.set('effectivityDate', formatted_date)
-        
-        if attributes:
-            for attrib_id, s_value in attributes.items():
-                if not type(attributes).__name__ == "dict": # We pass SectionProxy by CLI and dict by webmethod
-                    item = list(ast.literal_eval(s_value).items())
-                    if item:
-                        attrib_id, s_value = item[0]
-                attr = base_object.find(f".//eObjectAttribute[@attribId='{attrib_id}']")
-                if attr is not None:
-                    for elem_id in ['Value', 'UOM', 'Status Value']:
-                        elem = attr.find(f".//eObjectAttributeElement[@elemId='{elem_id}']")
-                        if elem is not None:
-                            pop_method_attr = elem.get('popMethodAttr', '')
-                            if pop_method_attr:
-                                choices = [choice.strip() for choice in pop_method_attr.split(';')]
-                                if choices and s_value not in choices:
-                                    matched = next((c for c in choices if c.lower() == s_value.lower()), None)
-                                    if matched:
-                                        s_value = matched
-                                    else:
-                                        logger.debug(f"Value '{s_value}' not found in choices for '{attrib_id}'. Available: {choices}. Using provided value anyway.")
-                            
-                            elem.set('sValue', s_value)
-                            logger.debug(f"Set {attrib_id} -> {s_value}")
-                            break
-                    else:
-                        logger.warning(f"Could not find element to set sValue for attribute '{attrib_id}'")
+
+        # We pass SectionProxy by CLI and dict by webmethod
+        if attributes and not isinstance(attributes, dict):
+            attributes = material_defaults(attributes)
+
+        for attrib_id, s_value in (attributes or {}).items():
+            slot = index.attributes.get(attrib_id) or index.attributes.get(index.attrib_ids.get(str(attrib_id).lower()))
+            if slot is None:
+                logger.warning(f"Attribute '{attrib_id}' not found in template")
+                continue
+            if slot.elem_path is None:
+                logger.warning(f"Could not find element to set sValue for attribute '{attrib_id}'")
+                continue
+
+            s_value = str(s_value)
+            if slot.choices and s_value not in slot.choices:
+                matched = slot.folded.get(s_value.lower())
+                if matched:
+                    s_value = matched
                 else:
-                    logger.warning(f"Attribute '{attrib_id}' not found in template")
-        
-        temp_xml_path = os.path.join(os.path.dirname(__file__), 'Material_temp.xml')
-        template.write(temp_xml_path, encoding='utf-8', xml_declaration=False)
-        logger.debug(f"Modified template saved to: {temp_xml_path}")
-        
-        return temp_xml_path
+                    logger.debug(f"Value '{s_value}' not found in choices for '{attrib_id}'. Available: {sorted(slot.choices)}. Using provided value anyway.")
+
+            follow(base_object, slot.elem_path).set('sValue', s_value)
+            logger.debug(f"Set {attrib_id} -> {s_value}")
+
+        buffer = io.BytesIO()
+        ET.ElementTree(template_root).write(buffer, encoding='utf-8', xml_declaration=False)
+        return buffer.getvalue()
+
+    def attribute_ids(self) -> list[str]:
+        """
+        Returns the eObjectAttribute attribIds defined by the material template.
+        """
+        return list(_load_template().attributes)
+
+    def _write_pulled_file(self, xml_content: bytes, material_id: str, output_path: str | None = None) -> str | bool:
+        """
+        Writes material XML to the caller's path, or to a unique temp file if none is given.
+
+        Returns:
+            str | bool: Path of the written file, or False on failure.
+        """
+        try:
+            if output_path:
+                os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+                with open(output_path, 'wb') as f:
+                    f.write(xml_content)
+            else:
+                fd, output_path = tempfile.mkstemp(prefix=f"{material_id}_MATERIAL_", suffix=".xml")
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(xml_content)
+        except OSError as e:
+            logger.error(f"Failed to write material XML file: {e}")
+            return False
+
+        logger.debug(f"Material XML file written: {output_path}")
+        return output_path
+
+    def create_many(self, materials: list[dict], max_workers: int = 4, batch_size: int = 100,
+                    pull_dir: str | None = None, skip_existing: bool = False,
+                    validate_only: bool = False) -> list[dict]:
+        """
+        Builds every material XML in this process and imports them over a single login.
+
+        Args:
+            materials (list[dict]): Materials to create, each with 'material_id', 'description'
+                                    and 'attributes' (attribId to sValue).
+            max_workers (int): Maximum concurrent uploads.
+            batch_size (int): Maximum files per ImportFiles call.
+            pull_dir (str, optional): Write each XML to this directory instead of uploading/importing.
+            skip_existing (bool): If True, materials that already exist are only imported when
+                                  plan() decides they need a new version, and imports are
+                                  recorded for the next run (see _record_imports).
+            validate_only (bool): If True, every material is uploaded and validated by the
+                                  server but nothing is imported; skip_existing is ignored.
+
+        Returns:
+            list[dict]: One result per material, in input order, with keys 'material_id',
+                        'status' ('created', 'versioned', 'skipped', 'written', 'valid',
+                        'invalid' or 'failed'), 'success', 'message' and 'errors'.
+        """
+        results = [{"material_id": m["material_id"], "status": "failed", "success": False, "message": None, "errors": []}
+                   for m in materials]
+
+        decisions = self.plan(materials) if skip_existing and not pull_dir and not validate_only else {}
+        files, built = [], []
+
+        for index, material in enumerate(materials):
+            action, reason = decisions.get(material["material_id"], ("create", None))
+            if action == "skip":
+                results[index].update(status="skipped", success=True, message=reason)
+                continue
+            try:
+                xml_content = self._build_xml(material["material_id"], material.get("description"), material.get("attributes") or {})
+            except Exception as e:
+                logger.error(f"Failed to build XML for material '{material['material_id']}': {e}")
+                results[index]["message"] = f"Build failed: {e}"
+                results[index]["errors"] = [{"message": results[index]["message"], "line": None, "column": None, "code": None}]
+                continue
+            files.append((f"{material['material_id']}.xml", xml_content))
+            built.append(index)
+            results[index]["message"] = reason
+
+        if pull_dir:
+            os.makedirs(pull_dir, exist_ok=True)
+            for index, (file_name, xml_content) in zip(built, files):
+                path = os.path.join(pull_dir, file_name)
+                with open(path, 'wb') as f:
+                    f.write(xml_content)
+                results[index].update(status="written", success=True, message=f"Written to {path}")
+            return results
+
+        skipped = sum(1 for result in results if result["status"] == "skipped")
+        if skipped:
+            logger.info(f"Skipping {skipped} materials that already exist.")
+        if not files:
+            return results
+
+        from api.spec_import import SpecImporter
+
+        importer = SpecImporter(self, max_workers=max_workers, batch_size=batch_size)
+        if validate_only:
+            for index, outcome in zip(built, importer.validate_many(files, "MM_OBJ", self.level_id, self.location_id)):
+                results[index].update(
+                    status="valid" if outcome["success"] else ("invalid" if outcome["uploaded"] else "failed"),
+                    success=outcome["success"],
+                    message=outcome["message"],
+                    errors=outcome["errors"]
+                )
+            return results
+
+        imported = []
+        for index, outcome in zip(built, importer.import_many(files, "MM_OBJ", self.level_id, self.location_id)):
+            action = decisions.get(materials[index]["material_id"], ("create", None))[0]
+            results[index].update(
+                status=("versioned" if action == "version" else "created") if outcome["success"] else "failed",
+                success=outcome["success"],
+                message=outcome["message"] or results[index]["message"],
+                errors=outcome["errors"]
+            )
+            if outcome["success"]:
+                imported.append(materials[index])
+
+        if skip_existing:
+            self._record_imports(imported)
+        return results
 
     def create_template(
         self,
@@ -298,10 +666,13 @@ class PomsicleMaterialManager:
         material_description: Optional[str | None],
         attributes: Optional[dict] = None,
         template_name: str = "material_template.xml",
-        pull: bool = False
+        pull: bool = False,
+        output_path: str | None = None,
+        skip_existing: bool = False
     ) -> str | bool:
         """
-        Creates a material XML file, optionally uploads and imports it.
+        Creates a material XML in memory, then either writes it to disk or uploads and imports it.
+        Nothing is written to disk unless pull is set, so concurrent calls never share a file.
 
         Args:
             material_id (str): ID for the material.
@@ -309,139 +680,87 @@ class PomsicleMaterialManager:
             attributes (dict): Dictionary mapping attribId to sValue.
             template_name (str): Name of the template XML file (default: "material_template.xml").
             pull (bool): If True, only creates the XML file and returns the path. If False, uploads and imports.
+            output_path (str, optional): Where to write the XML when pulling. Defaults to a
+                             unique file in the system temp directory.
+            skip_existing (bool): If True and the material already exists, it is only imported
+                             when plan() decides it needs a new version; the import is then
+                             recorded for the next run (see _record_imports).
 
         Returns:
-            str | bool: If pull=True, returns the path to the created XML file. If pull=False, returns True on success.
+            str | bool: If pull=True, returns the path to the created XML file. If pull=False, returns True on success,
+                        or SKIPPED if skip_existing found the material unchanged.
         """
         try:
-            xml_file_path = self._modify_template_xml(
+            xml_content = self._build_xml(
                 material_id=material_id,
                 material_description=material_description,
                 attributes=attributes or {}
             )
-            
+
             if pull:
-                return xml_file_path
-            
+                return self._write_pulled_file(xml_content, material_id, output_path)
+
             if not self._perform_login():
                 logger.error("Login failed. Cannot proceed with upload and import.")
                 return False
 
-            uploaded_file_uid, temp_server_filename = self._upload_file(xml_file_path)
+            material = {"material_id": material_id, "description": material_description, "attributes": attributes or {}}
+            if skip_existing:
+                action, reason = self.plan([material])[material_id]
+                if action == "skip":
+                    logger.info(f"Material '{material_id}' skipped: {reason}")
+                    return SKIPPED
+                if reason:
+                    logger.info(f"Material '{material_id}': {reason}")
+
+            # Unique per call so parallel uploads of the same material never collide
+            xml_file_name = f"{material_id}_{uuid.uuid4().hex[:8]}.xml"
+            uploaded_file_uid, temp_server_filename = self._upload_file(xml_content, xml_file_name)
             if not uploaded_file_uid:
                 logger.error("File upload failed.")
                 return False
 
-            if not self._import_file(uploaded_file_uid, temp_server_filename):
+            if not self._import_file(uploaded_file_uid, temp_server_filename, len(xml_content)):
                 logger.error("File import failed.")
                 return False
-            
+
+            if skip_existing:
+                self._record_imports([material])
             logger.debug(f"Material '{material_id}' created and imported successfully.")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error creating material: {e}", exc_info=True)
             return False
 
-    def _upload_file(self, xml_file_path: str) -> tuple[Optional[str], Optional[str]]:
+    def _upload_file(self, xml_content: bytes, xml_file_name: str) -> tuple[Optional[str], Optional[str]]:
         """
-        Uploads a single XML file to the server.
+        Uploads a single XML document from memory to the server, in chunks of UPLOAD_CHUNK_SIZE.
 
         Args:
-            xml_file_path (str): Path to the XML file.
+            xml_content (bytes): The serialized XML document.
             xml_file_name (str): Name of the XML file.
-            total_file_size (int): Size of the XML file in bytes.
 
         Returns:
             tuple: (uploaded_file_uid, temp_server_filename) or (None, None) on failure.
         """
-        logger.debug(f"Initiating single file upload for '{xml_file_path}' to {self.file_upload_url}...")
-
-        uploaded_file_uid = str(uuid.uuid4())
-        total_file_size = os.path.getsize(xml_file_path)
-        temp_server_filename = None
-
-        try:
-            with open(xml_file_path, 'rb') as f:
-                full_file_content = f.read()
-
-                metadata = {
-                    "chunkIndex": 0,
-                    "contentType": "text/xml",
-                    "fileName": os.path.basename(xml_file_path),
-                    "relativePath": os.path.basename(xml_file_path),
-                    "totalFileSize": total_file_size,
-                    "totalChunks": 1,
-                    "uploadUid": uploaded_file_uid
-                }
-
-                upload_files = {
-                    'files': ("blob", full_file_content, 'application/octet-stream'),
-                    'metadata': (None, json.dumps(metadata), 'application/json')
-                }
-
-                upload_headers = {
-                    'Accept': '*/*; q=0.5, application/json',
-                    'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
-                    'Connection': 'keep-alive',
-                    'Host': self.machine_name,
-                    'Origin': self.login_host,
-                    'Referer': f"{self.base_app_url}SpecificationManagement.aspx",
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
-                }
-
-                logger.debug(f"Uploading entire file as a single chunk (UID: {uploaded_file_uid})...")
-                upload_response = self.session.post(self.file_upload_url, files=upload_files, headers=upload_headers, verify=False)
-                upload_response.raise_for_status()
-
-                upload_result = upload_response.json()
-                logger.debug(f"Single upload response: {upload_result}")
-
-                if upload_result.get("uploaded", False):
-                    logger.debug("File uploaded successfully to server temp directory!")
-                    temp_server_filename = upload_result.get("TempFileName")
-                    uploaded_file_uid = upload_result.get("fileUid")
-                    if uploaded_file_uid is None:
-                        logger.warning("'fileUid' was not returned in the upload response. This might cause issues.")
-                else:
-                    logger.error(f"File failed to upload. Response: {upload_result}")
-                    return None, None
-
-            if not temp_server_filename:
-                logger.error("File upload completed but no TempFileName was received from the server.")
-                return None, None
+        logger.debug(f"Initiating upload for '{xml_file_name}' to {self.file_upload_url}...")
+        return ChunkedUploader.from_manager(self).upload(xml_content, xml_file_name)
 
-            logger.debug(f"Full file uploaded successfully. Server temporary path: {temp_server_filename}")
-            return uploaded_file_uid, temp_server_filename
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"File upload request failed: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response Status Code: {e.response.status_code}, Content: {e.response.text}")
-            return None, None
-        except Exception as e:
-            logger.error(f"An unexpected error occurred during file upload: {e}")
-            return None, None
-
-    def _import_file(self, uploaded_file_uid: str, xml_file_name: str) -> Optional[dict]:
+    def _import_file(self, uploaded_file_uid: str, xml_file_name: str, file_size: int) -> Optional[dict]:
         """
         Calls the server's ImportFiles endpoint to import the uploaded XML file.
 
         Args:
             uploaded_file_uid (str): The UID of the uploaded file.
             xml_file_name (str): The original name of the XML file.
-            obj_type (str): Object type extracted from XML.
-            level_id (str): Level ID extracted from XML.
-            location_id (str): Location ID extracted from XML.
-            file_size (int): Size of the XML file.
+            file_size (int): Size in bytes of the content that was uploaded.
 
         Returns:
             dict: The JSON response from the import API call, or None on failure.
         """
         logger.debug(f"Attempting to call ImportFiles with uploaded file UID: {uploaded_file_uid}...")
 
-        file_size = os.path.getsize(os.path.join(os.path.dirname(__file__), 'Material_temp.xml'))
-
         file_entry = {
             "FileName": xml_file_name,
             "Extension": os.path.splitext(xml_file_name)[1],
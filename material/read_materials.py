@@ -0,0 +1,158 @@
+import io
+import csv
+import logging
+from xlsx2csv import Xlsx2csv, XlsxException
+from config import config
+
+logger = logging.getLogger(__name__)
+
+settings = config('pomsicle')
+
+SHEET = settings.get("MATERIAL_SHEET", "MaterialTemplating")
+
+# Sheet columns that are not attribIds of the material template, keyed by normalized header.
+ID_COLUMNS = {"material", "material id", "materialid"}
+DESCRIPTION_COLUMNS = {"material description", "description"}
+COLUMN_ALIASES = {
+    "storage condition": "Storage Class",
+    "default status": "Default Quality",
+    "uom": "Inventory UOM",
+}
+
+REPORT_FIELDS = ["row", "material_id", "status", "message"]
+
+
+def normalize_column(column: str) -> str:
+    """Normalizes a sheet header for lookup: lowercase, single spaces, no trailing dots."""
+    return " ".join(str(column).replace("_", " ").split()).rstrip(".").lower()
+
+
+def _cell(value) -> str:
+    """Renders a sheet cell as text; blanks become '' and 1.0 becomes '1'."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def column_map(columns: list[str], attrib_ids: list[str]) -> dict:
+    """
+    Maps sheet headers to material fields.
+
+    Args:
+        columns (list[str]): Sheet headers.
+        attrib_ids (list[str]): eObjectAttribute attribIds of the material template.
+
+    Returns:
+        dict: Header to 'material_id', 'description' or an attribId. Headers that match
+              nothing are left out and logged once.
+    """
+    by_name = {normalize_column(attrib_id): attrib_id for attrib_id in attrib_ids}
+    mapping, unmapped = {}, []
+
+    for column in columns:
+        key = normalize_column(column)
+        if key in ID_COLUMNS:
+            mapping[column] = "material_id"
+        elif key in DESCRIPTION_COLUMNS:
+            mapping[column] = "description"
+        elif key in by_name:
+            mapping[column] = by_name[key]
+        elif COLUMN_ALIASES.get(key) in attrib_ids:
+            mapping[column] = COLUMN_ALIASES[key]
+        else:
+            unmapped.append(column)
+
+    if unmapped:
+        logger.warning(f"Ignoring columns with no matching material attribute: {', '.join(unmapped)}")
+    return mapping
+
+
+def _sheet_rows(filename: str) -> tuple[list[str], list[tuple[int, dict]]]:
+    """
+    Reads SHEET with xlsx2csv, keeping blank rows so every row has its Excel row number.
+
+    Returns:
+        tuple: (header, rows) where rows is a list of (row_number, {header: cell}) for the
+               rows below the first non-blank row, which is taken as the header.
+
+    Raises:
+        ValueError: If the workbook or sheet cannot be read.
+    """
+    buffer = io.StringIO()
+    try:
+        Xlsx2csv(filename, skip_empty_lines=False).convert(buffer, sheetname=SHEET)
+    except (OSError, XlsxException) as e:
+        raise ValueError(f"Could not read sheet '{SHEET}' of '{filename}': {e}")
+
+    header, rows = None, []
+    for row_number, values in enumerate(csv.reader(io.StringIO(buffer.getvalue())), start=1):
+        if header is None:
+            if any(value.strip() for value in values):
+                header = values
+            continue
+        rows.append((row_number, dict(zip(header, values))))
+    return header or [], rows
+
+
+def read_rows(filename: str, attrib_ids: list[str], defaults: dict | None = None) -> tuple[list[dict], list[dict]]:
+    """
+    Reads the material sheet into materials ready for PomsicleMaterialManager.create_many.
+
+    Blank attribute cells fall back to defaults. Rows without a material ID and repeated
+    material IDs are rejected. Every material and report entry carries its Excel row number.
+
+    Args:
+        filename (str): Path to the Excel workbook.
+        attrib_ids (list[str]): eObjectAttribute attribIds of the material template.
+        defaults (dict, optional): attribId to sValue used for blank cells.
+
+    Returns:
+        tuple: (materials, rejected). Each material has 'row', 'material_id', 'description'
+               and 'attributes'; each rejected row is a report entry.
+
+    Raises:
+        ValueError: If the workbook or sheet cannot be read, or has no material ID column.
+    """
+    columns, rows = _sheet_rows(filename)
+    mapping = column_map(columns, attrib_ids)
+    if "material_id" not in mapping.values():
+        raise ValueError(f"Sheet '{SHEET}' has no material ID column. Expected one of: {sorted(ID_COLUMNS)}")
+
+    materials, rejected, seen = [], [], set()
+    # Row numbers are the workbook's own, blank rows included
+    for row_number, row in rows:
+        if not any(_cell(value) for value in row.values()):
+            continue
+
+        material = {"row": row_number, "material_id": "", "description": None, "attributes": dict(defaults or {})}
+        for column, field in mapping.items():
+            text = _cell(row.get(column))
+            if not text:
+                continue
+            if field in ("material_id", "description"):
+                material[field] = text
+            else:
+                material["attributes"][field] = text
+
+        material_id = material["material_id"]
+        if not material_id:
+            rejected.append({"row": row_number, "material_id": "", "status": "invalid", "message": "Missing material ID."})
+        elif material_id in seen:
+            rejected.append({"row": row_number, "material_id": material_id, "status": "invalid",
+                             "message": "Duplicate material ID in sheet."})
+        else:
+            seen.add(material_id)
+            materials.append(material)
+
+    return materials, rejected
+
+
+def write_report(path: str, entries: list[dict]) -> None:
+    """Writes the per-row outcome report as CSV, ordered by sheet row."""
+    with open(path, "w", newline="", encoding="UTF-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        for entry in sorted(entries, key=lambda e: e["row"]):
+            writer.writerow({field: entry.get(field, "") for field in REPORT_FIELDS})
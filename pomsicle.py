@@ -5,16 +5,13 @@ import os
 import sys
 import argparse
 import logging
+from functools import lru_cache
 
-from banners import Banner
-from bom.bom_template import PomsicleBOMManager
-from inventory.read_inventory import read_file as read_inventory
-from credentials import login
 from config import config
-from receive.receiving import ReceiveManager
-from recipe.builder import RecipeBuilder
-from template.recipe_template import PomsicleTemplateManager
-from material.material_template import PomsicleMaterialManager
+
+# Subcommand modules (Playwright, polars, bs4, lxml, requests) are imported
+# inside the handlers that need them, so `--help` and argument errors never
+# pay for them.
 
 # -----------------------------------------------------------------------------
 # Logging
@@ -38,35 +35,74 @@ config_file_name = 'config.cfg'
 # -----------------------------------------------------------------------------
 # Load Config
 # -----------------------------------------------------------------------------
-try:
-    settings = config(translator='pomsicle')
-    receive_settings = config(translator='pomsicle:receive')
-    material_settings = config(translator='pomsicle:material')
-    location_settings = config(translator='pomsicle:location')
-except (FileNotFoundError, ValueError) as e:
-    logger.critical(f"Configuration error: {e}. Exiting.")
-    exit(1)
-
-# Set default material settings if not found
-if not material_settings:
-    material_settings = {
-        'LEVEL_ID': '10',
-        'LOCATION_ID': '4',
-        'LOCATION_NAME': 'Herndon'
+@lru_cache(maxsize=None)
+def load_settings() -> dict:
+    """
+    Loads the config sections used by the subcommands on first use.
+
+    Returns:
+        dict: 'settings', 'receive', 'material' and 'location' sections plus
+              the configured 'username' and 'password'.
+    """
+    try:
+        settings = config(translator='pomsicle')
+        receive_settings = config(translator='pomsicle:receive')
+        material_settings = config(translator='pomsicle:material')
+        location_settings = config(translator='pomsicle:location')
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        logger.critical(f"Configuration error: {e}. Exiting.")
+        exit(1)
+
+    # Set default material settings if not found
+    if not material_settings:
+        material_settings = {
+            'LEVEL_ID': '10',
+            'LOCATION_ID': '4',
+            'LOCATION_NAME': 'Herndon'
+        }
+
+    username = settings.get('USERNAME', '')
+    password = settings.get('PASSWORD', '')
+
+    if not username or not password:
+        logger.critical("USERNAME or PASSWORD not configured. Exiting.")
+        exit(1)
+
+    return {
+        'settings': settings,
+        'receive': receive_settings,
+        'material': material_settings,
+        'location': location_settings,
+        'username': username,
+        'password': password,
     }
 
-USERNAME = settings.get('USERNAME', '')
-PASSWORD = settings.get('PASSWORD', '')
 
-if not USERNAME or not PASSWORD:
-    logger.critical("USERNAME or PASSWORD not configured. Exiting.")
-    exit(1)
+def get_token(token=None):
+    """
+    Returns an API token, logging in only when a handler actually needs one.
+
+    Args:
+        token: An already obtained token, returned unchanged if given.
+    """
+    if token is not None:
+        return token
+
+    from credentials import login
+
+    cfg = load_settings()
+    logger.info("Authenticating...")
+    token_obj = login(username=cfg['username'], password=cfg['password'])
+
+    if not token_obj or not hasattr(token_obj, "access_token"):
+        logger.critical("Login failed. Exiting.")
+        exit(1)
+    return token_obj
 
 # -----------------------------------------------------------------------------
 # Banner
 # -----------------------------------------------------------------------------
-ban = Banner()
-print(r"""
+BANNER = r"""
  ________    ________      _____ ______       ________       ___      ________      ___           _______      
 |\   __  \  |\   __  \    |\   _ \  _   \    |\   ____\     |\  \    |\   ____\    |\  \         |\  ___ \     
 \ \  \|\  \ \ \  \|\  \   \ \  \\\__\ \  \   \ \  \___|_    \ \  \   \ \  \___|    \ \  \        \ \   __/|    
@@ -75,7 +111,13 @@ print(r"""
    \ \__\      \ \_______\   \ \__\    \ \__\    ____\_\  \    \ \__\   \ \_______\   \ \_______\   \ \_______\
     \|__|       \|_______|    \|__|     \|__|   |\_________\    \|__|    \|_______|    \|_______|    \|_______|
                                                 \|_________|                                                   
-""")
+"""
+
+
+def banner():
+    """Returns a Banner instance, importing colorama only when first used."""
+    from banners import Banner
+    return Banner()
 
 # -----------------------------------------------------------------------------
 # Subcommand Handler Functions
@@ -93,8 +135,11 @@ def handle_template_create(args, token):
         up_name = f"{recipe_name}_UP"
         op_name = f"{recipe_name}_OP"
 
+    from template.recipe_template import PomsicleTemplateManager
+
+    cfg = load_settings()
     try:
-        manager = PomsicleTemplateManager(settings, USERNAME, PASSWORD)
+        manager = PomsicleTemplateManager(cfg['settings'], cfg['username'], cfg['password'])
         ok = manager.create_template(
             template_name=template_xml,
             recipe_name=recipe_name,
@@ -111,18 +156,24 @@ def handle_template_create(args, token):
         exit(1)
 
 # pomsicle inventory load
-def handle_inventory_load(args, token):
+def handle_inventory_load(args, token=None):
+    from inventory.read_inventory import read_file as read_inventory
+
+    token = get_token(token)
     logger.info(f"Loading inventory: {args.file}")
     read_inventory(token=token.access_token, filename=args.file)
 
 # pomsicle receiving start
-def handle_receiving_start(args, token):
+def handle_receiving_start(args, token=None):
     if not args.material or not args.uom:
         logger.error("Material and UOM required.")
         exit(1)
 
+    from receive.receiving import ReceiveManager
+
+    cfg = load_settings()
     try:
-        rm = ReceiveManager(settings, receive_settings, USERNAME, PASSWORD)
+        rm = ReceiveManager(cfg['settings'], cfg['receive'], cfg['username'], cfg['password'])
         ok = rm.receive(
             material_name=args.material,
             uom=args.uom,
@@ -131,7 +182,7 @@ def handle_receiving_start(args, token):
         )
 
         if ok:
-            ban.success(f"Material '{args.material}' received successfully.")
+            banner().success(f"Material '{args.material}' received successfully.")
         else:
             logger.error(f"Failed receiving '{args.material}'.")
     except Exception as e:
@@ -161,8 +212,11 @@ def handle_recipe_create_template(args, token=None):
     if operation_name:
         logger.debug(f"Operation Name: {operation_name}")
     
+    from template.recipe_template import PomsicleTemplateManager
+
+    cfg = load_settings()
     try:
-        template_manager = PomsicleTemplateManager(settings, USERNAME, PASSWORD)
+        template_manager = PomsicleTemplateManager(cfg['settings'], cfg['username'], cfg['password'])
         success = template_manager.create_template(
             template_name=template_xml_filename,
             recipe_name=recipe_name,
@@ -173,7 +227,7 @@ def handle_recipe_create_template(args, token=None):
             logger.debug(f"'{template_xml_filename}' operation completed successfully.")
         else:
             logger.error(f"'{template_xml_filename}' operation failed.")
-            Banner.error(f"'{template_xml_filename}' operation failed.")
+            banner().error(f"'{template_xml_filename}' operation failed.")
     except ValueError as e:
         logger.critical(f"Failed to initialize Template Manager: {e}")
         exit(1)
@@ -181,16 +235,73 @@ def handle_recipe_create_template(args, token=None):
         logger.critical(f"An unexpected error occurred during template creation: {e}")
         exit(1)
 
+# pomsicle recipe batch
+def handle_recipe_batch(args, token=None):
+    from api.spec_import import format_error
+    from template.recipe_batch import load_manifest, run_batch
+    from template.recipe_template import PomsicleTemplateManager
+
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        logger.critical(f"Failed to read manifest: {e}")
+        exit(1)
+
+    recipes = manifest["recipes"]
+    workers = args.workers or manifest["workers"] or 4
+    logger.info(f"Creating {len(recipes)} recipes from {args.manifest} with {workers} workers.")
+
+    cfg = load_settings()
+    try:
+        manager = PomsicleTemplateManager(cfg['settings'], cfg['username'], cfg['password'])
+    except ValueError as e:
+        logger.critical(f"Failed to initialize Template Manager: {e}")
+        exit(1)
+
+    template_dir = os.path.join(manager.program_path, 'template')
+    results = run_batch(manager, recipes, template_dir, max_workers=workers, batch_size=args.batch_size,
+                        validate_only=args.validate_only)
+
+    print("-" * 72)
+    print(f"{'Recipe':<30} {'Status':<8} {'Build (ms)':>12} {'Upload (ms)':>12}")
+    print("-" * 72)
+    for result in results:
+        build_ms = f"{result['build_ms']:.1f}" if result['build_ms'] is not None else "-"
+        upload_ms = f"{result['upload_ms']:.1f}" if result['upload_ms'] is not None else "-"
+        print(f"{result['name']:<30} {'ok' if result['success'] else 'FAILED':<8} {build_ms:>12} {upload_ms:>12}")
+    print("-" * 72)
+
+    failed = [result for result in results if not result["success"]]
+    for result in failed:
+        for error in result["errors"]:
+            logger.error(f"✗ {result['name']}: {format_error(error)}")
+    if failed:
+        banner().error(f"{len(failed)}/{len(results)} recipes {'are invalid' if args.validate_only else 'failed'}.")
+        exit(1)
+    banner().success(f"{'Validated' if args.validate_only else 'Created'} {len(results)} recipes.")
+
+
 def handle_bom_start(args, token=None):
     logger.info(f"Starting BOM process for: {args.template_name}")
 
+    from bom.bom_template import PomsicleBOMManager
+
+    cfg = load_settings()
     try:
-        template_manager = PomsicleBOMManager(settings, location_settings, args.add, USERNAME, PASSWORD)
+        template_manager = PomsicleBOMManager(cfg['settings'], cfg['location'], args.add, cfg['username'], cfg['password'],
+                                              max_workers=args.workers)
+        if args.refresh and template_manager.cache:
+            template_manager.cache.invalidate(args.add, template_manager.level_id, template_manager.location_id)
         success = template_manager.create_template(
             template_name=args.template_name,
-            bom_name=args.bom_name
+            bom_name=args.bom_name,
+            pull=bool(args.pull),
+            output_path=args.pull,
+            diff=args.diff
         )
         if success:
+            if args.pull:
+                logger.info(f"BOM XML file created: {success}")
             logger.debug(f"BOM '{args.bom_name}' operation completed successfully.")
         else:
             logger.error(f"BOM '{args.bom_name}' operation failed.")
@@ -199,6 +310,31 @@ def handle_bom_start(args, token=None):
         exit(1)
 
 
+# pomsicle bom load
+def handle_bom_load(args, token=None):
+    from bom.translator.read_bom import read_file as read_bom
+
+    if not args.pull:
+        token = get_token(token)
+    logger.info(f"Loading BOMs: {args.file}")
+    try:
+        results = read_bom(
+            token=token.access_token if token else None,
+            filename=args.file,
+            bom_name=args.bom_name,
+            pull=args.pull
+        )
+    except ValueError as e:
+        logger.critical(f"Failed to read BOMs: {e}")
+        exit(1)
+
+    failed = [bom_id for bom_id, ok in results.items() if not ok]
+    logger.info(f"Processed {len(results)} BOMs, {len(failed)} failed.")
+    if failed:
+        logger.error(f"Failed BOMs: {', '.join(failed)}")
+        exit(1)
+
+
 def handle_material_create(args, token=None):
     """
     Handle material creation command.
@@ -207,6 +343,10 @@ def handle_material_create(args, token=None):
         args: Command line arguments containing material_id, description, and attributes.
         token: Authentication token (not used but kept for consistency).
     """
+    from material.material_template import PomsicleMaterialManager, SKIPPED
+
+    cfg = load_settings()
+    material_settings = cfg['material']
     logger.info(f"Creating material: {args.material_id}")
     
     attributes = material_settings
@@ -221,11 +361,11 @@ def handle_material_create(args, token=None):
     
     try:
         material_manager = PomsicleMaterialManager(
-            settings,
+            cfg['settings'],
             material_settings,
-            location_settings,
-            USERNAME,
-            PASSWORD
+            cfg['location'],
+            cfg['username'],
+            cfg['password']
         )
         
         success = material_manager.create_template(
@@ -233,14 +373,18 @@ def handle_material_create(args, token=None):
             material_description=args.description,
             attributes=attributes,
             template_name=args.template_name,
-            pull=args.pull
+            pull=args.pull is not None,
+            output_path=args.pull or None,
+            skip_existing=args.skip_existing
         )
         
         if success:
-            if args.pull:
+            if args.pull is not None:
                 logger.info(f"Material XML file created: {success}")
+            elif success == SKIPPED:
+                banner().info(f"Material '{args.material_id}' skipped: already exists unchanged.")
             else:
-                ban.success(f"Material '{args.material_id}' created successfully.")
+                banner().success(f"Material '{args.material_id}' created successfully.")
         else:
             logger.error(f"Failed to create material '{args.material_id}'.")
             exit(1)
@@ -253,7 +397,68 @@ def handle_material_create(args, token=None):
         exit(1)
 
 
+# pomsicle material bulk
+def handle_material_bulk(args, token=None):
+    from api.spec_import import format_error
+    from material.material_template import PomsicleMaterialManager, material_defaults
+    from material.read_materials import read_rows, write_report
+
+    cfg = load_settings()
+    try:
+        material_manager = PomsicleMaterialManager(
+            cfg['settings'],
+            cfg['material'],
+            cfg['location'],
+            cfg['username'],
+            cfg['password']
+        )
+        materials, report = read_rows(args.file, material_manager.attribute_ids(), material_defaults(cfg['material']))
+    except ValueError as e:
+        logger.critical(f"Failed to read materials: {e}")
+        exit(1)
+
+    logger.info(f"Creating {len(materials)} materials from: {args.file}")
+    results = material_manager.create_many(
+        materials,
+        max_workers=args.workers,
+        batch_size=args.batch_size,
+        pull_dir=args.pull,
+        skip_existing=args.skip_existing,
+        validate_only=args.validate_only
+    )
+
+    for material, result in zip(materials, results):
+        message = result["message"] or ""
+        if result["status"] == "invalid":
+            message = "; ".join(format_error(error) for error in result["errors"])
+        report.append({
+            "row": material["row"],
+            "material_id": material["material_id"],
+            "status": result["status"],
+            "message": message
+        })
+
+    report_path = args.report or f"{os.path.splitext(args.file)[0]}_report.csv"
+    write_report(report_path, report)
+    logger.info(f"Outcome report written to: {report_path}")
+
+    failed = [entry for entry in report if entry["status"] in ("failed", "invalid")]
+    if failed:
+        banner().error(f"{len(failed)}/{len(report)} materials {'are invalid' if args.validate_only else 'failed'}. See {report_path}.")
+        exit(1)
+    banner().success(f"{'Validated' if args.validate_only else 'Processed'} {len(report)} materials.")
+
+
 def handle_recipe_create_custom(args, token=None):
+    from recipe.builder import RecipeBuilder
+    from recipe.registry import INDEX
+
+    try:
+        args.add = INDEX.validate(args.add)
+    except ValueError as e:
+        logger.error(f"{e} Exiting.")
+        exit(1)
+
     builder = RecipeBuilder()
     args.template_name = "Assisted.xml"
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -262,30 +467,116 @@ def handle_recipe_create_custom(args, token=None):
     args.unit_procedure = None 
     args.operation = None
 
-    logger.info(f"Creating CUSTOM RECIPE with phases: {args.add}")
-    builder.insert_components(args.add, output_file)
-    logger.info(f"Custom recipe created with: {' → '.join(args.add)}")
-
+    bom_xml = None
     if args.attach:
         if not args.materials:
             logger.error("Materials not provided for BOM attachment. Exiting.")
             exit(1)
-        bill_builder = PomsicleBOMManager(settings, location_settings, args.materials, USERNAME, PASSWORD)
-        bom_file = bill_builder.create_template(
-            bom_name=args.attach,
-            pull=True
-        )
+        from bom.bom_template import PomsicleBOMManager
+
+        cfg = load_settings()
+        bill_builder = PomsicleBOMManager(cfg['settings'], cfg['location'], args.materials, cfg['username'], cfg['password'])
+        bom_xml = bill_builder.build_xml(bom_name=args.attach)
 
-        logger.info("BOM FILE CREATED: %s", bom_file)
+        if not bom_xml:
+            logger.error("BOM creation failed. Exiting.")
+            exit(1)
 
-        builder.attach_bill(bom_path=bom_file, output_path=output_file)
+    logger.info(f"Creating CUSTOM RECIPE with phases: {args.add}")
+    # Components and BOM go into one tree, written once
+    tree = builder.build(args.add, bom=bom_xml)
+    tree.write(output_file, pretty_print=True, encoding="utf-8", xml_declaration=False)
+    logger.info(f"Custom recipe created with: {' → '.join(args.add)}")
+    if bom_xml:
         logger.info(f"Attached BOM to recipe: {args.recipe_name}")
 
     handle_recipe_create_template(args, token=None)
 
+# pomsicle recipe bundle
+def handle_recipe_bundle(args, token=None):
+    from recipe.bundle import build_bundle, bundle_path
+
+    output = args.output or bundle_path()
+    if os.path.abspath(output) != os.path.abspath(bundle_path()):
+        logger.warning(f"Builds read the bundle from {bundle_path()}. Set COMPONENT_BUNDLE_PATH to {output} to use this one.")
+    content_hash = build_bundle(output)
+    banner().success(f"Component bundle {content_hash[:12]} ready at {output}.")
+
+def handle_cache_clear(args, token=None):
+    from utils.material_cache import MaterialCache
+    from utils.recipe_cache import RecipeCache
+
+    cfg = load_settings()
+    if not args.recipes:
+        cache = MaterialCache.from_settings(cfg['settings'])
+        if cache is None:
+            logger.info("Material cache is disabled.")
+        else:
+            removed = cache.invalidate(args.materials or None)
+            logger.info(f"Removed {removed} cached material entries.")
+
+    # Built recipes are cleared with everything else, or on their own with --recipes
+    if args.recipes or not args.materials:
+        recipe_cache = RecipeCache.from_settings(cfg['settings'])
+        if recipe_cache is None:
+            logger.info("Recipe cache is disabled.")
+        else:
+            removed = recipe_cache.invalidate()
+            logger.info(f"Removed {removed} cached recipes.")
+
 def handle_recipe_import(args, token=None):
-    logger.info(f"Importing recipe from: {args.filename}")
-    print(f"Imported recipe from: {args.filename}")
+    from api.spec_import import SpecImporter, format_error
+
+    cfg = load_settings()
+    settings, location = cfg['settings'], cfg['location']
+
+    if args.type == "material":
+        from material.material_template import PomsicleMaterialManager
+        manager = PomsicleMaterialManager(settings, cfg['material'], location, cfg['username'], cfg['password'])
+        obj_kind = "MM_OBJ"
+    elif args.type == "bom":
+        from bom.bom_template import PomsicleBOMManager
+        manager = PomsicleBOMManager(settings, location, [], cfg['username'], cfg['password'])
+        obj_kind = "MM_BOM"
+    else:
+        from template.recipe_template import PomsicleTemplateManager
+        manager = PomsicleTemplateManager(settings, cfg['username'], cfg['password'])
+        obj_kind = "PM_RECIPE"
+
+    files = []
+    for filename in args.filename:
+        logger.info(f"{'Validating' if args.validate_only else 'Importing'} {args.type} from: {filename}")
+        # Streamed from disk in chunks by the uploader
+        files.append((os.path.basename(filename), filename))
+
+    importer = SpecImporter(manager, max_workers=args.workers, batch_size=args.batch_size)
+    results = importer.import_many(
+        files,
+        obj_kind,
+        location.get('LEVEL_ID', '10'),
+        location.get('LOCATION_ID', '4'),
+        validate_only=args.validate_only
+    )
+
+    failed = 0
+    for filename, result in zip(args.filename, results):
+        if result["success"]:
+            logger.info(f"✓ {filename}")
+        else:
+            failed += 1
+            for error in result["errors"]:
+                logger.error(f"✗ {filename}: {format_error(error)}")
+
+    if args.validate_only:
+        if failed:
+            banner().error(f"{failed}/{len(results)} files are invalid.")
+            exit(1)
+        banner().success(f"All {len(results)} files are valid.")
+        return
+    if failed:
+        banner().error(f"{failed}/{len(results)} files failed to import.")
+        exit(1)
+    banner().success(f"Imported {len(results)} files.")
 
 
 # -----------------------------------------------------
@@ -318,17 +609,34 @@ def create_cli():
         "--add",
         nargs="+",
         required=True,
-        help="List of objects to add into the custom recipe"
+        help="List of components to add into the custom recipe, by name or alias (e.g. record_text or RecordText)"
     )
     create_custom.add_argument("--attach", nargs="?", const="Bom_template.xml", default=None, help="Name of the Bill.")
     create_custom.add_argument("--materials", nargs="+", help="List of materials to add into the BOM")
     create_custom.set_defaults(func=handle_recipe_create_custom)
 
+    # ----- pomsicle recipe batch -----
+    create_batch = recipe_create_sub.add_parser("batch", help="Create many recipes from a YAML/JSON manifest")
+    create_batch.add_argument("manifest", help="Manifest listing the recipes to create.")
+    create_batch.add_argument("--workers", type=int, default=None, help="Maximum concurrent builds and uploads (default: manifest 'workers' or 4).")
+    create_batch.add_argument("--batch-size", type=int, default=100, help="Maximum recipes per ImportFiles call.")
+    create_batch.add_argument("--validate-only", action="store_true", help="Have the server validate the recipes without importing them.")
+    create_batch.set_defaults(func=handle_recipe_batch)
+
+    # ----- pomsicle recipe bundle -----
+    create_bundle = recipe_create_sub.add_parser("bundle", help="Precompile the component library for faster recipe builds")
+    create_bundle.add_argument("--output", metavar="PATH", default=None, help="Where to write the bundle (default: COMPONENT_BUNDLE_PATH, or cache/components.bundle).")
+    create_bundle.set_defaults(func=handle_recipe_bundle)
+
     # -------------------------------------------------------
     # pomsicle recipe import <filename>
     # -------------------------------------------------------
-    recipe_import = subparsers.add_parser("import", help="Import recipe from XML")
-    recipe_import.add_argument("filename", help="XML file to import")
+    recipe_import = subparsers.add_parser("import", help="Import recipes, BOMs or materials from XML")
+    recipe_import.add_argument("filename", nargs="+", help="XML files to import")
+    recipe_import.add_argument("--type", choices=["recipe", "bom", "material"], default="recipe", help="Kind of object in the files.")
+    recipe_import.add_argument("--workers", type=int, default=4, help="Maximum concurrent uploads.")
+    recipe_import.add_argument("--batch-size", type=int, default=100, help="Maximum files per ImportFiles call.")
+    recipe_import.add_argument("--validate-only", action="store_true", help="Have the server validate the files without importing them.")
     recipe_import.set_defaults(func=handle_recipe_import)
     # ================================
     # pomsicle inventory
@@ -368,8 +676,29 @@ def create_cli():
             required=True,
             help="List of materials to add into the BOM"
         )
+    start.add_argument("--workers", type=int, default=None, help="Maximum concurrent material lookups.")
+    start.add_argument("--refresh", action="store_true", help="Ignore cached material data for these materials.")
+    start.add_argument("--pull", metavar="PATH", default=None, help="Write the BOM XML to PATH instead of uploading/importing it.")
+    start.add_argument("--diff", action="store_true", help="Skip the import if the BOM is unchanged since the last import.")
     start.set_defaults(func=handle_bom_start)
 
+    load = b_sub.add_parser("load", help="Load BOMs from Excel, one per BOM ID")
+    load.add_argument("file", help="Excel file")
+    load.add_argument("--bom-name", default="POMSICLE_BOM", help="BOM ID for sheets without a BOM ID column.")
+    load.add_argument("--pull", metavar="DIR", default=None, help="Write each BOM transaction to DIR instead of sending it.")
+    load.set_defaults(func=handle_bom_load)
+
+    # ================================
+    # pomsicle cache
+    # ================================
+    cache = subparsers.add_parser("cache", help="Material and recipe cache operations")
+    c_sub = cache.add_subparsers(dest="action")
+
+    clear = c_sub.add_parser("clear", help="Invalidate cached material data and built recipes")
+    clear.add_argument("materials", nargs="*", help="Material IDs to invalidate (default: all materials and recipes)")
+    clear.add_argument("--recipes", action="store_true", help="Only clear the built-recipe cache.")
+    clear.set_defaults(func=handle_cache_clear)
+
     # ================================
     # pomsicle material
     # ================================
@@ -385,9 +714,23 @@ def create_cli():
         nargs="+",
         help="Material attributes in format 'attribId=value' (e.g., 'Inventory Tracking=Container,Inventory UOM=g')"
     )
-    create.add_argument("--pull", action="store_true", help="Only create XML file without uploading/importing")
+    create.add_argument("--pull", metavar="PATH", nargs="?", const="", default=None,
+                        help="Only create the XML file (at PATH, or a temp file) without uploading/importing")
+    create.add_argument("--skip-existing", action="store_true",
+                        help="Skip the import if the material already exists unchanged since POMSicle last imported it.")
     create.set_defaults(func=handle_material_create)
 
+    bulk = m_sub.add_parser("bulk", help="Create materials from Excel, one per row")
+    bulk.add_argument("file", help="Excel file")
+    bulk.add_argument("--workers", type=int, default=4, help="Maximum concurrent uploads.")
+    bulk.add_argument("--batch-size", type=int, default=100, help="Maximum files per ImportFiles call.")
+    bulk.add_argument("--report", metavar="PATH", default=None, help="Where to write the per-row CSV report (default: <file>_report.csv).")
+    bulk.add_argument("--pull", metavar="DIR", default=None, help="Write each material XML to DIR instead of uploading/importing it.")
+    bulk.add_argument("--skip-existing", action="store_true",
+                      help="Skip rows whose material already exists unchanged since POMSicle last imported it.")
+    bulk.add_argument("--validate-only", action="store_true", help="Have the server validate every row's XML without importing it.")
+    bulk.set_defaults(func=handle_material_bulk)
+
     return parser
 
 # -----------------------------------------------------------------------------
@@ -401,20 +744,19 @@ def author_info():
 # -----------------------------------------------------------------------------
 # Main
 # -----------------------------------------------------------------------------
-if __name__ == "__main__":
-    logger.info("Authenticating...")
-    token_obj = login(username=USERNAME, password=PASSWORD)
-
-    if not token_obj or not hasattr(token_obj, "access_token"):
-        logger.critical("Login failed. Exiting.")
-        exit(1)
-
+def main(argv=None):
     parser = create_cli()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if not hasattr(args, "func"):
         parser.print_help()
         exit(0)
 
-    args.func(args, token_obj)
+    print(BANNER)
+    # Handlers that talk to the POMS API log in through get_token() themselves.
+    args.func(args, None)
+
+
+if __name__ == "__main__":
+    main()
     # author_info()
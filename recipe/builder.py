@@ -4,94 +4,257 @@ from pathlib import Path
 import copy
 import os
 import uuid
+import re
 import json
 import html
+import hashlib
+from functools import lru_cache
 from .registry import COMPONENTS
+from .bundle import load_bundle
 
 logger = logging.getLogger(__name__)
 
+OPERATION_PATH = ".//eSpecXmlObjs/eProcObject[@objType='PM_OPERATION']"
+
+# Parsed components kept per process; a stale mtime only ages out of the LRU
+COMPONENT_CACHE_SIZE = 256
+
+# Stand-ins for Label.left and Label.top while a layout template is compiled
+LEFT_MARKER = "@@POMSICLE_LEFT@@"
+TOP_MARKER = "@@POMSICLE_TOP@@"
+_LAYOUT_SPLIT = re.compile(
+    "(" + "|".join(re.escape(html.escape(json.dumps(marker))) for marker in (LEFT_MARKER, TOP_MARKER)) + ")"
+)
+_LAYOUT_SLOTS = {html.escape(json.dumps(LEFT_MARKER)): LEFT_MARKER, html.escape(json.dumps(TOP_MARKER)): TOP_MARKER}
+
+
+@lru_cache(maxsize=COMPONENT_CACHE_SIZE)
+def _parse_component(name: str, path: str, mtime_ns: int) -> ET._Element:
+    """
+    Parses a component file once per (name, path, mtime).
+
+    The returned element is shared by every caller and must never be modified;
+    load_component() hands out copies.
+    """
+    logger.debug("Parsing component '%s' from %s", name, path)
+    root = ET.parse(path).getroot()
+    elem = root.find(".//eProcCompObject")
+    return root if elem is None else elem
+
+
+def load_component(name: str) -> ET._Element:
+    """
+    Returns a fresh copy of a registry component: the bundled copy while the bundle
+    entry is current, otherwise the file's copy from the mtime-keyed parse cache.
+
+    Raises:
+        KeyError: If name is not in the registry.
+    """
+    path = str(COMPONENTS[name]["path"])
+    bundle = load_bundle()
+    if bundle is not None and bundle.current(name):
+        return copy.deepcopy(bundle.element(name))
+    return copy.deepcopy(_parse_component(name, path, os.stat(path).st_mtime_ns))
+
+
+def component_config(name: str) -> dict | None:
+    """Returns a copy of the component's decoded objectConfig from the bundle, if any."""
+    bundle = load_bundle()
+    if bundle is None or bundle.configs.get(name) is None or not bundle.current(name):
+        return None
+    return copy.deepcopy(bundle.configs[name])
+
+
+@lru_cache(maxsize=COMPONENT_CACHE_SIZE)
+def _layout_template(name: str, path: str, mtime_ns: int) -> tuple | None:
+    """
+    Compiles a component's objectConfig into the escaped text RecipeBuilder writes, cut
+    into literal fragments around LEFT_MARKER and TOP_MARKER, once per (name, path, mtime).
+
+    Returns:
+        tuple: The fragments, or None if the objectConfig has no Label to lay out.
+    """
+    config = component_config(name)
+    if config is None:
+        raw = _parse_component(name, path, mtime_ns).get("objectConfig")
+        try:
+            config = json.loads(html.unescape(raw)) if raw else None
+        except ValueError:
+            return None
+    if not isinstance(config, dict) or not isinstance(config.get("Label"), dict):
+        return None
+
+    config["Label"]["left"] = LEFT_MARKER
+    config["Label"]["top"] = TOP_MARKER
+    text = html.escape(json.dumps(config, separators=(",", ":")))
+    return tuple(_LAYOUT_SLOTS.get(part, part) for part in _LAYOUT_SPLIT.split(text) if part)
+
+
+def component_layout(name: str) -> tuple | None:
+    """Returns the compiled objectConfig layout template of a registry component; see _layout_template."""
+    path = str(COMPONENTS[name]["path"])
+    return _layout_template(name, path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=COMPONENT_CACHE_SIZE)
+def _component_digest(path: str, mtime_ns: int) -> str:
+    """SHA-256 of a component file, computed once per (path, mtime)."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class BuildContext:
+    """
+    State of a single recipe build: its own copy of the template (None when streaming),
+    the PM_OPERATION it fills, the new PM_OPERATION guid, the layout cursor and every
+    GUID generated so far.
+    """
+
+    def __init__(self, tree: ET._ElementTree | None, operation: ET._Element | None,
+                 operation_guid: str, x_pos: int, y_pos: int, top: int):
+        self.tree = tree
+        self.operation = operation
+        self.operation_guid = operation_guid
+        self.x_pos = x_pos
+        self.y_pos = y_pos
+        self.top = top
+        self.guids = [operation_guid]
+
 
 class RecipeBuilder:
     """
     Handles creation of recipes by inserting XML components
     into a base template with proper GUIDs and layout positions.
+
+    The template is parsed once and never modified; every build gets its own
+    BuildContext, so one builder can serve any number of builds, concurrently.
     """
 
+    # Starting layout positions of every build
+    X_POS = 300
+    Y_POS = 100
+    TOP = 100
+    BREAK = 3
+
     def __init__(self, main_template: str = "../template/Bare.xml"):
         # Paths
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
         self.main_template_path = os.path.join(self.current_dir, main_template)
-        self.main_tree = ET.parse(self.main_template_path)
+        bundle = load_bundle()
+        template_name = os.path.basename(self.main_template_path)
+        label = f"template:{template_name}"
+        bundled = bundle.element(label) if bundle is not None and bundle.current(label) else None
+        if bundled is not None and os.path.samefile(
+                self.main_template_path, os.path.join(self.current_dir, "..", "template", template_name)):
+            self.main_tree = ET.ElementTree(bundled)
+        else:
+            self.main_tree = ET.parse(self.main_template_path)
         self.main_root = self.main_tree.getroot()
 
-        self.parent = self.main_root.find(".//eSpecXmlObjs/eProcObject[@objType='PM_OPERATION']")
+        self.parent = self.main_root.find(OPERATION_PATH)
         if self.parent is None:
             raise RuntimeError("Target <eProcObject objType='PM_OPERATION'> not found")
+        # Elements the streaming writer descends into
+        self._operation_path = {self.parent, *self.parent.iterancestors()}
 
-        # Assign new GUID for PM_OPERATION
-        self.new_guid = str(uuid.uuid4())
-        self.parent.set("guid", self.new_guid)
-        logger.debug("Assigned new guid to PM_OPERATION: %s", self.new_guid)
+        # Child-index path from the root to PM_SUP; builds only insert inside PM_OPERATION
+        sup = self.main_root.find(".//eSpecXmlObjs//eProcObject[@objType='PM_SUP']")
+        self._sup_path = None
+        if sup is not None:
+            self._sup_path = []
+            while sup is not self.main_root:
+                parent = sup.getparent()
+                self._sup_path.insert(0, parent.index(sup))
+                sup = parent
 
         # Load sequence template once
-        sequence_path = COMPONENTS["sequence"]["path"]
-        self.sequence_template = ET.parse(sequence_path).getroot()
+        self.sequence_template = load_component("sequence")
 
-        # Layout positions
-        self.X_POS = 300
-        self.Y_POS = 100
-        self.TOP = 100
-        self.BREAK = 3
+        # Identifies the template's content in recipe cache keys
+        self.template_digest = hashlib.sha256(ET.tostring(self.main_root)).hexdigest()
 
-    def attach_bill(self, bom_path: str, output_path: str | None = None):
+    def new_build(self, copy_template: bool = True) -> BuildContext:
+        """
+        Start a build with a new PM_OPERATION guid and a fresh layout cursor.
+
+        Args:
+            copy_template: Give the build its own copy of the template to insert into.
+                           Streaming builds write from the shared template instead.
+        """
+        operation_guid = str(uuid.uuid4())
+        tree = operation = None
+        if copy_template:
+            tree = ET.ElementTree(copy.deepcopy(self.main_root))
+            operation = tree.getroot().find(OPERATION_PATH)
+            operation.set("guid", operation_guid)
+        logger.debug("Assigned new guid to PM_OPERATION: %s", operation_guid)
+        return BuildContext(tree, operation, operation_guid, self.X_POS, self.Y_POS, self.TOP)
+
+    def _find_sup(self, root: ET._Element) -> ET._Element | None:
+        """
+        Locate PM_SUP through the child-index path it has in the template, which builds of
+        this template keep; other documents fall back to a search.
+        """
+        elem = root
+        try:
+            for index in self._sup_path:
+                elem = elem[index]
+        except (IndexError, TypeError):
+            elem = None
+        if elem is not None and elem.tag == "eProcObject" and elem.get("objType") == "PM_SUP":
+            return elem
+        return root.find(".//eSpecXmlObjs//eProcObject[@objType='PM_SUP']")
+
+    @staticmethod
+    def _bom_box(bom: ET._Element | bytes | str) -> ET._Element:
+        """Return the <eBoxObject objType='MM_BOM'> of a BOM given as an element or serialized XML."""
+        if isinstance(bom, (bytes, str)):
+            bom = ET.fromstring(bom.encode("utf-8") if isinstance(bom, str) else bom)
+        if bom.tag == "eBoxObject" and bom.get("objType") == "MM_BOM":
+            return bom
+
+        bom_spec_objs = bom if bom.tag == "eSpecXmlObjs" else bom.find(".//eSpecXmlObjs")
+        if bom_spec_objs is None:
+            raise RuntimeError("BOM does not contain <eSpecXmlObjs> element")
+        bom_box_object = bom_spec_objs.find(".//eBoxObject[@objType='MM_BOM']")
+        if bom_box_object is None:
+            raise RuntimeError("BOM does not contain <eBoxObject objType='MM_BOM'> element")
+        return bom_box_object
+
+    def attach_bom(self, recipe: ET._ElementTree | ET._Element, bom: ET._Element | bytes | str):
         """
-        Insert a Bill of Materials component into the recipe.
+        Insert a Bill of Materials into a recipe tree in memory.
         The BOM structure includes:
         1. An <eProcBox> reference inside the PM_SUP element
         2. The actual <eBoxObject> after the PM_SUP element closes
-        
+
         Args:
-            bom_path: Path to the BOM XML file to attach.
-            output_path: Full path to the recipe XML file to modify.
+            recipe: The recipe tree or root element, e.g. from build(). Modified in place.
+            bom: The BOM document or its <eBoxObject>, as an element or serialized XML.
+
+        Returns:
+            The recipe, as passed in.
         """
-        # Use the provided output_path (which should be the full path to Assisted.xml)
-        if output_path is None:
-            output_path = os.path.join(self.current_dir, "..", "template", "Assisted.xml")
-        
-        recipe_path = output_path
-        if not os.path.exists(recipe_path):
-            raise FileNotFoundError(f"Recipe file not found: {recipe_path}")
-        
-        recipe_tree = ET.parse(recipe_path)
-        recipe_root = recipe_tree.getroot()
+        recipe_root = recipe.getroot() if isinstance(recipe, ET._ElementTree) else recipe
         e_spec_xml_objs = recipe_root.find(".//eSpecXmlObjs")
-        
+
         if e_spec_xml_objs is None:
             raise RuntimeError("Target <eSpecXmlObjs> not found for attaching BOM")
-        
-        pm_sup = e_spec_xml_objs.find(".//eProcObject[@objType='PM_SUP']")
+
+        pm_sup = self._find_sup(recipe_root)
         if pm_sup is None:
             raise RuntimeError("PM_SUP element not found in recipe. Cannot attach BOM.")
-        
-        bom_tree = ET.parse(bom_path)
-        bom_root = bom_tree.getroot()
-        bom_spec_objs = bom_root.find(".//eSpecXmlObjs")
-        
-        if bom_spec_objs is None:
-            raise RuntimeError(f"BOM file '{bom_path}' does not contain <eSpecXmlObjs> element")
-        
-        bom_box_object = bom_spec_objs.find(".//eBoxObject[@objType='MM_BOM']")
-        if bom_box_object is None:
-            raise RuntimeError(f"BOM file '{bom_path}' does not contain <eBoxObject objType='MM_BOM'> element")
-        
+
+        bom_box_object = self._bom_box(bom)
+
         bom_id = bom_box_object.get('id')
         bom_version = bom_box_object.get('version', '1.001')
-        
+
         level_name = pm_sup.get('levelName', 'Master')
         level_id = pm_sup.get('levelId', '10')
         location_name = pm_sup.get('locationName', 'Herndon')
         location_id = pm_sup.get('locationId', '4')
-        
+
         existing_proc_box = pm_sup.find(".//eProcBox[@boxType='BOM']")
         if existing_proc_box is not None:
             logger.debug("eProcBox already exists in PM_SUP, updating it")
@@ -107,105 +270,120 @@ class RecipeBuilder:
             proc_box.set('boxType', 'BOM')
             proc_box.set('boxNo', '1')
             proc_box.set('boxVersion', bom_version)
-            
-            last_comp = None
-            for elem in reversed(list(pm_sup)):
-                if elem.tag == 'eProcCompObject':
-                    last_comp = elem
-                    break
-            
+
+            # Directly after the last component, without indexing the children
+            last_comp = next(pm_sup.iterchildren('eProcCompObject', reversed=True), None)
             if last_comp is not None:
-                parent_children = list(pm_sup)
-                insert_idx = parent_children.index(last_comp) + 1
-                pm_sup.insert(insert_idx, proc_box)
+                last_comp.addnext(proc_box)
             else:
                 pm_sup.append(proc_box)
-        
-        parent = pm_sup.getparent()
-        if parent is None:
-            parent = e_spec_xml_objs
-        
-        parent_children = list(parent)
-        try:
-            insert_index = parent_children.index(pm_sup) + 1
-        except ValueError:
-            insert_index = len(parent_children)
-        
-        existing_box = e_spec_xml_objs.find(f".//eBoxObject[@id='{bom_id}']")
-        if existing_box is not None:
+
+        for existing_box in e_spec_xml_objs.xpath(".//eBoxObject[@id=$id]", id=bom_id):
             logger.debug(f"eBoxObject with id '{bom_id}' already exists, replacing it")
             existing_box.getparent().remove(existing_box)
-        
-            parent_children = list(parent)
-            try:
-                insert_index = parent_children.index(pm_sup) + 1
-            except ValueError:
-                insert_index = len(parent_children)
-        
+
         bom_copy = copy.deepcopy(bom_box_object)
-        parent.insert(insert_index, bom_copy)
+        if pm_sup.getparent() is not None:
+            pm_sup.addnext(bom_copy)
+        else:
+            e_spec_xml_objs.append(bom_copy)
+
+        logger.info("Attached BOM '%s' to recipe", bom_id)
+        return recipe
+
+    def attach_bill(self, bom_path: str, output_path: str | None = None):
+        """
+        Insert a Bill of Materials component into a recipe file; see attach_bom.
+
+        Args:
+            bom_path: Path to the BOM XML file to attach.
+            output_path: Full path to the recipe XML file to modify.
+        """
+        # Use the provided output_path (which should be the full path to Assisted.xml)
+        if output_path is None:
+            output_path = os.path.join(self.current_dir, "..", "template", "Assisted.xml")
 
+        recipe_path = output_path
+        if not os.path.exists(recipe_path):
+            raise FileNotFoundError(f"Recipe file not found: {recipe_path}")
+
+        recipe_tree = ET.parse(recipe_path)
+        self.attach_bom(recipe_tree, ET.parse(bom_path).getroot())
         logger.info("Attached BOM to recipe: %s", recipe_path)
-        
+
         recipe_tree.write(recipe_path, pretty_print=True, encoding="utf-8", xml_declaration=False)
         logger.info("Updated recipe XML written to: %s", recipe_path)
 
-    def _update_object_config(self, elem: ET._Element) -> ET._Element:
-        """Update objectConfig JSON and coordinates for a component."""
+    def _update_object_config(self, elem: ET._Element, ctx: BuildContext, config: dict | None = None,
+                              layout: tuple | None = None) -> ET._Element:
+        """
+        Update objectConfig JSON and coordinates for a component.
+
+        With a layout template from component_layout() the new objectConfig is joined from
+        its fragments. Otherwise config, the already decoded objectConfig if known, is edited
+        and re-encoded.
+        """
         logger.info("Updating objectConfig for element id=%s", elem.get("instanceId"))
 
         # Set coordinates
-        elem.set("xPos", str(self.X_POS))
-        elem.set("yPos", str(self.Y_POS))
+        elem.set("xPos", str(ctx.x_pos))
+        elem.set("yPos", str(ctx.y_pos))
 
         raw = elem.get("objectConfig")
-        if raw:
+        if raw and layout is not None:
+            values = {LEFT_MARKER: str(ctx.x_pos - 18), TOP_MARKER: str(ctx.top)}
+            elem.set("objectConfig", "".join(values.get(part, part) for part in layout))
+        elif raw:
             try:
-                config = json.loads(html.unescape(raw))
-                config["Label"]["left"] = self.X_POS - 18
-                config["Label"]["top"] = self.TOP
+                if config is None:
+                    config = json.loads(html.unescape(raw))
+                config["Label"]["left"] = ctx.x_pos - 18
+                config["Label"]["top"] = ctx.top
                 escaped = html.escape(json.dumps(config, separators=(",", ":")))
                 elem.set("objectConfig", escaped)
             except Exception as e:
                 logger.error("Failed to update objectConfig: %s", e, exc_info=True)
 
-        self.X_POS += 180
-        self.TOP += 49
+        ctx.x_pos += 180
+        ctx.top += 49
         return elem
 
-    def _load_component_element(self, name: str) -> ET._Element | None:
-        """Load a component XML element and update objectConfig."""
+    def _load_component_element(self, name: str, ctx: BuildContext) -> ET._Element | None:
+        """Clone a component XML element from the component cache and update objectConfig."""
         try:
-            xml_path = COMPONENTS[name]["path"]
-            root = ET.parse(str(xml_path)).getroot()
-            elem = root.find(".//eProcCompObject") or root
-            return self._update_object_config(elem)
+            layout = component_layout(name)
+            config = component_config(name) if layout is None else None
+            return self._update_object_config(load_component(name), ctx, config, layout)
         except KeyError:
             logger.warning(f"Component '{name}' not found in registry. Skipping.")
             return None
 
-    def insert_components(self, component_names: list[str], out_path: str):
-        """Insert a list of components into the main recipe template."""
-        insert_index = 0
-        component_no = 2
-        break_counter = 0
-
-        # Insert first sequence
+    def _sequence(self, from_comp_no: int, to_comp_no: int) -> ET._Element:
+        """Copy the sequence template as a transition between two components."""
         seq_copy = copy.deepcopy(self.sequence_template)
-        seq_copy.set("fromCompNo", "0")
-        seq_copy.set("toCompNo", str(component_no))
-        self.parent.insert(insert_index, seq_copy)
+        seq_copy.set("fromCompNo", str(from_comp_no))
+        seq_copy.set("toCompNo", str(to_comp_no))
         seq_copy.tail = "\t\t\t\n"
+        return seq_copy
+
+    def _iter_elements(self, component_names: list[str], ctx: BuildContext):
+        """
+        Yield the sequences and components to place at the start of PM_OPERATION, in
+        document order, creating each one only when it is needed.
+        """
+        component_no = 2
+        break_counter = 0
 
         for name in component_names:
             if break_counter % self.BREAK == 0:
-                self.Y_POS += 120
-                self.X_POS = 300
+                ctx.y_pos += 120
+                ctx.x_pos = self.X_POS
 
             component_guid = str(uuid.uuid4())
-            comp_elem = copy.deepcopy(self._load_component_element(name))
+            comp_elem = self._load_component_element(name, ctx)
 
             if comp_elem is None: continue
+            ctx.guids.append(component_guid)
 
             if "compNo" in comp_elem.attrib:
                 comp_elem.set("compNo", str(component_no))
@@ -217,36 +395,113 @@ class RecipeBuilder:
 
             for data_line in comp_elem.findall(".//eProcCompDataLine"):
                 if "guid" in data_line.attrib and "parent_guid" in data_line.attrib:
-                    data_line.set("parent_guid", self.new_guid)
+                    data_line.set("parent_guid", ctx.operation_guid)
                     data_line.set("guid", component_guid)
 
-            # Insert transition sequence before the component
-            seq_copy = copy.deepcopy(self.sequence_template)
-            seq_copy.set("fromCompNo", str(component_no - 1))
-            seq_copy.set("toCompNo", str(component_no))
-            self.parent.insert(insert_index, seq_copy)
-            seq_copy.tail = "\t\t\t\n"
-            insert_index += 1
-
-            # Insert component
-            self.parent.insert(insert_index, comp_elem)
+            # Transition sequence before the component
+            yield self._sequence(component_no - 1, component_no)
             comp_elem.tail = "\t\t\t\n"
-            insert_index += 1
+            yield comp_elem
             component_no += 1
             break_counter += 1
 
-        # Insert final transition sequence
-        seq_copy = copy.deepcopy(self.sequence_template)
-        seq_copy.set("fromCompNo", str(component_no - 1))
-        seq_copy.set("toCompNo", "-1")
-        self.parent.insert(insert_index, seq_copy)
-        seq_copy.tail = "\t\t\t\n"
+        # Final transition sequence, followed by the entry sequence
+        yield self._sequence(component_no - 1, -1)
+        yield self._sequence(0, 2)
+
+    def cache_key(self, component_names: list[str], bom: bytes | None = None) -> str:
+        """
+        Content address of a build: the template, the ordered phases with the content of
+        their component files, and the attached BOM, if any.
+
+        Unknown phases are part of the key as names only, since the build skips them.
+        """
+        digest = hashlib.sha256(self.template_digest.encode("ascii"))
+        for name in component_names:
+            entry = COMPONENTS.get(name)
+            component = ""
+            if entry is not None and os.path.exists(entry["path"]):
+                path = str(entry["path"])
+                component = _component_digest(path, os.stat(path).st_mtime_ns)
+            digest.update(f"\0{name}\0{component}".encode("utf-8"))
+        digest.update(b"\0bom\0" + (hashlib.sha256(bom).digest() if bom is not None else b""))
+        return digest.hexdigest()
+
+    def build(self, component_names: list[str], ctx: BuildContext | None = None,
+              bom: ET._Element | bytes | str | None = None) -> ET._ElementTree:
+        """
+        Build a recipe with the given components and return its own tree.
+
+        Pass a context from new_build() to read the build's state afterwards, such as the
+        GUIDs it generated. A bom is attached with attach_bom().
+        """
+        ctx = ctx or self.new_build()
+        for insert_index, elem in enumerate(self._iter_elements(component_names, ctx)):
+            ctx.operation.insert(insert_index, elem)
+        if bom is not None:
+            self.attach_bom(ctx.tree, bom)
+        return ctx.tree
+
+    def build_bytes(self, component_names: list[str], pretty_print: bool = True,
+                    ctx: BuildContext | None = None, bom: ET._Element | bytes | str | None = None) -> bytes:
+        """Build a recipe with the given components, and optionally a BOM, and return it serialized."""
+        return ET.tostring(self.build(component_names, ctx, bom), pretty_print=pretty_print, encoding="utf-8",
+                           xml_declaration=False)
+
+    def insert_components(self, component_names: list[str], out_path: str):
+        """Insert a list of components into a copy of the main recipe template and write it."""
+        tree = self.build(component_names)
 
         # Write output
-        self.main_tree.write(out_path, pretty_print=True, encoding="utf-8", xml_declaration=False)
+        tree.write(out_path, pretty_print=True, encoding="utf-8", xml_declaration=False)
         logger.info("XML updated successfully → %s", out_path)
         return out_path
 
+    def _stream_element(self, xf, elem: ET._Element, ctx: BuildContext, generated, pretty_print: bool):
+        """Write elem, descending only into PM_OPERATION and its ancestors."""
+        if elem not in self._operation_path:
+            xf.write(elem, pretty_print=pretty_print)
+            return
+
+        attrib = dict(elem.attrib)
+        if elem is self.parent:
+            attrib["guid"] = ctx.operation_guid
+        with xf.element(elem.tag, attrib):
+            if elem.text:
+                xf.write(elem.text)
+            if elem is self.parent:
+                for new_elem in generated:
+                    xf.write(new_elem, pretty_print=pretty_print)
+            for child in elem:
+                self._stream_element(xf, child, ctx, generated, pretty_print)
+        if elem.tail:
+            xf.write(elem.tail)
+
+    def stream_components(self, component_names: list[str], out_path: str, pretty_print: bool = False):
+        """
+        Write the template with a list of components inserted, without adding them to the tree.
+
+        Uses lxml's incremental writer: each sequence and component is generated, written
+        and dropped in turn, so memory stays flat however many phases the recipe has.
+
+        Args:
+            component_names: Registry names of the components, in order.
+            out_path: Path or binary file object to write to.
+            pretty_print: Indent elements that have no whitespace of their own.
+        """
+        ctx = self.new_build(copy_template=False)
+        generated = self._iter_elements(component_names, ctx)
+        with ET.xmlfile(out_path, encoding="utf-8") as xf:
+            self._stream_element(xf, self.main_root, ctx, generated, pretty_print)
+        logger.info("XML streamed successfully → %s", out_path)
+        return out_path
+
+@lru_cache(maxsize=None)
+def shared_builder(main_template: str = "../template/Bare.xml") -> RecipeBuilder:
+    """Returns the process-wide RecipeBuilder for a template; it can be used from any thread."""
+    return RecipeBuilder(main_template)
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
     builder = RecipeBuilder()
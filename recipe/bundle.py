@@ -0,0 +1,222 @@
+import os
+import copy
+import html
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from pathlib import Path
+from lxml import etree as ET
+from config import config
+from .registry import COMPONENTS, BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the on-disk layout changes
+BUNDLE_FORMAT = 2
+
+PROJECT_DIR = BASE_DIR.parent
+DEFAULT_BUNDLE_PATH = PROJECT_DIR / "cache" / "components.bundle"
+
+# Recipe templates bundled with the components, keyed by file name under template/
+TEMPLATES = ("Bare.xml",)
+
+
+class ComponentBundle:
+    """
+    The component library loaded from a bundle.
+
+    Entries are kept as their serialized XML and parsed the first time they are asked
+    for, so loading the bundle never pays for components a process does not use. The
+    returned elements are shared and read-only; copy them before use. configs holds each
+    component's objectConfig already decoded.
+
+    Source files may change after the bundle is loaded; callers check current() before
+    using an entry and read the file directly when it is stale.
+    """
+    def __init__(self, content_hash: str, entries: dict, configs: dict, stamp: dict):
+        self.content_hash = content_hash
+        self.configs = configs
+        self._entries = entries
+        self._stamp = stamp
+        self._parsed = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._entries
+
+    def current(self, label: str) -> bool:
+        """True if the entry exists and its source file still has the mtime and size it was bundled from."""
+        if label not in self._entries or label not in self._stamp:
+            return False
+        source, mtime_ns, size = self._stamp[label]
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size)
+
+    def element(self, label: str) -> ET._Element | None:
+        """Returns the parsed element of a component, or of a template as 'template:<file>'."""
+        elem = self._parsed.get(label)
+        if elem is None and label in self._entries:
+            elem = ET.fromstring(self._entries[label])
+            with self._lock:
+                elem = self._parsed.setdefault(label, elem)
+        return elem
+
+
+def decode_object_config(raw: str | None) -> dict | None:
+    """Decodes an objectConfig attribute the way RecipeBuilder reads it."""
+    if not raw:
+        return None
+    try:
+        return json.loads(html.unescape(raw))
+    except ValueError:
+        return None
+
+
+def _sources() -> dict:
+    """Returns source label to file path for every bundled file that exists."""
+    sources = {}
+    for name, entry in COMPONENTS.items():
+        path = str(entry["path"])
+        if os.path.exists(path):
+            sources[name] = path
+        else:
+            logger.warning(f"Component '{name}' has no file at {path}. Leaving it out of the bundle.")
+    for template in TEMPLATES:
+        path = str(PROJECT_DIR / "template" / template)
+        if os.path.exists(path):
+            sources[f"template:{template}"] = path
+        else:
+            logger.warning(f"Template '{template}' has no file at {path}. Leaving it out of the bundle.")
+    return sources
+
+
+@lru_cache(maxsize=1)
+def bundle_path() -> Path:
+    """
+    Returns where builds read the bundle from: COMPONENT_BUNDLE_PATH, or DEFAULT_BUNDLE_PATH
+    if unset. The setting is read once per process.
+    """
+    configured = config('pomsicle').get('COMPONENT_BUNDLE_PATH', fallback='')
+    return Path(configured) if configured else DEFAULT_BUNDLE_PATH
+
+
+def _stamp(sources: dict) -> dict:
+    """Cheap freshness check: (mtime_ns, size) of every source file."""
+    stamp = {}
+    for label, path in sources.items():
+        stat = os.stat(path)
+        stamp[label] = (path, stat.st_mtime_ns, stat.st_size)
+    return stamp
+
+
+def build_bundle(out_path: str | os.PathLike | None = None) -> str:
+    """
+    Compiles the component library and base templates into a single bundle file.
+
+    Every source is parsed once and stored reduced to the element the builder uses, with
+    each component's objectConfig decoded next to it. The bundle is versioned by the SHA-256 of the source
+    files; an existing bundle with the same hash and file stamps is left as is.
+
+    Args:
+        out_path: Where to write the bundle. Defaults to bundle_path().
+
+    Returns:
+        str: The bundle's content hash.
+    """
+    out_path = out_path or bundle_path()
+    sources = _sources()
+    digest = hashlib.sha256()
+    entries, configs = {}, {}
+
+    for label, path in sorted(sources.items()):
+        with open(path, "rb") as f:
+            data = f.read()
+        digest.update(label.encode("utf-8") + b"\0" + data + b"\0")
+
+        root = ET.fromstring(data)
+        if not label.startswith("template:"):
+            elem = root.find(".//eProcCompObject")
+            root = root if elem is None else elem
+            configs[label] = decode_object_config(root.get("objectConfig"))
+            root = copy.deepcopy(root)
+            root.tail = None
+        entries[label] = ET.tostring(root, encoding="utf-8")
+
+    content_hash = digest.hexdigest()
+    stamp = _stamp(sources)
+    existing = _read(out_path)
+    if existing is not None and existing.get("hash") == content_hash and existing.get("stamp") == stamp:
+        logger.info(f"Component bundle is up to date ({content_hash[:12]}).")
+        return content_hash
+
+    payload = {
+        "format": BUNDLE_FORMAT,
+        "hash": content_hash,
+        "stamp": stamp,
+        "entries": entries,
+        "configs": configs,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, out_path)
+
+    _load_bundle.cache_clear()
+    logger.info(f"Wrote component bundle with {len(sources)} entries to {out_path} ({content_hash[:12]}).")
+    return content_hash
+
+
+def _read(path) -> dict | None:
+    """Reads a bundle payload, or None if it is missing, unreadable or of another format."""
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable component bundle at {path}: {e}")
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != BUNDLE_FORMAT:
+        return None
+    return payload
+
+
+@lru_cache(maxsize=1)
+def _load_bundle(path: str, mtime_ns: int) -> ComponentBundle | None:
+    """Reads a bundle once per (path, mtime) with a single file read."""
+    payload = _read(path)
+    if payload is None:
+        return None
+    logger.debug(f"Loaded component bundle {payload['hash'][:12]} with {len(payload['entries'])} entries.")
+    return ComponentBundle(payload["hash"], payload["entries"], payload["configs"], payload["stamp"])
+
+
+def load_bundle(path: str | os.PathLike | None = None) -> ComponentBundle | None:
+    """
+    Returns the bundle at path (default: bundle_path()), reloading it only when the
+    bundle file itself changed.
+
+    Entries whose source files changed since the bundle was built are not dropped here;
+    ComponentBundle.current() tells callers to read those files directly.
+
+    Returns:
+        ComponentBundle: The loaded library, or None if no usable bundle exists.
+    """
+    path = str(path or bundle_path())
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _load_bundle(path, mtime_ns)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(build_bundle())
@@ -1,238 +1,234 @@
+import os
+import re
+import json
+import logging
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 BASE_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = BASE_DIR.parent
+COMPONENTS_DIR = BASE_DIR / "components"
+METADATA_DIR = PROJECT_DIR / "agentic" / "data" / "components"
+DEFAULT_INDEX_PATH = PROJECT_DIR / "cache" / "components.index.json"
+
+# Bumped whenever the on-disk index layout changes
+INDEX_FORMAT = 1
+
+# Sub-folder of COMPONENTS_DIR whose files are registered as base_<name>
+BASE_COMPONENTS = "base_components"
+
+# Components that are not phases; they keep their own category and description
+STRUCTURAL = {
+    "sequence": ("base", "Transition lines connecting the phases."),
+}
+
+# Metadata files that describe the metadata layout rather than a component
+METADATA_SKIP = ("component_template.json",)
+
+
+def normalize(name: str) -> str:
+    """
+    Reduces a component name or metadata id to its lookup alias, so that 'record_text',
+    'RecordText' and 'RecordTextPhase' all become 'recordtext'.
+    """
+    alias = re.sub(r"[^a-z0-9]", "", str(name).lower())
+    if alias.endswith("phase") and len(alias) > len("phase"):
+        alias = alias[:-len("phase")]
+    return alias
+
+
+class ComponentIndex:
+    """
+    Precomputed lookup tables over the component library.
+
+    components maps each component name to its entry ('path', 'description', 'category',
+    'id'); aliases maps normalized aliases to names; categories maps each category to its
+    component names in sorted order. Every lookup is a dict access.
+    """
+    def __init__(self, components: dict, aliases: dict, categories: dict):
+        self.components = components
+        self.aliases = aliases
+        self.categories = categories
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    def resolve(self, name: str) -> str | None:
+        """Returns the component name for a name or alias, or None if it is unknown."""
+        if name in self.components:
+            return name
+        return self.aliases.get(normalize(name))
+
+    def get(self, name: str) -> dict | None:
+        """Returns the entry of a component by name or alias, or None if it is unknown."""
+        resolved = self.resolve(name)
+        return None if resolved is None else self.components[resolved]
+
+    def by_category(self, category: str) -> list[str]:
+        """Returns the names of the components in a category."""
+        return list(self.categories.get(category, ()))
+
+    def validate(self, names: list[str]) -> list[str]:
+        """
+        Resolves a phase list to component names.
+
+        Raises:
+            ValueError: Naming every entry that is not a known component, before anything is built.
+        """
+        resolved = [self.resolve(name) for name in names]
+        unknown = [name for name, match in zip(names, resolved) if match is None]
+        if unknown:
+            raise ValueError(f"Unknown components: {', '.join(map(str, unknown))}.")
+        return resolved
+
+
+def _scan() -> tuple[dict, dict]:
+    """
+    Lists the component XML and metadata JSON files.
+
+    Returns:
+        tuple: (name -> XML path, stem -> metadata path)
+    """
+    xml_files = {}
+    for path in sorted(COMPONENTS_DIR.glob("*.xml")):
+        xml_files[path.stem] = path
+    for path in sorted((COMPONENTS_DIR / BASE_COMPONENTS).glob("*.xml")):
+        xml_files[f"base_{path.stem}"] = path
+
+    metadata_files = {}
+    for path in sorted(METADATA_DIR.glob("**/*.json")):
+        if path.name in METADATA_SKIP:
+            continue
+        if path.stem in metadata_files:
+            logger.warning(f"Component metadata '{path.stem}' is defined more than once. Using {metadata_files[path.stem]}.")
+            continue
+        metadata_files[path.stem] = path
+    return xml_files, metadata_files
 
-COMPONENTS = {
-    "operator_instruction": {
-        "path": BASE_DIR / "components" / "operator_instruction.xml",
-        "description": "Gives choices and instructions to operators.",
-        "category": "root",
-    },
-    "record_text": {
-        "path": BASE_DIR / "components" / "record_text.xml",
-        "description": "Record text component for capturing operator inputs.",
-        "category": "root",
-    },
-    "record_time": {
-        "path": BASE_DIR / "components" / "record_time.xml",
-        "description": "Captures and records time set by operators.",
-        "category": "root",
-    },
-    "select_scale": {
-        "path": BASE_DIR / "components" / "select_scale.xml",
-        "description": "Allows operators to select a scale for measurements.",
-        "category": "root",
-    },
-    "record_process_time": {
-        "path": BASE_DIR / "components" / "record_process_time.xml",
-    },
-    "add_external_file": {
-        "path": BASE_DIR / "components" / "add_external_file.xml",
-        "description": "Phase that allows attaching an external file to the batch by specifying a link.",
-        "category": "root",
-    },
-    "add_material": {
-        "path": BASE_DIR / "components" / "add_material.xml",
-        "description": "Add material to the recipe.",
-        "category": "root",
-    },
-    # --- Matched agentic/recipe components ---
-    "calculation": {
-        "path": BASE_DIR / "components" / "calculation.xml",
-        "description": "Phase that defines calculation variables whose values can be used to pre-populate fields in other phases.",
-        "category": "root",
-    },
-    "spread_sheet": {
-        "path": BASE_DIR / "components" / "spread_sheet.xml",
-        "description": "Performs spreadsheet-based calculations using recipe variables and operator inputs, displays input and output sheets, and records results.",
-        "category": "root",
-    },
-    "verify_equipment_add_point": {
-        "path": BASE_DIR / "components" / "verify_equipment_add_point.xml",
-        "description": "Verified add point assignments for equipment, with QC pass/fail results.",
-        "category": "root",
-    },
-    "verify_material_in_equipment": {
-        "path": BASE_DIR / "components" / "verify_material_in_equipment.xml",
-        "description": "Verifies that the specified material is present in each equipment of a defined class and validates each material's quantity, expiry date, and reset date.",
-        "category": "root",
-    },
-    "check_in_material": {
-        "path": BASE_DIR / "components" / "check_in_material.xml",
-        "description": "Checks in material lots and records exceptions if needed.",
-        "category": "root",
-    },
-    "adjust_material_inventory": {
-        "path": BASE_DIR / "components" / "adjust_material_inventory.xml",
-        "description": "Allows operators to adjust material inventory quantities and record reasons.",
-        "category": "root",
-    },
-    "aliquot": {
-        "path": BASE_DIR / "components" / "aliquot.xml",
-        "description": "Splits material into aliquots and records relevant data.",
-        "category": "root",
-    },
-    "add_utility": {
-        "path": BASE_DIR / "components" / "add_utility.xml",
-        "description": "Adds utility material to equipment and records exceptions if needed.",
-        "category": "root",
-    },
-    "add_dispense_kit": {
-        "path": BASE_DIR / "components" / "add_dispense_kit.xml",
-        "description": "Allows containers that are kitted together to be automatically consumed when their kit ID is scanned.",
-        "category": "root",
-    },
-    "scan_and_verify": {
-        "path": BASE_DIR / "components" / "scan_and_verify.xml",
-        "description": "Enables the operator to scan or manually enter a set of values and verify them against a configured list of expected values.",
-        "category": "root",
-    },
-    "record_text": {
-        "path": BASE_DIR / "components" / "record_text.xml",
-        "description": "Records multi-line text, date/time, or entries from the operator.",
-        "category": "root",
-    },
-    "call_web_api": {
-        "path": BASE_DIR / "components" / "call_web_api.xml",
-        "description": "Call web API component.",
-        "category": "root",
-    },
-    "check_equipment_state": {
-        "path": BASE_DIR / "components" / "check_equipment_state.xml",
-        "description": "Check equipment state.",
-        "category": "root",
-    },
-    "check_in_equipment": {
-        "path": BASE_DIR / "components" / "check_in_equipment.xml",
-        "description": "Check in equipment.",
-        "category": "root",
-    },
-    "check_out_equipment": {
-        "path": BASE_DIR / "components" / "check_out_equipment.xml",
-        "description": "Check out equipment.",
-        "category": "root",
-    },
-    "create_exception": {
-        "path": BASE_DIR / "components" / "create_exception.xml",
-        "description": "Create exception during recipe execution.",
-        "category": "root",
-    },
-    "culture_data": {
-        "path": BASE_DIR / "components" / "culture_data.xml",
-        "description": "Culture data phase.",
-        "category": "root",
-    },
-    "equipment_contents": {
-        "path": BASE_DIR / "components" / "equipment_contents.xml",
-        "description": "Equipment contents check-in phase.",
-        "category": "root",
-    },
-    "flexible_add_material": {
-        "path": BASE_DIR / "components" / "flexible_add_material.xml",
-        "description": "Add materials to a production split.",
-        "category": "root",
-    },
-    "generate_xml": {
-        "path": BASE_DIR / "components" / "generate_xml.xml",
-        "description": "Generate XML file phase.",
-        "category": "root",
-    },
-    "manual_finish": {
-        "path": BASE_DIR / "components" / "manual_finish.xml",
-        "description": "Manual finish workflow component.",
-        "category": "root",
-    },
-    "matrix_material_addition": {
-        "path": BASE_DIR / "components" / "matrix_material_addition.xml",
-        "description": "Matrix material addition phase.",
-        "category": "root",
-    },
-    "move_material": {
-        "path": BASE_DIR / "components" / "move_material.xml",
-        "description": "Move material phase.",
-        "category": "root",
-    },
-    "operator_instruction": {
-        "path": BASE_DIR / "components" / "operator_instruction.xml",
-        "description": "Gives choices and instructions to operators.",
-        "category": "root",
-    },
-    "output": {
-        "path": BASE_DIR / "components" / "output.xml",
-        "description": "Output phase component.",
-        "category": "root",
-    },
-    "record_container_tare": {
-        "path": BASE_DIR / "components" / "record_container_tare.xml",
-        "description": "Record container tare phase.",
-        "category": "root",
-    },
-    "scan_and_verify": {
-        "path": BASE_DIR / "components" / "scan_and_verify.xml",
-        "description": "Scan and verify material phase.",
-        "category": "root",
-    },
-    "spread_sheet": {
-        "path": BASE_DIR / "components" / "spread_sheet.xml",
-        "description": "Spreadsheet phase component.",
-        "category": "root",
-    },
-    "verify_equipment_add_point": {
-        "path": BASE_DIR / "components" / "verify_equipment_add_point.xml",
-        "description": "Verify equipment add point phase.",
-        "category": "root",
-    },
-    "verify_opc": {
-        "path": BASE_DIR / "components" / "verify_opc.xml",
-        "description": "Verify OPC phase.",
-        "category": "root",
-    },
-    "write_opc": {
-        "path": BASE_DIR / "components" / "write_opc.xml",
-        "description": "Write OPC phase.",
-        "category": "root",
-    },
-    "verify_material_in_equipment": {
-        "path": BASE_DIR / "components" / "verify_material_in_equipment.xml",
-        "description": "Verify material in equipment phase.",
-        "category": "root",
-    },
-    "yield": {
-        "path": BASE_DIR / "components" / "yield.xml",
-        "description": "Yield phase component.",
-        "category": "root",
-    },
-    "yield_weigh": {
-        "path": BASE_DIR / "components" / "yield_weigh.xml",
-        "description": "Yield weigh phase component.",
-        "category": "root",
-    },
-    "send_email": {
-        "path": BASE_DIR / "components" / "send_email.xml",
-        "description": "Send email phase component.",
-        "category": "root",
-    },
-
-    "manual_finish": {
-        "path": BASE_DIR / "components" / "manual_finish.xml",
-        "description": "Manual finish workflow component.",
-        "category": "root",
-    },
-    # Base components
-    "base_operator_instruction": {
-        "path": BASE_DIR / "components" / "base_components" / "operator_instruction.xml",
-        "description": "Base operator instruction template.",
-        "category": "base",
-    },
-    "base_record_text": {
-        "path": BASE_DIR / "components" / "base_components" / "record_text.xml",
-        "description": "Base record text template.",
-        "category": "base",
-    },
-    # Sequence
-    "sequence": {
-        "path": BASE_DIR / "components" / "sequence.xml",
-        "description": "Transition lines connecting the phases.",
-        "category": "base",
+
+def _stamp() -> dict:
+    """
+    Cheap freshness check: mtime_ns of every scanned folder and file.
+
+    Folder mtimes change when files are added or removed; file mtimes when they are edited.
+    """
+    stamp = {}
+    for root in (COMPONENTS_DIR, METADATA_DIR):
+        if not root.is_dir():
+            continue
+        for folder, _, files in os.walk(root):
+            stamp[folder] = os.stat(folder).st_mtime_ns
+            for file_name in files:
+                if file_name.endswith((".xml", ".json")):
+                    path = os.path.join(folder, file_name)
+                    stamp[path] = os.stat(path).st_mtime_ns
+    return stamp
+
+
+def _read_metadata(path: Path) -> dict:
+    try:
+        with open(path, "r", encoding="UTF-8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable component metadata {path}: {e}")
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def build_index() -> dict:
+    """
+    Scans recipe/components and merges the agentic component metadata into an index.
+
+    A component exists only if its XML file does; metadata is matched by file stem.
+    Aliases come from the component name and the metadata id. An alias claimed by two
+    components is dropped from the lookup rather than resolved to either of them; names
+    always win over ids.
+
+    Returns:
+        dict: The serializable index, with paths relative to the project folder.
+    """
+    xml_files, metadata_files = _scan()
+    components, categories = {}, {}
+    name_aliases, id_aliases = {}, {}
+
+    for name, path in xml_files.items():
+        category, description = STRUCTURAL.get(name, (None, None))
+        metadata = _read_metadata(metadata_files[name]) if name in metadata_files else {}
+        if path.parent.name == BASE_COMPONENTS:
+            # Templates of phases that are registered on their own
+            category, metadata = "base", {}
+        components[name] = {
+            "path": path.relative_to(PROJECT_DIR).as_posix(),
+            "description": description or metadata.get("description"),
+            "category": category or metadata.get("category") or "uncategorized",
+            "id": metadata.get("id"),
+        }
+        categories.setdefault(components[name]["category"], []).append(name)
+
+        name_aliases.setdefault(normalize(name), set()).add(name)
+        if metadata.get("id"):
+            id_aliases.setdefault(normalize(metadata["id"]), set()).add(name)
+
+    aliases = {}
+    for source in (name_aliases, id_aliases):
+        for alias, names in source.items():
+            if alias in aliases:
+                continue
+            if len(names) > 1:
+                logger.debug(f"Alias '{alias}' matches {', '.join(sorted(names))}. Leaving it out.")
+                continue
+            aliases[alias] = next(iter(names))
+
+    unmatched = sorted(set(metadata_files) - set(xml_files))
+    if unmatched:
+        logger.debug(f"Component metadata without a component file: {', '.join(unmatched)}.")
+
+    return {
+        "components": components,
+        "aliases": aliases,
+        "categories": {category: sorted(names) for category, names in sorted(categories.items())},
+    }
+
+
+def load_index(path: str | os.PathLike = DEFAULT_INDEX_PATH) -> ComponentIndex:
+    """
+    Returns the component index, read from its cache file while every scanned folder
+    and file still has the mtime it was built from, otherwise rebuilt and rewritten.
+    """
+    stamp = _stamp()
+    payload = None
+    try:
+        with open(path, "r", encoding="UTF-8") as f:
+            payload = json.load(f)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable component index at {path}: {e}")
+
+    if not isinstance(payload, dict) or payload.get("format") != INDEX_FORMAT or payload.get("stamp") != stamp:
+        payload = {"format": INDEX_FORMAT, "stamp": stamp, **build_index()}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="UTF-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+            logger.debug(f"Wrote component index with {len(payload['components'])} components to {path}.")
+        except OSError as e:
+            logger.warning(f"Could not write component index to {path}: {e}")
+
+    components = {
+        name: {**entry, "path": PROJECT_DIR / entry["path"]}
+        for name, entry in payload["components"].items()
     }
-}
\ No newline at end of file
+    return ComponentIndex(components, payload["aliases"], payload["categories"])
+
+
+INDEX = load_index()
+
+# Name -> entry; kept as a plain dict for the builder and the bundle
+COMPONENTS = INDEX.components
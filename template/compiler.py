@@ -0,0 +1,223 @@
+import os
+import re
+import json
+import logging
+import threading
+import xml.etree.ElementTree as ET
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# objTypes whose ids are renamed by `pomsicle recipe template`
+NAME_TYPES = ("PM_RECIPE", "PM_SUP", "PM_OPERATION")
+
+# Stand-in for the name while a slot is compiled; never appears in the output
+SLOT_MARKER = "@@POMSICLE_SLOT@@"
+
+# Start tags of the objects that carry names. Attribute values are matched quote-aware
+# so a literal '>' inside a value does not end the tag early.
+_TAG_RE = re.compile(r"""<(eProcObject|eProcCompObject)\b(?:[^>"']|"[^"]*"|'[^']*')*>""")
+
+
+def _escape_attr(value: str) -> str:
+    """Escapes text for use inside an XML attribute value, as ElementTree does."""
+    return (value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            .replace('"', "&quot;").replace("'", "&apos;")
+            .replace("\n", "&#10;").replace("\r", "&#13;").replace("\t", "&#09;"))
+
+
+def _escape_json_attr(value: str) -> str:
+    """Escapes text for use as a JSON string body inside an XML attribute value."""
+    return _escape_attr(json.dumps(value)[1:-1])
+
+
+ESCAPES = {"xml": _escape_attr, "json": _escape_json_attr}
+
+
+class Slot(NamedTuple):
+    """
+    A named hole in a compiled template.
+
+    default is the original attribute value, used when no name is given for the slot.
+    parts is the replacement value, with None wherever the escaped name goes.
+    """
+    name: str
+    escape: str
+    default: bytes
+    parts: tuple
+
+    def render(self, value: str | None) -> bytes:
+        if value is None:
+            return self.default
+        encoded = ESCAPES[self.escape](value).encode("utf-8")
+        return b"".join(encoded if part is None else part for part in self.parts)
+
+
+class CompiledTemplate(NamedTuple):
+    """A recipe template pre-tokenized into literal byte segments and Slots."""
+    path: str
+    mtime: int
+    segments: tuple
+    metadata: tuple
+
+    def render(self, recipe_name: str = None, unit_procedure_name: str = None, operation_name: str = None) -> bytes:
+        """
+        Produces the renamed recipe XML by joining the segments.
+
+        Args:
+            recipe_name (str, optional): New name for PM_RECIPE.
+            unit_procedure_name (str, optional): New name for PM_SUP. Defaults to recipe_name.
+            operation_name (str, optional): New name for PM_OPERATION. Defaults to recipe_name.
+
+        Returns:
+            bytes: The recipe XML.
+        """
+        name_map = {
+            "PM_RECIPE": recipe_name,
+            "PM_SUP": unit_procedure_name or recipe_name,
+            "PM_OPERATION": operation_name or recipe_name
+        }
+        return b"".join(
+            segment if isinstance(segment, bytes) else segment.render(name_map[segment.name])
+            for segment in self.segments
+        )
+
+
+def _split(text: str) -> tuple:
+    """Splits compiled text on SLOT_MARKER into encoded literals with None markers between them."""
+    pieces = text.split(SLOT_MARKER)
+    parts = []
+    for index, piece in enumerate(pieces):
+        if index:
+            parts.append(None)
+        if piece:
+            parts.append(piece.encode("utf-8"))
+    return tuple(parts)
+
+
+def _attr_spans(tag: str) -> dict:
+    """Returns attribute name to (start, end) of its raw value within the start tag."""
+    return {
+        match.group(1): (match.start(3), match.end(3))
+        for match in re.finditer(r"""\s([\w:.-]+)\s*=\s*(["'])(.*?)\2""", tag, re.S)
+    }
+
+
+def _object_config_slot(name: str, raw: bytes, object_config_str: str) -> Slot | None:
+    """
+    Compiles objectConfig the way PomsicleTemplateManager._modify_template_xml rewrites it:
+    Label.text and displayText take the name, and the JSON is re-serialized.
+    """
+    try:
+        object_config = json.loads(object_config_str)
+    except json.JSONDecodeError:
+        logger.warning(f"Could not parse objectConfig JSON for {name}. Leaving it unchanged.")
+        return None
+
+    label = object_config.get('Label')
+    if isinstance(label, dict) and ('text' in label or 'styles' in label):
+        label['text'] = SLOT_MARKER
+    if 'displayText' in object_config:
+        object_config['displayText'] = SLOT_MARKER
+
+    return Slot(name, "json", raw, _split(_escape_attr(json.dumps(object_config))))
+
+
+def compile_template(path: str) -> CompiledTemplate:
+    """
+    Tokenizes a recipe template into literal byte segments and named slots.
+
+    Slots cover the ids and 'Template' descriptions of PM_RECIPE/PM_SUP/PM_OPERATION
+    eProcObjects, and the compObjId and objectConfig label text of the eProcCompObjects
+    that reference them. Everything else is kept byte for byte.
+
+    Args:
+        path (str): Path to the template XML.
+
+    Returns:
+        CompiledTemplate: The compiled template.
+
+    Raises:
+        OSError: If the template cannot be read.
+        ValueError: If the template has no eProcObject.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8")
+    return compile_source(text, path, mtime)
+
+
+def compile_source(text: str, path: str = "<memory>", mtime: int = 0) -> CompiledTemplate:
+    """
+    Tokenizes recipe template text that is already in memory; see compile_template.
+
+    Raises:
+        ValueError: If the template has no eProcObject.
+    """
+    edits = []
+    metadata = None
+    for match in _TAG_RE.finditer(text):
+        tag = match.group(0)
+        attrs = ET.fromstring(tag.rstrip(">").rstrip("/") + "/>").attrib
+        spans = _attr_spans(tag)
+
+        def raw(attr: str) -> bytes:
+            return tag[slice(*spans[attr])].encode("utf-8") if attr in spans else b""
+
+        def add(attr: str, slot: Slot | None):
+            if slot is not None and attr in spans:
+                start, end = spans[attr]
+                edits.append((match.start() + start, match.start() + end, slot))
+
+        if match.group(1) == "eProcObject":
+            obj_type = attrs.get("objType")
+            if metadata is None:
+                metadata = (obj_type, attrs.get("levelId"), attrs.get("locationId"))
+            if obj_type not in NAME_TYPES:
+                continue
+            add("id", Slot(obj_type, "xml", raw("id"), (None,)))
+            description = attrs.get("description", "")
+            if "Template" in description:
+                parts = _split(_escape_attr(description.replace("Template", SLOT_MARKER)))
+                add("description", Slot(obj_type, "xml", raw("description"), parts))
+        else:
+            comp_proc_type = attrs.get("compProcType")
+            if comp_proc_type not in NAME_TYPES:
+                continue
+            add("compObjId", Slot(comp_proc_type, "xml", raw("compObjId"), (None,)))
+            if attrs.get("objectConfig"):
+                add("objectConfig", _object_config_slot(comp_proc_type, raw("objectConfig"), attrs["objectConfig"]))
+
+    if metadata is None:
+        raise ValueError(f"Template '{path}' does not contain an eProcObject.")
+
+    segments, position = [], 0
+    for start, end, slot in sorted(edits, key=lambda edit: edit[0]):
+        segments.append(text[position:start].encode("utf-8"))
+        segments.append(slot)
+        position = end
+    segments.append(text[position:].encode("utf-8"))
+
+    logger.debug(f"Compiled template '{path}' into {len(segments)} segments ({len(edits)} slots).")
+    return CompiledTemplate(path, mtime, tuple(segment for segment in segments if segment != b""), metadata)
+
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def load_template(path: str) -> CompiledTemplate:
+    """
+    Returns the compiled template for path, recompiling only when the file's mtime changed.
+    """
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    with _compiled_lock:
+        cached = _compiled.get(path)
+    if cached is not None and cached.mtime == mtime:
+        return cached
+
+    compiled = compile_template(path)
+    with _compiled_lock:
+        _compiled[path] = compiled
+    return compiled
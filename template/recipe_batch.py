@@ -0,0 +1,168 @@
+import io
+import os
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from template.compiler import load_template, compile_source
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATE = "Template.xml"
+
+
+def load_manifest(path: str) -> dict:
+    """
+    Reads a batch manifest.
+
+    YAML manifests need PyYAML; JSON manifests (.json) work without it. The manifest is a
+    mapping with an optional 'workers' count and a 'recipes' list, for example:
+
+        workers: 4
+        recipes:
+          - name: HOCO_A
+            template: Template.xml
+          - name: HOCO_B
+            unit_procedure: HOCO_B_UP
+            operation: HOCO_B_OP
+            phases: [operator_instruction, record_text]
+
+    Returns:
+        dict: {'workers': int | None, 'recipes': list[dict]} with every recipe normalized to
+              'name', 'template', 'unit_procedure', 'operation' and 'phases'.
+
+    Raises:
+        ValueError: If the manifest cannot be read or an entry is invalid.
+    """
+    with open(path, "r", encoding="UTF-8") as f:
+        text = f.read()
+
+    if path.lower().endswith(".json"):
+        data = json.loads(text)
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Reading YAML manifests requires PyYAML (pip install pyyaml). Use a .json manifest instead.")
+        data = yaml.safe_load(text)
+
+    if isinstance(data, list):
+        data = {"recipes": data}
+    if not isinstance(data, dict) or not isinstance(data.get("recipes"), list):
+        raise ValueError(f"Manifest '{path}' must contain a 'recipes' list.")
+
+    recipes, seen = [], set()
+    for position, entry in enumerate(data["recipes"], start=1):
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        name = str(entry.get("name") or "").strip() if isinstance(entry, dict) else ""
+        if not name:
+            raise ValueError(f"Recipe #{position} in '{path}' has no name.")
+        if name in seen:
+            raise ValueError(f"Recipe '{name}' is listed more than once in '{path}'.")
+        seen.add(name)
+
+        phases = entry.get("phases") or []
+        if isinstance(phases, str):
+            phases = phases.split()
+        if phases:
+            from recipe.registry import INDEX
+
+            try:
+                phases = INDEX.validate(phases)
+            except ValueError as e:
+                raise ValueError(f"Recipe '{name}' in '{path}': {e}")
+        recipes.append({
+            "name": name,
+            "template": entry.get("template") or DEFAULT_TEMPLATE,
+            # Same defaults as `pomsicle recipe template`
+            "unit_procedure": entry.get("unit_procedure") or f"{name}_UP",
+            "operation": entry.get("operation") or f"{name}_OP",
+            "phases": list(phases),
+        })
+
+    workers = data.get("workers")
+    return {"workers": int(workers) if workers else None, "recipes": recipes}
+
+
+def build_recipe(recipe: dict, template_dir: str) -> tuple[bytes, tuple]:
+    """
+    Builds one recipe in memory.
+
+    Recipes with phases are assembled by RecipeBuilder on its base template first; the
+    others are rendered from the compiled template.
+
+    Returns:
+        tuple: (xml_content, (obj_type, level_id, location_id))
+    """
+    names = (recipe["name"], recipe["unit_procedure"], recipe["operation"])
+    if not recipe["phases"]:
+        compiled = load_template(os.path.join(template_dir, recipe["template"]))
+        return compiled.render(*names), compiled.metadata
+
+    from recipe.builder import shared_builder
+
+    buffer = io.BytesIO()
+    shared_builder().stream_components(recipe["phases"], buffer)
+    # One-off document: compile without caching
+    compiled = compile_source(buffer.getvalue().decode("utf-8"))
+    return compiled.render(*names), compiled.metadata
+
+
+def run_batch(manager, recipes: list[dict], template_dir: str, max_workers: int = 4,
+              batch_size: int = 100, validate_only: bool = False) -> list[dict]:
+    """
+    Builds recipes concurrently and imports (or only validates) them over the manager's session.
+
+    Args:
+        manager: A PomsicleTemplateManager; its session is shared by every upload.
+        recipes (list[dict]): Normalized entries from load_manifest.
+        template_dir (str): Folder holding the recipe templates.
+        max_workers (int): Maximum concurrent builds and uploads.
+        batch_size (int): Maximum recipes per ImportFiles call.
+        validate_only (bool): If True, the server only validates the recipes.
+
+    Returns:
+        list[dict]: One result per recipe, in input order, with keys 'name', 'success',
+                    'message', 'errors', 'build_ms' and 'upload_ms'.
+    """
+    from api.spec_import import SpecImporter
+
+    results = [{"name": r["name"], "success": False, "message": None, "errors": [], "build_ms": None,
+                "upload_ms": None} for r in recipes]
+
+    def timed_build(recipe):
+        start = time.perf_counter()
+        try:
+            built = build_recipe(recipe, template_dir)
+        except Exception as e:
+            logger.error(f"Failed to build recipe '{recipe['name']}': {e}")
+            built = e
+        return built, (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(recipes) or 1))) as executor:
+        builds = list(executor.map(timed_build, recipes))
+
+    # ImportFiles takes one level/location per call
+    groups = {}
+    for index, (built, build_ms) in enumerate(builds):
+        results[index]["build_ms"] = build_ms
+        if isinstance(built, Exception):
+            results[index]["message"] = f"Build failed: {built}"
+            results[index]["errors"] = [{"message": results[index]["message"], "line": None, "column": None, "code": None}]
+            continue
+        xml_content, (_, level_id, location_id) = built
+        groups.setdefault((level_id, location_id), []).append((index, xml_content))
+
+    importer = SpecImporter(manager, max_workers=max_workers, batch_size=batch_size)
+    for (level_id, location_id), members in groups.items():
+        files = [(f"{recipes[index]['name']}.xml", xml_content) for index, xml_content in members]
+        outcomes = importer.import_many(files, "PM_RECIPE", level_id, location_id, validate_only=validate_only)
+        for (index, _), outcome in zip(members, outcomes):
+            results[index].update(
+                success=outcome["success"],
+                message=outcome["message"],
+                errors=outcome["errors"],
+                upload_ms=outcome["upload_ms"]
+            )
+    return results
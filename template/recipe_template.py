@@ -2,13 +2,15 @@ import requests
 import json
 import xml.etree.ElementTree as ET
 import os
+import io
 import logging
 from datetime import datetime, timezone
 from urllib.parse import quote_plus, urljoin
 from bs4 import BeautifulSoup
 from banners import Banner
-import uuid
 from configparser import SectionProxy
+from template.compiler import load_template, compile_source
+from api.chunked_upload import ChunkedUploader
 
 logger = logging.getLogger(__name__)
 
@@ -133,212 +135,172 @@ class PomsicleTemplateManager:
             self._is_logged_in = False
             return False
 
-    def _process_xml_file(self, xml_file_path: str):
+    def _read_metadata(self, root: ET.Element) -> tuple[str, str, str]:
         """
-        Parses the XML file to extract objType, levelId, and locationId.
+        Reads objType, levelId, and locationId from the first eProcObject of a parsed recipe.
 
         Args:
-            xml_file_path (str): Path to the XML file.
+            root (ET.Element): Root of the recipe XML.
 
         Returns:
-            tuple: (obj_type, level_id, location_id, file_size) or (None, None, None, None) on error.
+            tuple: (obj_type, level_id, location_id)
         """
-        if not os.path.exists(xml_file_path):
-            logger.error(f"XML file not found at '{xml_file_path}'.")
-            return None, None, None, None
-
-        obj_type = ""
-        level_id = ""
-        location_id = ""
-        file_size = os.path.getsize(xml_file_path)
+        e_proc_object = root.find(".//eProcObject")
 
-        try:
-            tree = ET.parse(xml_file_path)
-            root = tree.getroot()
-            e_proc_object = root.find(".//eProcObject")
-
-            if e_proc_object is None:
-                logger.warning("Could not find 'eProcObject' element in the XML file. Using placeholder values.")
-                obj_type = "ConfiguredObject"
-                level_id = "10"
-                location_id = "4"
-            else:
-                obj_type = e_proc_object.get("objType")
-                level_id = e_proc_object.get("levelId")
-                location_id = e_proc_object.get("locationId")
-            logger.debug(f"XML parsed successfully. objType: {obj_type}, levelId: {level_id}, locationId: {location_id}")
-            return obj_type, level_id, location_id, file_size
+        if e_proc_object is None:
+            logger.warning("Could not find 'eProcObject' element in the XML file. Using placeholder values.")
+            return "ConfiguredObject", "10", "4"
 
-        except (FileNotFoundError, ET.ParseError, Exception) as e:
-            logger.error(f"Error during XML processing: {e}")
-            return None, None, None, None
+        obj_type = e_proc_object.get("objType")
+        level_id = e_proc_object.get("levelId")
+        location_id = e_proc_object.get("locationId")
+        logger.debug(f"XML parsed successfully. objType: {obj_type}, levelId: {level_id}, locationId: {location_id}")
+        return obj_type, level_id, location_id
 
-    def _modify_template_xml(self, xml_file_path: str, recipe_name: str = None, unit_procedure_name: str = None, operation_name: str = None) -> bool:
+    def _modify_template_xml(self, root: ET.Element, recipe_name: str = None, unit_procedure_name: str = None, operation_name: str = None) -> None:
         """
         Modifies the 'id' attributes of <eProcObject> and <eProcCompObject> tags
-        in the XML template based on provided names and objType.
+        in the parsed template based on provided names and objType.
         Also updates 'displayText' in objectConfig for eProcCompObject.
 
         Args:
-            xml_file_path (str): Path to the XML file to modify.
+            root (ET.Element): Root of the parsed template. Modified in place.
+            recipe_name (str, optional): New name for PM_RECIPE. Defaults to None.
+            unit_procedure_name (str, optional): New name for PM_SUP. Defaults to None.
+            operation_name (str, optional): New name for PM_OPERATION. Defaults to None.
+        """
+        # Mapping of objType to provided names
+        name_map = {
+            "PM_RECIPE": recipe_name,
+            "PM_SUP": unit_procedure_name or recipe_name,
+            "PM_OPERATION": operation_name or recipe_name
+        }
+
+        # Update eProcObject tags
+        for obj in root.findall(".//eProcObject"):
+            obj_type = obj.get("objType")
+            new_id = name_map.get(obj_type)
+            if new_id:
+                original_id = obj.get("id")
+                obj.set("id", new_id)
+                logger.debug(f"Updated eProcObject 'id' from '{original_id}' to '{new_id}' for objType='{obj_type}'.")
+                # Also update description if it contains "Template" and matches objType pattern
+                description = obj.get("description", "")
+                if "Template" in description:
+                     # Simple replacement if description contains "Template"
+                    obj.set("description", description.replace("Template", new_id))
+                    logger.debug(f"Updated eProcObject 'description' for '{new_id}'.")
+
+
+        # Update eProcCompObject tags (nested components)
+        # These also have 'compProcType' and 'compObjId' attributes, and 'displayText' in objectConfig
+        for comp_obj in root.findall(".//eProcCompObject"):
+            comp_proc_type = comp_obj.get("compProcType")
+            new_id = name_map.get(comp_proc_type)
+            if new_id:
+                original_comp_obj_id = comp_obj.get("compObjId")
+
+                comp_obj.set("compObjId", new_id)
+                logger.debug(f"Updated eProcCompObject 'compObjId' from '{original_comp_obj_id}' to '{new_id}' for compProcType='{comp_proc_type}'.")
+                
+                # Update 'displayText' within the 'objectConfig' JSON string if present
+                object_config_str = comp_obj.get("objectConfig")
+                if object_config_str:
+                    try:
+                        object_config = json.loads(object_config_str)
+                        # Update label.text for older versions or if the label element is directly the text
+                        if 'Label' in object_config and 'text' in object_config['Label']:
+                            object_config['Label']['text'] = new_id
+                        # For newer versions or if the Label element is more complex
+                        if 'Label' in object_config and 'styles' in object_config['Label'] and 'text' not in object_config['Label']:
+                            # Some templates might store text directly in objectConfig or not expose it.
+                            # This is a common place for the displayed text.
+                            object_config['Label']['text'] = new_id
+                        
+                        # If displayText is explicitly mapped, it might also be here
+                        # This part is highly dependent on exact XML structure and what POMSicle reads
+                        if 'displayText' in object_config:
+                            object_config['displayText'] = new_id
+
+                        comp_obj.set("objectConfig", json.dumps(object_config))
+                        logger.debug(f"Updated 'displayText' in objectConfig for '{new_id}'.")
+                    except json.JSONDecodeError:
+                        logger.warning(f"Could not parse objectConfig JSON for {comp_proc_type} with ID '{original_comp_obj_id}'. Skipping config update.")
+
+    def _build_xml(self, xml_file_path: str, recipe_name: str = None, unit_procedure_name: str = None,
+                   operation_name: str = None) -> tuple[bytes, str, str, str] | None:
+        """
+        Parses the template once, applies the name mapping and serializes it to memory.
+        The import metadata is read from the same tree.
+
+        Args:
+            xml_file_path (str): Path to the template XML file. It is never modified.
             recipe_name (str, optional): New name for PM_RECIPE. Defaults to None.
             unit_procedure_name (str, optional): New name for PM_SUP. Defaults to None.
             operation_name (str, optional): New name for PM_OPERATION. Defaults to None.
 
         Returns:
-            bool: True if modification was successful, False otherwise.
+            tuple: (xml_content, obj_type, level_id, location_id), or None on error.
         """
         try:
             tree = ET.parse(xml_file_path)
-            root = tree.getroot()
-
-            # Mapping of objType to provided names
-            name_map = {
-                "PM_RECIPE": recipe_name,
-                "PM_SUP": unit_procedure_name or recipe_name,
-                "PM_OPERATION": operation_name or recipe_name
-            }
-
-            # Update eProcObject tags
-            for obj in root.findall(".//eProcObject"):
-                obj_type = obj.get("objType")
-                new_id = name_map.get(obj_type)
-                if new_id:
-                    original_id = obj.get("id")
-                    obj.set("id", new_id)
-                    logger.debug(f"Updated eProcObject 'id' from '{original_id}' to '{new_id}' for objType='{obj_type}'.")
-                    # Also update description if it contains "Template" and matches objType pattern
-                    description = obj.get("description", "")
-                    if "Template" in description:
-                         # Simple replacement if description contains "Template"
-                        obj.set("description", description.replace("Template", new_id))
-                        logger.debug(f"Updated eProcObject 'description' for '{new_id}'.")
-
-
-            # Update eProcCompObject tags (nested components)
-            # These also have 'compProcType' and 'compObjId' attributes, and 'displayText' in objectConfig
-            for comp_obj in root.findall(".//eProcCompObject"):
-                comp_proc_type = comp_obj.get("compProcType")
-                new_id = name_map.get(comp_proc_type)
-                if new_id:
-                    original_comp_obj_id = comp_obj.get("compObjId")
-
-                    comp_obj.set("compObjId", new_id)
-                    logger.debug(f"Updated eProcCompObject 'compObjId' from '{original_comp_obj_id}' to '{new_id}' for compProcType='{comp_proc_type}'.")
-                    
-                    # Update 'displayText' within the 'objectConfig' JSON string if present
-                    object_config_str = comp_obj.get("objectConfig")
-                    if object_config_str:
-                        try:
-                            object_config = json.loads(object_config_str)
-                            # Update label.text for older versions or if the label element is directly the text
-                            if 'Label' in object_config and 'text' in object_config['Label']:
-                                object_config['Label']['text'] = new_id
-                            # For newer versions or if the Label element is more complex
-                            if 'Label' in object_config and 'styles' in object_config['Label'] and 'text' not in object_config['Label']:
-                                # Some templates might store text directly in objectConfig or not expose it.
-                                # This is a common place for the displayed text.
-                                object_config['Label']['text'] = new_id
-                            
-                            # If displayText is explicitly mapped, it might also be here
-                            # This part is highly dependent on exact XML structure and what POMSicle reads
-                            if 'displayText' in object_config:
-                                object_config['displayText'] = new_id
-
-                            comp_obj.set("objectConfig", json.dumps(object_config))
-                            logger.debug(f"Updated 'displayText' in objectConfig for '{new_id}'.")
-                        except json.JSONDecodeError:
-                            logger.warning(f"Could not parse objectConfig JSON for {comp_proc_type} with ID '{original_comp_obj_id}'. Skipping config update.")
-
-
-            tree.write(xml_file_path, encoding="UTF-8", xml_declaration=False)
-            logger.debug(f"XML file '{xml_file_path}' modified successfully with new names.")
-            return True
+        except FileNotFoundError:
+            logger.error(f"XML file not found at '{xml_file_path}'.")
+            return None
         except ET.ParseError as e:
             logger.error(f"Error parsing XML file '{xml_file_path}': {e}")
-            return False
+            return None
+
+        root = tree.getroot()
+        try:
+            if recipe_name or unit_procedure_name or operation_name:
+                logger.debug("Modifying XML template with provided names...")
+                self._modify_template_xml(root, recipe_name, unit_procedure_name, operation_name)
+            else:
+                logger.info("No specific names provided for template modification. Using original IDs.")
+
+            obj_type, level_id, location_id = self._read_metadata(root)
+
+            buffer = io.BytesIO()
+            tree.write(buffer, encoding="UTF-8", xml_declaration=False)
         except Exception as e:
             logger.error(f"An unexpected error occurred during XML modification: {e}")
-            return False
+            return None
+
+        return buffer.getvalue(), obj_type, level_id, location_id
 
-    def _upload_file(self, xml_file_path: str, xml_file_name: str, total_file_size: int):
+    def _render(self, xml_file_path: str, recipe_name: str = None, unit_procedure_name: str = None,
+                operation_name: str = None) -> tuple[bytes, str, str, str] | None:
         """
-        Uploads a single XML file to the server.
+        Produces the renamed recipe from the compiled template, falling back to _build_xml
+        if the template cannot be compiled.
+
+        Returns:
+            tuple: (xml_content, obj_type, level_id, location_id), or None on error.
+        """
+        try:
+            compiled = load_template(xml_file_path)
+        except (OSError, ValueError, ET.ParseError) as e:
+            logger.warning(f"Could not compile template '{xml_file_path}': {e}. Falling back to a full parse.")
+            return self._build_xml(xml_file_path, recipe_name, unit_procedure_name, operation_name)
+
+        obj_type, level_id, location_id = compiled.metadata
+        return compiled.render(recipe_name, unit_procedure_name, operation_name), obj_type, level_id, location_id
+
+    def _upload_file(self, xml_content: bytes, xml_file_name: str, total_file_size: int):
+        """
+        Uploads a single XML document from memory to the server, in chunks of UPLOAD_CHUNK_SIZE.
 
         Args:
-            xml_file_path (str): Path to the XML file.
+            xml_content (bytes): The serialized XML document.
             xml_file_name (str): Name of the XML file.
             total_file_size (int): Size of the XML file in bytes.
 
         Returns:
             tuple: (uploaded_file_uid, temp_server_filename) or (None, None) on failure.
         """
-        logger.debug(f"Initiating single file upload for '{xml_file_name}' to {self.file_upload_url}...")
-
-        uploaded_file_uid = str(uuid.uuid4())
-        temp_server_filename = None
-
-        try:
-            with open(xml_file_path, 'rb') as f:
-                full_file_content = f.read()
-
-                metadata = {
-                    "chunkIndex": 0,
-                    "contentType": "text/xml",
-                    "fileName": xml_file_name,
-                    "relativePath": xml_file_name,
-                    "totalFileSize": total_file_size,
-                    "totalChunks": 1,
-                    "uploadUid": uploaded_file_uid
-                }
-
-                upload_files = {
-                    'files': ("blob", full_file_content, 'application/octet-stream'),
-                    'metadata': (None, json.dumps(metadata), 'application/json')
-                }
-
-                upload_headers = {
-                    'Accept': '*/*; q=0.5, application/json',
-                    'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
-                    'Connection': 'keep-alive',
-                    'Host': self.machine_name,
-                    'Origin': self.login_host,
-                    'Referer': f"{self.base_app_url}/SpecificationManagement.aspx",
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
-                }
-
-                logger.debug(f"Uploading entire file as a single chunk (UID: {uploaded_file_uid})...")
-                upload_response = self.session.post(self.file_upload_url, files=upload_files, headers=upload_headers, verify=False)
-                upload_response.raise_for_status()
-
-                upload_result = upload_response.json()
-                logger.debug(f"Single upload response: {upload_result}")
-
-                if upload_result.get("uploaded", False):
-                    logger.debug("File uploaded successfully to server temp directory!")
-                    temp_server_filename = upload_result.get("TempFileName")
-                    uploaded_file_uid = upload_result.get("fileUid")
-                    if uploaded_file_uid is None:
-                        logger.warning("'fileUid' was not returned in the upload response. This might cause issues.")
-                else:
-                    logger.error(f"File failed to upload. Response: {upload_result}")
-                    return None, None
-
-            if not temp_server_filename:
-                logger.error("File upload completed but no TempFileName was received from the server.")
-                return None, None
-
-            logger.debug(f"Full file uploaded successfully. Server temporary path: {temp_server_filename}")
-            return uploaded_file_uid, temp_server_filename
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"File upload request failed: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response Status Code: {e.response.status_code}, Content: {e.response.text}")
-            return None, None
-        except Exception as e:
-            logger.error(f"An unexpected error occurred during file upload: {e}")
-            return None, None
+        logger.debug(f"Initiating upload for '{xml_file_name}' to {self.file_upload_url}...")
+        return ChunkedUploader.from_manager(self).upload(xml_content, xml_file_name, total_file_size)
 
     def _import_file(self, uploaded_file_uid: str, xml_file_name: str, obj_type: str, level_id: str, location_id: str, file_size: int):
         """
@@ -441,42 +403,51 @@ class PomsicleTemplateManager:
         xml_folder = os.path.join(self.program_path, 'template')
         xml_file_path = os.path.join(xml_folder, template_name)
 
-        temp_xml_file_path = f"{xml_file_path}.temp_{uuid.uuid4().hex}"
-        try:
-            import shutil
-            shutil.copy(xml_file_path, temp_xml_file_path)
-            logger.debug(f"Created temporary XML file for modification: {temp_xml_file_path}")
-        except Exception as e:
-            logger.error(f"Failed to create temporary XML file: {e}")
+        built = self._render(xml_file_path, recipe_name, unit_procedure_name, operation_name)
+        if built is None:
+            logger.error("Failed to build XML from template. Aborting.")
             return False
+        return self._submit(built, template_name, recipe_name)
 
-        # --- XML Modification Step ---
-        if recipe_name or unit_procedure_name or operation_name:
-            logger.debug("Modifying XML template with provided names...")
-            if not self._modify_template_xml(temp_xml_file_path, recipe_name, unit_procedure_name, operation_name):
-                logger.error("Failed to modify XML template. Aborting.")
-                os.remove(temp_xml_file_path)
-                return False
-        else:
-            logger.info("No specific names provided for template modification. Using original IDs.")
+    def create_from_xml(self, xml_content: bytes, file_name: str = "Recipe.xml", recipe_name: str = None,
+                        unit_procedure_name: str = None, operation_name: str = None):
+        """
+        Like create_template, but for a recipe XML that is already in memory, such as one
+        built by RecipeBuilder. Nothing is written to disk.
 
+        Args:
+            xml_content (bytes): The recipe XML to rename and import.
+            file_name (str): Name the file is uploaded under.
+            recipe_name (str, optional): New name for PM_RECIPE. Defaults to None.
+            unit_procedure_name (str, optional): New name for PM_SUP. Defaults to None.
+            operation_name (str, optional): New name for PM_OPERATION. Defaults to None.
+        """
+        logger.info(f"Attempting to create recipe from '{file_name}' ({len(xml_content)} bytes)")
 
-        obj_type, level_id, location_id, file_size = self._process_xml_file(temp_xml_file_path)
-        if not all([obj_type, level_id, location_id, file_size]):
-            logger.error("Failed to process XML file for template creation. Aborting.")
-            os.remove(temp_xml_file_path)
+        if not self._perform_login():
+            logger.critical("Login failed. Cannot proceed with template creation.")
             return False
 
-        uploaded_file_uid, temp_server_filename = self._upload_file(temp_xml_file_path, template_name, file_size)
-        
         try:
-            if os.path.exists(temp_xml_file_path):
-                os.remove(temp_xml_file_path)
-                logger.debug(f"Cleaned up temporary XML file: {temp_xml_file_path}")
-        except OSError as e:
-            logger.warning(f"Failed to delete temporary XML file '{temp_xml_file_path}': {e}")
+            # One-off document: compiled without caching
+            compiled = compile_source(xml_content.decode("utf-8"))
+            obj_type, level_id, location_id = compiled.metadata
+            built = compiled.render(recipe_name, unit_procedure_name, operation_name), obj_type, level_id, location_id
+        except (ValueError, ET.ParseError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not compile '{file_name}': {e}. Falling back to a full parse.")
+            built = self._build_xml(io.BytesIO(xml_content), recipe_name, unit_procedure_name, operation_name)
+
+        if built is None:
+            logger.error("Failed to build XML from template. Aborting.")
+            return False
+        return self._submit(built, file_name, recipe_name)
 
+    def _submit(self, built: tuple, template_name: str, recipe_name: str = None) -> bool:
+        """Uploads and imports a rendered recipe, as returned by _render."""
+        xml_content, obj_type, level_id, location_id = built
+        file_size = len(xml_content)
 
+        uploaded_file_uid, temp_server_filename = self._upload_file(xml_content, template_name, file_size)
         if not uploaded_file_uid:
             logger.error("File upload failed. Aborting template creation.")
             return False
@@ -0,0 +1,106 @@
+"""
+Startup-time regression benchmark for the pomsicle CLI.
+
+Runs `pomsicle.py --help` repeatedly in fresh interpreters and fails when the
+median wall time exceeds the budget, or when importing the CLI module pulls in
+any of the heavy subcommand dependencies.
+
+Usage:
+    python tests/bench_startup.py --runs 20 --budget-ms 250
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(PROJECT_ROOT, "pomsicle.py")
+
+HEAVY_MODULES = [
+    "playwright",
+    "polars",
+    "bs4",
+    "lxml",
+    "requests",
+    "colorama",
+    "credentials",
+    "bom.bom_template",
+    "material.material_template",
+    "template.recipe_template",
+    "recipe.builder",
+    "receive.receiving",
+    "inventory.read_inventory",
+]
+
+
+def time_help(runs: int) -> list[float]:
+    """Returns the wall time in milliseconds of each `pomsicle.py --help` run."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, CLI, "--help"],
+            cwd=PROJECT_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def baseline(runs: int) -> list[float]:
+    """Returns the wall time in milliseconds of a bare interpreter start."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def eager_imports() -> list[str]:
+    """Returns the heavy modules loaded as a side effect of importing the CLI."""
+    probe = (
+        "import sys, json, pomsicle\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="pomsicle CLI startup benchmark")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=250.0,
+                        help="Maximum allowed median overhead over a bare interpreter start.")
+    args = parser.parse_args()
+
+    loaded = eager_imports()
+    if loaded:
+        print(f"✗ Importing pomsicle eagerly loads: {', '.join(loaded)}")
+        sys.exit(1)
+
+    bare = statistics.median(baseline(args.runs))
+    cli = statistics.median(time_help(args.runs))
+    overhead = cli - bare
+
+    print("-" * 55)
+    print(f"{'python -c pass (median)':<35} {bare:>10.1f} ms")
+    print(f"{'pomsicle --help (median)':<35} {cli:>10.1f} ms")
+    print(f"{'CLI overhead':<35} {overhead:>10.1f} ms")
+    print("-" * 55)
+
+    if overhead > args.budget_ms:
+        print(f"✗ Startup overhead {overhead:.1f} ms exceeds budget of {args.budget_ms:.1f} ms")
+        sys.exit(1)
+    print("✓ Startup within budget")
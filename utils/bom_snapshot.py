@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'boms.sqlite')
+
+
+def diff_snapshots(old: dict, new: dict) -> dict:
+    """
+    Compares two BOM snapshots entry by entry.
+
+    Args:
+        old (dict): Previously imported snapshot, keyed by line item key.
+        new (dict): Snapshot of the BOM about to be imported.
+
+    Returns:
+        dict: 'added', 'removed' and 'changed' lists of snapshot keys.
+    """
+    return {
+        "added": [key for key in new if key not in old],
+        "removed": [key for key in old if key not in new],
+        "changed": [key for key in new if key in old and old[key] != new[key]],
+    }
+
+
+class BomSnapshotCache:
+    """
+    SQLite store of the last BOM content imported by POMSicle, with the server version it produced.
+
+    Rows are keyed by (BOM ID, level ID, location ID).
+    """
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        """
+        Initializes the BomSnapshotCache and creates the backing table if needed.
+
+        Args:
+            path (str): Path to the SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS boms ("
+                " bom_id TEXT NOT NULL,"
+                " level_id TEXT NOT NULL,"
+                " location_id TEXT NOT NULL,"
+                " version TEXT,"
+                " snapshot TEXT NOT NULL,"
+                " imported_at REAL NOT NULL,"
+                " PRIMARY KEY (bom_id, level_id, location_id))"
+            )
+
+    @classmethod
+    def from_settings(cls, settings) -> "BomSnapshotCache | None":
+        """
+        Builds a snapshot store at BOM_SNAPSHOT_PATH from the [pomsicle] settings.
+
+        Returns:
+            BomSnapshotCache: The store, or None if it cannot be opened.
+        """
+        path = settings.get('BOM_SNAPSHOT_PATH') or DEFAULT_SNAPSHOT_PATH
+        try:
+            return cls(path=path)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"BOM snapshot store unavailable at '{path}': {e}. Diff mode disabled.")
+            return None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection for one transaction: committed on success, rolled back on error, always closed."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, bom_id: str, level_id: str, location_id: str) -> dict | None:
+        """
+        Returns the last imported snapshot of a BOM.
+
+        Returns:
+            dict: {'version': str | None, 'snapshot': dict, 'imported_at': float}, or None.
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT version, snapshot, imported_at FROM boms WHERE bom_id = ? AND level_id = ? AND location_id = ?",
+                (str(bom_id), str(level_id), str(location_id))
+            ).fetchone()
+        if row is None:
+            return None
+        return {"version": row[0], "snapshot": json.loads(row[1]), "imported_at": row[2]}
+
+    def put(self, bom_id: str, level_id: str, location_id: str, snapshot: dict, version: str | None) -> None:
+        """Records the snapshot of a BOM that was just imported and the server version it produced."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO boms VALUES (?, ?, ?, ?, ?, ?)",
+                (str(bom_id), str(level_id), str(location_id), version, json.dumps(snapshot), time.time())
+            )
+
+    def invalidate(self, bom_ids: list | None = None) -> int:
+        """
+        Removes stored snapshots, forcing the next diff-mode run to import.
+
+        Args:
+            bom_ids (list, optional): BOM IDs to remove. Removes everything if None.
+
+        Returns:
+            int: Number of snapshots removed.
+        """
+        query, params = "DELETE FROM boms", []
+        if bom_ids:
+            query += f" WHERE bom_id IN ({','.join('?' * len(bom_ids))})"
+            params = [str(bom_id) for bom_id in bom_ids]
+        with self._lock, self._connect() as conn:
+            return conn.execute(query, params).rowcount
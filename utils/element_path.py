@@ -0,0 +1,30 @@
+import xml.etree.ElementTree as ET
+
+
+def child_path(root: ET.Element, target: ET.Element | None) -> tuple[int, ...] | None:
+    """
+    Returns the child indexes leading from root to target, or None if target is None or
+    not under root. The path stays valid on deep copies of root.
+    """
+    if target is None:
+        return None
+    if root is target:
+        return ()
+    for index, child in enumerate(root):
+        sub_path = child_path(child, target)
+        if sub_path is not None:
+            return (index,) + sub_path
+    return None
+
+
+def follow(root: ET.Element, path: tuple[int, ...] | None) -> ET.Element | None:
+    """
+    Walks a path produced by child_path on root or a structural copy of it.
+    Returns None if path is None.
+    """
+    if path is None:
+        return None
+    node = root
+    for index in path:
+        node = node[index]
+    return node
@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'materials.sqlite')
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_NEGATIVE_TTL = 60 * 60
+
+
+class MaterialCache:
+    """
+    On-disk SQLite cache of material master rows returned by GetObjectVersions.
+
+    Rows are keyed by (material ID, level ID, location ID). Materials that the server
+    reported as missing are stored as negative entries with their own, shorter TTL.
+
+    A second table records the attribute fingerprint and server version of every
+    material POMSicle imported, so re-runs can skip materials that did not change.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL):
+        """
+        Initializes the MaterialCache and creates the backing table if needed.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            ttl (float): Seconds a cached material row stays valid.
+            negative_ttl (float): Seconds a "material not found" entry stays valid.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS materials ("
+                " material_id TEXT NOT NULL,"
+                " level_id TEXT NOT NULL,"
+                " location_id TEXT NOT NULL,"
+                " data TEXT,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (material_id, level_id, location_id))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS material_imports ("
+                " material_id TEXT NOT NULL,"
+                " level_id TEXT NOT NULL,"
+                " location_id TEXT NOT NULL,"
+                " fingerprint TEXT NOT NULL,"
+                " version TEXT,"
+                " imported_at REAL NOT NULL,"
+                " PRIMARY KEY (material_id, level_id, location_id))"
+            )
+
+    @classmethod
+    def from_settings(cls, settings) -> "MaterialCache | None":
+        """
+        Builds a cache from the MATERIAL_CACHE_* keys of the [pomsicle] settings.
+
+        Args:
+            settings: The [pomsicle] settings section or an equivalent dict.
+
+        Returns:
+            MaterialCache: The configured cache, or None if MATERIAL_CACHE_TTL is 0.
+        """
+        ttl = float(settings.get('MATERIAL_CACHE_TTL', DEFAULT_TTL) or 0)
+        if ttl <= 0:
+            return None
+        negative_ttl = float(settings.get('MATERIAL_CACHE_NEGATIVE_TTL', DEFAULT_NEGATIVE_TTL) or 0)
+        path = settings.get('MATERIAL_CACHE_PATH') or DEFAULT_CACHE_PATH
+        try:
+            return cls(path=path, ttl=ttl, negative_ttl=negative_ttl)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Material cache unavailable at '{path}': {e}. Continuing without cache.")
+            return None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection for one transaction: committed on success, rolled back on error, always closed."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, material_ids: list, level_id: str, location_id: str) -> dict:
+        """
+        Returns the cached, unexpired entries for the given materials.
+
+        Args:
+            material_ids (list): Material IDs to look up.
+            level_id (str): Level ID the materials were fetched for.
+            location_id (str): Location ID the materials were fetched for.
+
+        Returns:
+            dict: Material ID to material row, or to None for a cached "not found".
+                  Materials without a valid entry are absent from the result.
+        """
+        if not material_ids:
+            return {}
+
+        now = time.time()
+        placeholders = ",".join("?" * len(material_ids))
+        query = (
+            f"SELECT material_id, data, fetched_at FROM materials"
+            f" WHERE level_id = ? AND location_id = ? AND material_id IN ({placeholders})"
+        )
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(query, [str(level_id), str(location_id), *map(str, material_ids)]).fetchall()
+
+        hits = {}
+        for material_id, data, fetched_at in rows:
+            ttl = self.ttl if data is not None else self.negative_ttl
+            if now - fetched_at > ttl:
+                continue
+            hits[material_id] = json.loads(data) if data is not None else None
+        logger.debug(f"Material cache: {len(hits)}/{len(material_ids)} hits for level {level_id}, location {location_id}.")
+        return hits
+
+    def get(self, material_id: str, level_id: str, location_id: str) -> tuple[bool, dict | None]:
+        """
+        Returns a single cached material.
+
+        Returns:
+            tuple: (hit, material_info). material_info is None for a cached "not found".
+        """
+        hits = self.get_many([material_id], level_id, location_id)
+        return (material_id in hits), hits.get(material_id)
+
+    def put_many(self, entries: dict, level_id: str, location_id: str) -> None:
+        """
+        Stores material rows, replacing any existing entries.
+
+        Args:
+            entries (dict): Material ID to material row, or to None to record that
+                            the material does not exist.
+            level_id (str): Level ID the materials were fetched for.
+            location_id (str): Location ID the materials were fetched for.
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        rows = [
+            (str(material_id), str(level_id), str(location_id),
+             json.dumps(info) if info is not None else None, now)
+            for material_id, info in entries.items()
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO materials VALUES (?, ?, ?, ?, ?)", rows)
+
+    def put(self, material_id: str, level_id: str, location_id: str, material_info: dict | None) -> None:
+        """Stores a single material row, or a "not found" entry if material_info is None."""
+        self.put_many({material_id: material_info}, level_id, location_id)
+
+    def get_imports(self, material_ids: list, level_id: str, location_id: str) -> dict:
+        """
+        Returns what POMSicle last imported for the given materials. These records do not expire.
+
+        Returns:
+            dict: Material ID to (fingerprint, version) for materials with a record.
+        """
+        if not material_ids:
+            return {}
+
+        placeholders = ",".join("?" * len(material_ids))
+        query = (
+            f"SELECT material_id, fingerprint, version FROM material_imports"
+            f" WHERE level_id = ? AND location_id = ? AND material_id IN ({placeholders})"
+        )
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(query, [str(level_id), str(location_id), *map(str, material_ids)]).fetchall()
+        return {material_id: (fingerprint, version) for material_id, fingerprint, version in rows}
+
+    def put_imports(self, entries: dict, level_id: str, location_id: str) -> None:
+        """
+        Records the attribute fingerprint and resulting server version of imported materials.
+
+        Args:
+            entries (dict): Material ID to (fingerprint, version).
+            level_id (str): Level ID the materials were imported into.
+            location_id (str): Location ID the materials were imported into.
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        rows = [
+            (str(material_id), str(level_id), str(location_id), fingerprint, version, now)
+            for material_id, (fingerprint, version) in entries.items()
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO material_imports VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def invalidate(self, material_ids: list | None = None, level_id: str | None = None, location_id: str | None = None) -> int:
+        """
+        Removes cached entries. Every filter left as None matches all entries.
+
+        Args:
+            material_ids (list, optional): Material IDs to remove.
+            level_id (str, optional): Only remove entries for this level.
+            location_id (str, optional): Only remove entries for this location.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        clauses, params = [], []
+        if material_ids:
+            clauses.append(f"material_id IN ({','.join('?' * len(material_ids))})")
+            params.extend(map(str, material_ids))
+        if level_id is not None:
+            clauses.append("level_id = ?")
+            params.append(str(level_id))
+        if location_id is not None:
+            clauses.append("location_id = ?")
+            params.append(str(location_id))
+
+        query = "DELETE FROM materials"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._lock, self._connect() as conn:
+            removed = conn.execute(query, params).rowcount
+        logger.debug(f"Material cache: invalidated {removed} entries.")
+        return removed
@@ -0,0 +1,144 @@
+import os
+import re
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'recipes.sqlite')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def renew_guids(xml_content: bytes, guids: list[str]) -> bytes:
+    """
+    Replaces every occurrence of the given GUIDs with new ones in a single pass.
+
+    Each old GUID maps to one new GUID, so references between elements (such as a
+    component's guid and its data lines' guid) stay consistent.
+    """
+    if not guids:
+        return xml_content
+    mapping = {guid.encode("ascii"): str(uuid.uuid4()).encode("ascii") for guid in dict.fromkeys(guids)}
+    pattern = re.compile(b"|".join(re.escape(guid) for guid in mapping))
+    return pattern.sub(lambda match: mapping[match.group(0)], xml_content)
+
+
+class RecipeCache:
+    """
+    Content-addressed SQLite cache of built recipe XML.
+
+    Entries are keyed by a hash of everything the XML was built from (see
+    RecipeBuilder.cache_key) and hold the GUIDs generated for that build, so a hit can be
+    handed out with fresh GUIDs. The cache is bounded by total XML size; the least
+    recently used entries are evicted first.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initializes the RecipeCache and creates the backing table if needed.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            max_bytes (int): Maximum total size of the cached XML.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS recipes ("
+                " key TEXT PRIMARY KEY,"
+                " xml BLOB NOT NULL,"
+                " guids TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS recipes_used_at ON recipes (used_at)")
+
+    @classmethod
+    def from_settings(cls, settings) -> "RecipeCache | None":
+        """
+        Returns the cache for the RECIPE_CACHE_* keys of the [pomsicle] settings. One
+        instance is kept per path and size, so the table is only set up once per process.
+
+        Returns:
+            RecipeCache: The configured cache, or None if RECIPE_CACHE_MAX_BYTES is 0.
+        """
+        max_bytes = int(settings.get('RECIPE_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES) or 0)
+        if max_bytes <= 0:
+            return None
+        path = settings.get('RECIPE_CACHE_PATH') or DEFAULT_CACHE_PATH
+        try:
+            return _open_cache(cls, os.path.abspath(path), max_bytes)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Recipe cache unavailable at '{path}': {e}. Continuing without cache.")
+            return None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection for one transaction: committed on success, rolled back on error, always closed."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Returns the cached recipe for key with its GUIDs renewed, or None on a miss.
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT xml, guids FROM recipes WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE recipes SET used_at = ? WHERE key = ?", (time.time(), key))
+        return renew_guids(bytes(row[0]), json.loads(row[1]))
+
+    def put(self, key: str, xml_content: bytes, guids: list[str]) -> None:
+        """
+        Stores a built recipe and the GUIDs that were generated for it, then evicts the
+        least recently used entries until the cache fits in max_bytes.
+        """
+        size = len(xml_content)
+        if size > self.max_bytes:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO recipes VALUES (?, ?, ?, ?, ?)",
+                (key, xml_content, json.dumps(guids), size, time.time())
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM recipes").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = 0
+            for old_key, old_size in conn.execute("SELECT key, size FROM recipes ORDER BY used_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM recipes WHERE key = ?", (old_key,))
+                total -= old_size
+                evicted += 1
+        logger.debug(f"Evicted {evicted} cached recipes to stay under {self.max_bytes} bytes.")
+
+    def invalidate(self) -> int:
+        """
+        Removes every cached recipe.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock, self._connect() as conn:
+            return conn.execute("DELETE FROM recipes").rowcount
+
+
+@lru_cache(maxsize=8)
+def _open_cache(cls, path: str, max_bytes: int) -> RecipeCache:
+    return cls(path=path, max_bytes=max_bytes)